@@ -0,0 +1,78 @@
+"""
+Benchmarks de l'analyseur de CV : durée de chaque étape et débit selon le
+nombre de processus.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable
+import time
+
+from src.services.resume_analyzer import ResumeAnalyzer
+from src.services.resume_segmenter import segment_resume
+
+from .generator import LANGUAGES, SIZES, generate_corpus, generate_resume
+from .stats import measure
+
+_analyzer = None
+
+
+def _stages(analyzer: ResumeAnalyzer, content: str) -> Dict[str, object]:
+    """
+    Étapes de `ResumeAnalyzer.analyze_resume`, mesurées séparément : chaque
+    extracteur est mesuré sur l'ensemble des sections qui lui sont attribuées.
+    """
+    sections = segment_resume(content)
+    plan = analyzer._plan_extractors(sections)
+    texts = {
+        name: [content[section.start:section.end] for section, names in zip(sections, plan) if name in names]
+        for name in analyzer._extractors
+    }
+    sections_analyzed = analyzer.analyze_resume(content).sections
+
+    def run(name: str):
+        return lambda: [analyzer._extractors[name](text) for text in texts[name]]
+
+    stages = {"segmentation": lambda: segment_resume(content)}
+    stages.update((name, run(name)) for name in analyzer._extractors)
+    stages["aggregation"] = lambda: analyzer.build_response(sections_analyzed)
+    stages["total"] = lambda: analyzer.analyze_resume(content)
+    return stages
+
+
+def bench_stages(iterations: int) -> Dict[str, Dict[str, float]]:
+    """Durée de chaque étape de l'analyse, par taille et langue de CV."""
+    analyzer = ResumeAnalyzer()
+    results = {}
+    for size in SIZES:
+        for language in LANGUAGES:
+            content = generate_resume(size, language)
+            for stage, func in _stages(analyzer, content).items():
+                results[f"analyzer.{size}.{language}.{stage}"] = measure(func, iterations)
+    return results
+
+
+def _init_worker() -> None:
+    global _analyzer
+    _analyzer = ResumeAnalyzer()
+
+
+def _analyze(content: str) -> None:
+    _analyzer.analyze_resume(content)
+
+
+def bench_throughput(worker_counts: Iterable[int], documents: int) -> Dict[str, Dict[str, float]]:
+    """Nombre de CV analysés par seconde selon le nombre de processus."""
+    corpus = generate_corpus(documents)
+    results = {}
+    for workers in worker_counts:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            # Démarrer les processus avant de mesurer
+            list(pool.map(_analyze, corpus[:workers]))
+            start = time.perf_counter()
+            list(pool.map(_analyze, corpus, chunksize=max(1, documents // (workers * 8))))
+            elapsed = time.perf_counter() - start
+        results[f"throughput.workers_{workers}"] = {
+            "documents": documents,
+            "seconds": elapsed,
+            "per_second": documents / elapsed,
+        }
+    return results
@@ -0,0 +1,89 @@
+"""
+Benchmarks de bout en bout des endpoints de CV (analyse, téléversement,
+lecture), via le client de test de FastAPI.
+
+La base utilisée est celle de `DATABASE_URL`, qui doit être configurée avant
+l'import de ce module (voir `benchmarks.run`) : une base SQLite temporaire
+par défaut, ou une base PostgreSQL vide.
+"""
+from typing import Dict
+import itertools
+
+from fastapi.testclient import TestClient
+
+from src.database import engine
+from src.main import app
+from src.models import Base
+
+from .generator import generate_resume
+from .stats import measure
+
+_EMAIL = "benchmark@example.com"
+_PASSWORD = "benchmark"
+
+
+def _login(client: TestClient) -> Dict[str, str]:
+    client.post("/api/auth/register", json={"email": _EMAIL, "password": _PASSWORD, "full_name": "Benchmark"})
+    response = client.post("/api/auth/token", data={"username": _EMAIL, "password": _PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _check(response) -> None:
+    # Une erreur fausserait les mesures : interrompre le benchmark
+    response.raise_for_status()
+
+
+def bench_api(iterations: int, size: str = "medium") -> Dict[str, Dict[str, float]]:
+    """Latence des endpoints `/analyze`, `/upload` et `/{id}` (complet, ou analyse seule)."""
+    Base.metadata.create_all(bind=engine)
+    content = generate_resume(size, "fr")
+    counter = itertools.count()
+    results = {}
+
+    with TestClient(app) as client:
+        headers = _login(client)
+
+        def analyze_cold():
+            # Contenu inédit à chaque appel : l'analyse n'est jamais en cache
+            unique = f"{content}\nRéférence {next(counter)}"
+            _check(client.post("/api/resumes/analyze", json={"content": unique}, headers=headers))
+
+        def analyze_cached():
+            _check(client.post("/api/resumes/analyze", json={"content": content}, headers=headers))
+
+        def upload():
+            unique = f"{content}\nRéférence {next(counter)}".encode("utf-8")
+            _check(client.post(
+                "/api/resumes/upload",
+                files={"file": ("cv.txt", unique, "text/plain")},
+                data={"title": "Benchmark"},
+                headers=headers,
+            ))
+
+        response = client.post(
+            "/api/resumes/upload",
+            files={"file": ("cv.txt", content.encode("utf-8"), "text/plain")},
+            data={"title": "Benchmark"},
+            headers=headers,
+        )
+        _check(response)
+        resume_id = response.json()["id"]
+
+        def get_resume():
+            _check(client.get(f"/api/resumes/{resume_id}", headers=headers))
+
+        def get_analysis_only():
+            _check(client.get(f"/api/resumes/{resume_id}", params={"fields": "id,analysis"}, headers=headers))
+
+        def analyze_stored():
+            _check(client.post("/api/resumes/analyze", json={"resume_id": resume_id}, headers=headers))
+
+        results["api.analyze.cold"] = measure(analyze_cold, iterations)
+        results["api.analyze.cached"] = measure(analyze_cached, iterations)
+        results["api.analyze.stored"] = measure(analyze_stored, iterations)
+        results["api.upload"] = measure(upload, iterations)
+        results["api.get"] = measure(get_resume, iterations)
+        results["api.get.analysis_only"] = measure(get_analysis_only, iterations)
+
+    return results
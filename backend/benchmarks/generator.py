@@ -0,0 +1,105 @@
+"""
+Générateur de CV synthétiques pour les benchmarks.
+
+Les CV sont reproductibles (graine fixe), en français ou en anglais, et de
+taille variable : le nombre d'expériences et de formations augmente avec la
+taille demandée, comme pour un vrai CV de profil senior ou académique.
+"""
+from typing import Dict, List
+import random
+
+from src.services.vocabulary import SKILLS, DEGREES, JOB_TITLES
+
+# Nombre d'expériences, de formations et de paragraphes de description par taille
+SIZES: Dict[str, Dict[str, int]] = {
+    "short": {"experiences": 1, "degrees": 1, "paragraphs": 1},
+    "medium": {"experiences": 4, "degrees": 2, "paragraphs": 2},
+    "long": {"experiences": 12, "degrees": 6, "paragraphs": 4},
+    "very_long": {"experiences": 40, "degrees": 30, "paragraphs": 8},
+}
+
+LANGUAGES = ("fr", "en")
+
+_TEXTS = {
+    "fr": {
+        "experience": "Expérience professionnelle",
+        "education": "Formation",
+        "skills": "Compétences",
+        "summary": "{years} ans d'expérience dans le développement logiciel.",
+        "job": "{title} chez {company} ({start} - {end}).",
+        "degree": "{degree} en informatique, {institution}, {year}.",
+        "with": "avec",
+        "institutions": ["Université de Lyon", "École Polytechnique", "Université Paris-Saclay"],
+        "filler": [
+            "Conception et développement de nouvelles fonctionnalités",
+            "Encadrement d'une équipe de développeurs",
+            "Mise en place de l'intégration continue",
+            "Migration de l'infrastructure vers le cloud",
+            "Rédaction de la documentation technique",
+        ],
+    },
+    "en": {
+        "experience": "Professional Experience",
+        "education": "Education",
+        "skills": "Skills",
+        "summary": "{years} years of experience in software development.",
+        "job": "{title} at {company} ({start} - {end}).",
+        "degree": "{degree} in Computer Science, {institution}, {year}.",
+        "with": "with",
+        "institutions": ["Stanford University", "Imperial College", "Technical Institute of Munich"],
+        "filler": [
+            "Designed and delivered new product features",
+            "Mentored a team of software engineers",
+            "Set up continuous integration pipelines",
+            "Migrated the infrastructure to the cloud",
+            "Wrote the technical documentation",
+        ],
+    },
+}
+
+_COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries"]
+
+
+def generate_resume(size: str = "medium", language: str = "fr", seed: int = 0) -> str:
+    """Génère un CV synthétique de la taille et de la langue demandées."""
+    rng = random.Random(f"{size}-{language}-{seed}")
+    texts = _TEXTS[language]
+    shape = SIZES[size]
+
+    lines: List[str] = [
+        "Jean Dupont",
+        "jean.dupont@example.com - +33 612345678",
+        texts["summary"].format(years=rng.randint(1, 25)),
+        "",
+        texts["experience"],
+    ]
+    for index in range(shape["experiences"]):
+        start = 2024 - (index + 1) * 2
+        lines.append(texts["job"].format(
+            title=rng.choice(JOB_TITLES),
+            company=rng.choice(_COMPANIES),
+            start=start,
+            end=start + 2,
+        ))
+        for _ in range(shape["paragraphs"]):
+            lines.append(f"{rng.choice(texts['filler'])} {texts['with']} {', '.join(rng.sample(SKILLS, 3))}.")
+
+    lines += ["", texts["education"]]
+    for index in range(shape["degrees"]):
+        lines.append(texts["degree"].format(
+            degree=rng.choice(DEGREES),
+            institution=rng.choice(texts["institutions"]),
+            year=2020 - index * 2,
+        ))
+
+    lines += ["", texts["skills"], ", ".join(rng.sample(SKILLS, min(len(SKILLS), 5 + shape["degrees"])))]
+    return "\n".join(lines)
+
+
+def generate_corpus(count: int, seed: int = 0) -> List[str]:
+    """Génère un corpus varié de CV (toutes tailles et langues confondues)."""
+    rng = random.Random(seed)
+    return [
+        generate_resume(rng.choice(list(SIZES)), rng.choice(LANGUAGES), seed=index)
+        for index in range(count)
+    ]
@@ -0,0 +1,49 @@
+"""
+Benchmarks du rapprochement CV / offres : construction de la matrice des
+candidats et calcul des scores d'une offre, sur un index synthétique.
+"""
+from typing import Dict
+import random
+
+from src.services.job_matching import CandidateMatrix, JobProfile
+from src.services.resume_index import SKILL, TITLE, normalize_term
+from src.services.vocabulary import JOB_TITLES, SKILLS
+
+from .stats import measure
+
+CANDIDATES = (10_000, 100_000)
+
+
+def _index(candidates: int, seed: int = 0):
+    """CV (id, user_id, expérience) et termes indexés, comparables à ceux de `resume_terms`."""
+    rng = random.Random(seed)
+    skills = [normalize_term(skill) for skill in SKILLS]
+    titles = [normalize_term(title) for title in JOB_TITLES]
+    resumes = [
+        (resume_id, resume_id % 1000, rng.choice([None, round(rng.uniform(0, 25), 1)]))
+        for resume_id in range(1, candidates + 1)
+    ]
+    postings = []
+    for resume_id in range(1, candidates + 1):
+        postings.extend((resume_id, SKILL, skill) for skill in rng.sample(skills, rng.randint(3, 15)))
+        postings.extend((resume_id, TITLE, title) for title in rng.sample(titles, rng.randint(0, 3)))
+    return resumes, postings
+
+
+def bench_matching(iterations: int) -> Dict[str, Dict[str, float]]:
+    """Durée de construction de la matrice et de classement d'une offre, par nombre de candidats."""
+    job = JobProfile(
+        skills={normalize_term(skill) for skill in SKILLS[:8]},
+        titles={normalize_term(JOB_TITLES[0])},
+        experience_years=5.0,
+    )
+    results = {}
+    for candidates in CANDIDATES:
+        resumes, postings = _index(candidates)
+        matrix = CandidateMatrix.build(resumes, postings)
+        results[f"matching.{candidates}.build"] = measure(
+            lambda: CandidateMatrix.build(resumes, postings), max(1, iterations // 10)
+        )
+        results[f"matching.{candidates}.score"] = measure(lambda: matrix.score(job, 20), iterations)
+        results[f"matching.{candidates}.score_user"] = measure(lambda: matrix.score(job, 20, user_id=7), iterations)
+    return results
@@ -0,0 +1,69 @@
+"""
+Serveur simulant une API compatible OpenAI (`POST /v1/chat/completions`),
+pour tester le moteur d'analyse "llm" sans coût, avec une latence et un taux
+d'erreur contrôlés. Les réponses sont produites par l'analyseur par regex.
+
+Exemple (depuis le dossier backend) :
+
+    MOCK_LLM_LATENCY_MS=800 MOCK_LLM_ERROR_RATE=0.05 uvicorn benchmarks.mock_llm:app --port 8100
+    ANALYZER_BACKEND=llm LLM_API_BASE=http://localhost:8100/v1 uvicorn src.main:app
+
+`GET /stats` retourne le nombre d'appels reçus et l'appel le plus concurrent.
+"""
+import asyncio
+import json
+import os
+import random
+
+from fastapi import FastAPI, HTTPException
+
+from src.services.resume_analyzer import ResumeAnalyzer
+
+LATENCY_MS = float(os.getenv("MOCK_LLM_LATENCY_MS", "500"))
+# Latence supplémentaire de loi exponentielle (queue de distribution)
+JITTER_MS = float(os.getenv("MOCK_LLM_JITTER_MS", "0"))
+ERROR_RATE = float(os.getenv("MOCK_LLM_ERROR_RATE", "0"))
+
+app = FastAPI(title="API de modèle de langage simulée")
+_analyzer = ResumeAnalyzer()
+_stats = {"requests": 0, "errors": 0, "in_flight": 0, "max_in_flight": 0}
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: dict):
+    _stats["requests"] += 1
+    _stats["in_flight"] += 1
+    _stats["max_in_flight"] = max(_stats["max_in_flight"], _stats["in_flight"])
+    try:
+        jitter = random.expovariate(1 / JITTER_MS) if JITTER_MS else 0
+        await asyncio.sleep((LATENCY_MS + jitter) / 1000)
+        if random.random() < ERROR_RATE:
+            _stats["errors"] += 1
+            raise HTTPException(status_code=503, detail="Erreur simulée")
+
+        content = request["messages"][-1]["content"]
+        analysis = _analyzer.analyze_resume(content)
+        extraction = {
+            "skills": analysis.skills,
+            "experience_years": analysis.experience_years,
+            "education": analysis.education,
+            "job_titles": analysis.job_titles,
+        }
+        return {
+            "id": f"mock-{_stats['requests']}",
+            "object": "chat.completion",
+            "model": request.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": json.dumps(extraction, ensure_ascii=False)},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": len(content) // 4, "completion_tokens": 0, "total_tokens": len(content) // 4},
+        }
+    finally:
+        _stats["in_flight"] -= 1
+
+
+@app.get("/stats")
+async def stats():
+    return _stats
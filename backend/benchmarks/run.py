@@ -0,0 +1,133 @@
+"""
+Lance la suite de benchmarks et compare les résultats à une référence.
+
+Exemples (depuis le dossier backend) :
+
+    python -m benchmarks.run --output resultats.json
+    python -m benchmarks.run --update-baseline
+    python -m benchmarks.run --only analyzer --tolerance 0.1
+
+Le code de sortie est 1 si une mesure est en régression par rapport à la
+référence (`benchmarks/baseline.json` par défaut).
+
+La référence versionnée n'est qu'une référence relative de contrôle rapide :
+elle a été produite par `--update-baseline` avec les paramètres par défaut
+(20 mesures, 400 CV) sur un environnement d'intégration à un seul processeur
+(voir ses métadonnées), et ne représente pas le matériel de production. Elle
+ne détecte que les régressions grossières des latences mono-thread. Pour
+évaluer une modification, générer d'abord une référence locale sur la machine
+cible (`--update-baseline --baseline ref.json`) avant la modification, puis
+comparer avec `--baseline ref.json`. Si le nombre de processeurs diffère de
+celui de la référence, les débits (`throughput.*`, qui dépendent du nombre de
+workers) ne sont pas comparés.
+"""
+from pathlib import Path
+from typing import Dict, List
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import tempfile
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+SUITES = ("analyzer", "throughput", "api", "matching", "storage")
+
+
+def _configure_environment(database_url: str) -> None:
+    """Configure l'application avant son import (les paramètres sont lus à l'import)."""
+    if not database_url:
+        database_url = f"sqlite:///{tempfile.mkdtemp(prefix='careernus-bench-')}/bench.db"
+    os.environ["DATABASE_URL"] = database_url
+    # Pas de cache partagé entre deux exécutions
+    os.environ.setdefault("ANALYSIS_CACHE_BACKEND", "")
+
+
+def _worker_counts(value: str) -> List[int]:
+    if value:
+        return [int(count) for count in value.split(",")]
+    counts, count = [], 1
+    while count < (os.cpu_count() or 1):
+        counts.append(count)
+        count *= 2
+    return counts + [os.cpu_count() or 1]
+
+
+def _metadata() -> Dict[str, object]:
+    from src.services.resume_analyzer import ANALYZER_VERSION
+
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "analyzer_version": ANALYZER_VERSION,
+        "database": os.environ["DATABASE_URL"].split(":", 1)[0],
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de l'analyseur et de l'API Careernus")
+    parser.add_argument("--only", choices=SUITES, action="append", help="Suites à exécuter (toutes par défaut)")
+    parser.add_argument("--iterations", type=int, default=20, help="Mesures par benchmark")
+    parser.add_argument("--documents", type=int, default=400, help="CV analysés pour mesurer le débit")
+    parser.add_argument("--workers", default="", help="Nombres de processus à tester, ex. 1,2,4")
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL", ""),
+                        help="Base utilisée pour l'API (SQLite temporaire par défaut)")
+    parser.add_argument("--output", type=Path, help="Fichier JSON des résultats")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Référence à comparer")
+    parser.add_argument("--update-baseline", action="store_true", help="Remplacer la référence par ces résultats")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Écart toléré par rapport à la référence")
+    args = parser.parse_args(argv)
+
+    _configure_environment(args.database_url)
+    from . import analyzer, api, matching, storage
+
+    suites = args.only or SUITES
+    results: Dict[str, Dict] = {}
+    if "analyzer" in suites:
+        results.update(analyzer.bench_stages(args.iterations))
+    if "throughput" in suites:
+        results.update(analyzer.bench_throughput(_worker_counts(args.workers), args.documents))
+    if "api" in suites:
+        results.update(api.bench_api(args.iterations))
+    if "matching" in suites:
+        results.update(matching.bench_matching(args.iterations))
+    if "storage" in suites:
+        results.update(storage.bench_storage(args.iterations))
+
+    report = {"metadata": _metadata(), "results": results}
+    for name, values in results.items():
+        if "median_ms" in values:
+            print(f"{name:45} médiane {values['median_ms']:9.3f} ms   p95 {values['p95_ms']:9.3f} ms")
+        else:
+            print(f"{name:45} {values['per_second']:9.1f} CV/s")
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"Référence mise à jour : {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"Aucune référence ({args.baseline}) : comparaison ignorée")
+        return 0
+
+    from .stats import compare
+
+    baseline = json.loads(args.baseline.read_text())
+    reference = baseline["results"]
+    if baseline["metadata"].get("cpu_count") != os.cpu_count():
+        print("Attention : la référence a été mesurée sur une autre machine, débits non comparés")
+        reference = {name: values for name, values in reference.items() if not name.startswith("throughput.")}
+    regressions = compare(results, reference, args.tolerance)
+    for regression in regressions:
+        print(f"RÉGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""
+Mesure des temps d'exécution et comparaison avec une référence.
+"""
+from typing import Callable, Dict, List
+import statistics
+import time
+
+
+def measure(func: Callable[[], object], iterations: int, warmup: int = 1) -> Dict[str, float]:
+    """Exécute `func` plusieurs fois et retourne les statistiques de durée (en ms)."""
+    for _ in range(warmup):
+        func()
+
+    durations: List[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1000)
+    return summarize(durations)
+
+
+def summarize(durations: List[float]) -> Dict[str, float]:
+    ordered = sorted(durations)
+    return {
+        "iterations": len(ordered),
+        "mean_ms": statistics.fmean(ordered),
+        "median_ms": statistics.median(ordered),
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "min_ms": ordered[0],
+        "max_ms": ordered[-1],
+    }
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """
+    Compare des résultats à la référence et retourne la liste des régressions.
+
+    Une latence (`median_ms`) est en régression si elle dépasse la référence
+    de plus de `tolerance` ; un débit (`per_second`) l'est s'il lui est
+    inférieur de plus de `tolerance`. Les mesures absentes de la référence
+    sont ignorées.
+    """
+    regressions = []
+    for name, reference in baseline.items():
+        current = results.get(name)
+        if current is None:
+            continue
+        if "median_ms" in reference and current["median_ms"] > reference["median_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: médiane {current['median_ms']:.3f} ms (référence {reference['median_ms']:.3f} ms)"
+            )
+        if "per_second" in reference and current["per_second"] < reference["per_second"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {current['per_second']:.1f}/s (référence {reference['per_second']:.1f}/s)"
+            )
+    return regressions
@@ -0,0 +1,45 @@
+"""
+Benchmarks du stockage des analyses : encodage et lecture d'une analyse dans
+chaque format (texte JSON validé des versions précédentes, JSON et msgpack
+compressé avec identifiants de termes), et taille stockée.
+"""
+from typing import Dict
+import json
+
+from src.schemas.resume import ResumeAnalysisResponse
+from src.services.analysis_codec import decode_analysis, encode_analysis, pack, read_stored
+from src.services.resume_analyzer import ResumeAnalyzer
+
+from .generator import generate_resume
+from .stats import measure
+
+
+def bench_storage(iterations: int) -> Dict[str, Dict[str, float]]:
+    """Durée d'encodage et de lecture d'une analyse, et taille stockée, par format."""
+    analysis = ResumeAnalyzer().analyze_resume(generate_resume("long"))
+    content_hash = "0" * 64
+
+    def legacy_encode() -> str:
+        return json.dumps({"analyzer_version": "3", "content_hash": content_hash, "analysis": analysis.dict()},
+                          ensure_ascii=False)
+
+    def json_encode() -> str:
+        # Le pilote (JSONB) ou le type JSON de SQLAlchemy sérialise le dictionnaire
+        return json.dumps(encode_analysis(analysis, "3", content_hash), ensure_ascii=False)
+
+    def msgpack_encode() -> bytes:
+        return pack(encode_analysis(analysis, "3", content_hash))
+
+    legacy, stored_json, packed = legacy_encode(), json_encode(), msgpack_encode()
+    formats = {
+        "legacy": (legacy_encode, lambda: ResumeAnalysisResponse.parse_obj(json.loads(legacy)["analysis"]), legacy),
+        "json": (json_encode, lambda: decode_analysis(read_stored(stored_json)), stored_json),
+        "msgpack": (msgpack_encode, lambda: decode_analysis(read_stored(packed)), packed),
+    }
+
+    results = {}
+    for name, (encode, decode, stored) in formats.items():
+        size = len(stored.encode("utf-8")) if isinstance(stored, str) else len(stored)
+        results[f"storage.{name}.encode"] = {**measure(encode, iterations), "bytes": size}
+        results[f"storage.{name}.decode"] = {**measure(decode, iterations), "bytes": size}
+    return results
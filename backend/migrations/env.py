@@ -11,6 +11,8 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from src.models.base import Base
 from src.models.user import User
 from src.models.resume import Resume
+from src.models.resume_term import ResumeTerm
+from src.models.analysis_job import AnalysisJob
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
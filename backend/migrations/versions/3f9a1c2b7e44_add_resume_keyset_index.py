@@ -0,0 +1,24 @@
+"""Add resume keyset pagination index
+
+Revision ID: 3f9a1c2b7e44
+Revises: 7d20c6612478
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a1c2b7e44'
+down_revision = '7d20c6612478'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_resumes_user_id_created_at_id', 'resumes', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_resumes_user_id_created_at_id', table_name='resumes')
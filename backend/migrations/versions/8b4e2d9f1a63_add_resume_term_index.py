@@ -0,0 +1,36 @@
+"""Add resume inverted term index
+
+Revision ID: 8b4e2d9f1a63
+Revises: 3f9a1c2b7e44
+Create Date: 2026-10-18 13:41:05.502117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b4e2d9f1a63'
+down_revision = '3f9a1c2b7e44'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('resumes', sa.Column('experience_years', sa.Float(), nullable=True))
+    op.create_table(
+        'resume_terms',
+        sa.Column('kind', sa.String(length=16), nullable=False),
+        sa.Column('term', sa.String(), nullable=False),
+        sa.Column('resume_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('kind', 'term', 'resume_id')
+    )
+    op.create_index('ix_resume_terms_resume_id', 'resume_terms', ['resume_id'], unique=False)
+    # Les CV existants sont indexés avec : python -m src.services.resume_index
+
+
+def downgrade() -> None:
+    op.drop_index('ix_resume_terms_resume_id', table_name='resume_terms')
+    op.drop_table('resume_terms')
+    op.drop_column('resumes', 'experience_years')
@@ -0,0 +1,72 @@
+"""Add resume content hash for deduplication
+
+Revision ID: a7d4e9c2f5b1
+Revises: f3c9d2a1b8e6
+Create Date: 2026-10-18 20:31:07.842915
+
+"""
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d4e9c2f5b1'
+down_revision = 'f3c9d2a1b8e6'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+# Clés des textes stockés hors de la table : "texts/<empreinte SHA-256>"
+TEXT_PREFIX = 'texts/'
+
+
+def upgrade() -> None:
+    op.add_column('resumes', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('resumes', sa.Column('fingerprint', sa.String(length=64), nullable=True))
+    op.add_column('resumes', sa.Column('content_minhash', sa.LargeBinary(), nullable=True))
+
+    # Empreinte des CV existants ; pour les doublons déjà présents, seul le plus
+    # ancien CV de l'utilisateur la reçoit (les autres restent sans empreinte)
+    resumes = sa.table(
+        'resumes',
+        sa.column('id', sa.Integer), sa.column('user_id', sa.Integer), sa.column('content', sa.Text),
+        sa.column('content_key', sa.String), sa.column('content_hash', sa.String),
+    )
+    bind = op.get_bind()
+    last = (0, 0)
+    seen = set()
+    while True:
+        rows = bind.execute(
+            sa.select(resumes.c.id, resumes.c.user_id, resumes.c.content, resumes.c.content_key)
+            .where(sa.tuple_(resumes.c.user_id, resumes.c.id) > sa.tuple_(*last))
+            .order_by(resumes.c.user_id, resumes.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for row in rows:
+            if row.user_id != last[0]:
+                seen.clear()
+            last = (row.user_id, row.id)
+            if row.content_key:
+                content_hash = row.content_key[len(TEXT_PREFIX):]
+            else:
+                content_hash = hashlib.sha256(row.content.encode('utf-8')).hexdigest()
+            if content_hash in seen:
+                continue
+            seen.add(content_hash)
+            bind.execute(resumes.update().where(resumes.c.id == row.id).values(content_hash=content_hash))
+
+    op.create_index('ux_resumes_content_hash_user_id', 'resumes', ['content_hash', 'user_id'], unique=True)
+    op.create_index('ix_resumes_user_id_fingerprint', 'resumes', ['user_id', 'fingerprint'], unique=False)
+    # Les autres empreintes des CV existants sont calculées avec : python -m src.services.deduplication
+
+
+def downgrade() -> None:
+    op.drop_index('ix_resumes_user_id_fingerprint', table_name='resumes')
+    op.drop_index('ux_resumes_content_hash_user_id', table_name='resumes')
+    op.drop_column('resumes', 'content_minhash')
+    op.drop_column('resumes', 'fingerprint')
+    op.drop_column('resumes', 'content_hash')
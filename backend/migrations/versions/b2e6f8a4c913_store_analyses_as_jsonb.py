@@ -0,0 +1,42 @@
+"""Store resume analyses as JSONB or compact binary
+
+Revision ID: b2e6f8a4c913
+Revises: a7d4e9c2f5b1
+Create Date: 2026-10-18 21:47:36.205184
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2e6f8a4c913'
+down_revision = 'a7d4e9c2f5b1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('resumes', sa.Column('parsed_packed', sa.LargeBinary(), nullable=True))
+    if op.get_bind().dialect.name == 'postgresql':
+        # Les analyses sont toujours écrites en JSON objet : tout autre contenu est
+        # abandonné (l'analyse sera recalculée à la prochaine lecture du CV)
+        op.execute("UPDATE resumes SET parsed_data = NULL WHERE parsed_data !~ '^\\s*\\{'")
+        op.alter_column(
+            'resumes', 'parsed_data', type_=postgresql.JSONB(), existing_type=sa.Text(),
+            postgresql_using='parsed_data::jsonb'
+        )
+    # Ailleurs (SQLite), le type JSON est stocké en texte : les données restent lisibles
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        # Le format 2 (termes remplacés par des identifiants) n'est pas lisible par les versions précédentes
+        op.execute("UPDATE resumes SET parsed_data = NULL WHERE parsed_data ? 'format'")
+        op.alter_column(
+            'resumes', 'parsed_data', type_=sa.Text(), existing_type=postgresql.JSONB(),
+            postgresql_using='parsed_data::text'
+        )
+    # Les analyses au format binaire sont perdues : elles seront recalculées
+    op.drop_column('resumes', 'parsed_packed')
@@ -0,0 +1,42 @@
+"""Add resume full-text search column
+
+Revision ID: c41d7e5a9b20
+Revises: 8b4e2d9f1a63
+Create Date: 2026-10-18 14:02:51.774310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41d7e5a9b20'
+down_revision = '8b4e2d9f1a63'
+branch_labels = None
+depends_on = None
+
+# Colonne calculée par PostgreSQL à chaque écriture : le titre pèse plus que le
+# contenu, indexé avec les configurations française et anglaise. Le contenu est
+# tronqué pour rester sous la taille maximale d'un tsvector (1 Mo).
+CONTENT_TSV = """
+    setweight(to_tsvector('french', coalesce(title, '')), 'A')
+    || setweight(to_tsvector('english', coalesce(title, '')), 'A')
+    || setweight(to_tsvector('french', left(content, 500000)), 'B')
+    || setweight(to_tsvector('english', left(content, 500000)), 'B')
+"""
+
+
+def upgrade() -> None:
+    # Recherche plein texte propre à PostgreSQL ; les autres bases utilisent
+    # une recherche par LIKE (voir src/services/text_search.py)
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(f"ALTER TABLE resumes ADD COLUMN content_tsv tsvector GENERATED ALWAYS AS ({CONTENT_TSV}) STORED")
+    op.create_index('ix_resumes_content_tsv', 'resumes', ['content_tsv'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_resumes_content_tsv', table_name='resumes')
+    op.drop_column('resumes', 'content_tsv')
@@ -0,0 +1,34 @@
+"""Add resume blob storage columns
+
+Revision ID: f3c9d2a1b8e6
+Revises: e5b8a3c0d417
+Create Date: 2026-10-18 19:04:12.518327
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3c9d2a1b8e6'
+down_revision = 'e5b8a3c0d417'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Fichier d'origine et texte complet dans le stockage d'objets : colonnes
+    # nullables, les CV existants gardent leur texte dans la table
+    op.add_column('resumes', sa.Column('file_key', sa.String(), nullable=True))
+    op.add_column('resumes', sa.Column('file_hash', sa.String(length=64), nullable=True))
+    op.add_column('resumes', sa.Column('file_size', sa.Integer(), nullable=True))
+    op.add_column('resumes', sa.Column('file_format', sa.String(length=16), nullable=True))
+    op.add_column('resumes', sa.Column('content_key', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('resumes', 'content_key')
+    op.drop_column('resumes', 'file_format')
+    op.drop_column('resumes', 'file_size')
+    op.drop_column('resumes', 'file_hash')
+    op.drop_column('resumes', 'file_key')
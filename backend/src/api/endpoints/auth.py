@@ -1,34 +1,57 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 from typing import Any, Optional
 from jose import JWTError, jwt
 
-from ...database import get_db
+from ...database import get_async_db
 from ...models.user import User
 from ...schemas.user import User as UserSchema, UserCreate, UserInDB
-from ...services.auth import create_access_token, verify_password, get_password_hash
+from ...services.auth import (
+    create_access_token, verify_and_update_password, hash_password,
+    get_cached_principal, cache_principal, get_invalidation_marker
+)
+from ...services.metrics import AUTH_SECONDS
 from ...config import settings
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
 
-def get_user_by_email(db: Session, email: str) -> Optional[User]:
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
     """Récupère un utilisateur par son email."""
-    return db.query(User).filter(User.email == email).first()
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
     """Authentifie un utilisateur par email et mot de passe."""
-    user = get_user_by_email(db, email)
-    if not user or not verify_password(password, user.hashed_password):
+    user = await get_user_by_email(db, email)
+    if not user:
+        return None
+    valid, new_hash = await verify_and_update_password(password, user.hashed_password)
+    if not valid:
         return None
+    if new_hash:
+        # Recalculer le hash avec le coût configuré
+        user.hashed_password = new_hash
+        await db.commit()
     return user
 
 async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-) -> User:
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+) -> UserSchema:
     """Récupère l'utilisateur actuel à partir du token JWT."""
+    # Token déjà résolu récemment : ni décodage, ni requête en base
+    with AUTH_SECONDS.time("cache"):
+        principal = get_cached_principal(token)
+    if principal is not None:
+        return principal
+    with AUTH_SECONDS.time("database"):
+        return await _resolve_user(token, db)
+
+async def _resolve_user(token: str, db: AsyncSession) -> UserSchema:
+    """Décode le token et charge l'utilisateur correspondant, puis le met en cache."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Identifiants invalides",
@@ -42,20 +65,24 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
         
-    user = get_user_by_email(db, email)
-    if user is None:
+    marker = get_invalidation_marker()
+    user = await get_user_by_email(db, email)
+    if user is None or not user.is_active:
         raise credentials_exception
-    return user
+
+    principal = UserSchema.from_orm(user)
+    cache_principal(token, principal, marker, payload.get("exp"))
+    return principal
 
 @router.post("/token", response_model=dict)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Authentifie un utilisateur et retourne un token JWT.
     """
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -79,13 +106,13 @@ async def login_for_access_token(
 @router.post("/register", response_model=UserSchema)
 async def register_user(
     user_in: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Enregistre un nouvel utilisateur.
     """
     # Vérifier si l'email existe déjà
-    user = get_user_by_email(db, user_in.email)
+    user = await get_user_by_email(db, user_in.email)
     if user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -93,7 +120,7 @@ async def register_user(
         )
         
     # Créer le nouvel utilisateur
-    hashed_password = get_password_hash(user_in.password)
+    hashed_password = await hash_password(user_in.password)
     db_user = User(
         email=user_in.email,
         hashed_password=hashed_password,
@@ -103,14 +130,14 @@ async def register_user(
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
 
 @router.get("/me", response_model=UserSchema)
 async def read_users_me(
-    current_user: User = Depends(get_current_user)
+    current_user: UserSchema = Depends(get_current_user)
 ) -> Any:
     """
     Récupère les informations de l'utilisateur connecté.
@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...database import get_async_db
+from ...models.analysis_job import AnalysisJob
+from ...models.resume import Resume
+from ...schemas.resume import AnalysisJobStatus
+from ...services.analysis_store import load_resume_analysis
+
+from ...api.endpoints.auth import get_current_user
+from ...schemas.user import User as UserSchema
+
+router = APIRouter()
+
+@router.get("/{job_id}", response_model=AnalysisJobStatus)
+async def get_analysis_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSchema = Depends(get_current_user)
+):
+    """
+    Retourne l'état d'une analyse en arrière-plan ("pending", "running",
+    "succeeded" ou "failed"), avec l'analyse du CV une fois la tâche réussie.
+    """
+    job = await db.get(AnalysisJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Tâche non trouvée")
+
+    # Vérifier que l'utilisateur a accès au CV de cette tâche
+    if job.user_id != current_user.id and not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Accès interdit")
+
+    status = AnalysisJobStatus.from_orm(job)
+    if job.status == AnalysisJob.SUCCEEDED:
+        resume = await db.get(Resume, job.resume_id)
+        if resume is not None:
+            status.analysis = load_resume_analysis(resume)
+    return status
@@ -1,33 +1,96 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Body
-from sqlalchemy.orm import Session
-from typing import List, Optional, Any
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Body, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, FrozenSet, List, NamedTuple, Optional, Any
+from urllib.parse import quote
+import asyncio
 
-from ...database import get_db
+from ...config import settings
+
+from ...database import get_async_db
 from ...models.resume import Resume
 from ...schemas.resume import (
-    ResumeCreate, Resume as ResumeSchema, ResumeWithAnalysis,
-    ResumeAnalysisRequest, ResumeAnalysisResponse
+    ResumeCreate, ResumeUpdate, ResumeWithAnalysis,
+    ResumeAnalysisRequest, ResumeAnalysisResponse,
+    ResumeBatchAnalysisRequest, ResumeBatchAnalysisItem,
+    ResumeSummary, ResumePage, ResumeSection, ResumeSearchPage,
+    JobMatchRequest, JobMatchResponse, JobCriteria, ResumeMatch, AnalysisJobStatus
+)
+from ...services.analysis_store import (
+    normalize_content, compute_content_hash, load_analysis, load_resume_analysis, load_sections, store_analysis,
+    stored_analysis
+)
+from ...services.analysis_cache import analysis_cache
+from ...services.analysis_executor import analysis_executor, AnalysisQueueFull
+from ...services.analyzer_backends import analyzer_backend
+from ...services.blob_storage import BlobNotFound, blob_storage
+from ...services.analysis_jobs import CallbackRejected, analysis_job_worker, check_callback_url, enqueue_analysis
+from ...services.deduplication import EXACT, Duplicate, find_duplicate, find_shared_analysis
+from ...services.document_extraction import DocumentRejected, ExtractionQueueFull, UnsupportedDocument
+from ...services.ingestion import read_upload_document, IngestedText, UploadTooLarge
+from ...services.pagination import (
+    encode_cursor, decode_cursor, encode_id_cursor, decode_id_cursor, encode_rank_cursor, decode_rank_cursor
+)
+from ...services.job_matching import JobProfile, candidate_index
+from ...services.metrics import MATCHING_SECONDS, RESUME_DUPLICATES
+from ...services.resume_index import (
+    SKILL, TITLE, build_search_query, extract_terms, normalize_term, title_terms
+)
+from ...services.resume_storage import (
+    MEDIA_TYPES, load_content, resume_content_hash, set_content, store_original
 )
-from ...services.resume_analyzer import ResumeAnalyzer
+from ...services.text_search import search_text
 
 from ...api.endpoints.auth import get_current_user
-from ...models.user import User
+from ...schemas.user import User as UserSchema
 
 router = APIRouter()
-resume_analyzer = ResumeAnalyzer()
+
+async def run_analysis(
+    content: str, content_hash: Optional[str] = None, previous_sections: Optional[List[ResumeSection]] = None
+) -> ResumeAnalysisResponse:
+    """
+    Analyse un contenu normalisé : depuis le cache si possible, sinon dans le pool
+    d'analyse (en réutilisant les résultats des sections inchangées, si fournies).
+    """
+    analysis = analysis_cache.get(content, content_hash)
+    if analysis is None:
+        try:
+            analysis = await analyzer_backend.analyze(content, previous_sections)
+        except AnalysisQueueFull:
+            raise HTTPException(
+                status_code=503,
+                detail="Le service d'analyse est saturé, veuillez réessayer plus tard",
+                headers={"Retry-After": "1"},
+            )
+        analysis_cache.set(content, analysis, content_hash)
+    return analysis
+
+async def get_stored_analysis(db: AsyncSession, resume: Resume) -> ResumeAnalysisResponse:
+    """
+    Retourne l'analyse stockée d'un CV, en la recalculant si elle est absente ou périmée.
+    """
+    analysis = load_resume_analysis(resume)
+    if analysis is None:
+        analysis = await run_analysis(normalize_content(await load_content(resume)))
+        await store_analysis(db, resume, analysis)
+        await db.commit()
+    return analysis
 
 @router.post("/analyze", response_model=ResumeAnalysisResponse)
 async def analyze_resume(
     request: ResumeAnalysisRequest = Body(...),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSchema = Depends(get_current_user)
 ):
     """
     Analyse un CV et retourne des insights et recommandations.
     """
     if request.resume_id:
         # Récupérer le CV depuis la base de données
-        resume = db.query(Resume).filter(Resume.id == request.resume_id).first()
+        resume = await db.get(Resume, request.resume_id)
         if not resume:
             raise HTTPException(status_code=404, detail="CV non trouvé")
 
@@ -35,7 +98,8 @@ async def analyze_resume(
         if resume.user_id != current_user.id and not current_user.is_superuser:
             raise HTTPException(status_code=403, detail="Accès interdit")
 
-        content = resume.content
+        # Réutiliser l'analyse stockée avec le CV
+        return await get_stored_analysis(db, resume)
     elif request.content:
         # Utiliser le contenu fourni directement
         content = request.content
@@ -48,56 +112,511 @@ async def analyze_resume(
             detail="Vous devez fournir soit un ID de CV, soit du contenu texte, soit un fichier"
         )
     
-    # Analyser le CV
-    analysis = resume_analyzer.analyze_resume(content)
+    # Analyser le CV (les contenus déjà analysés sont servis depuis le cache)
+    analysis = await run_analysis(normalize_content(content))
     return analysis
 
+async def _analyze_batch_item(
+    index: int, item: ResumeAnalysisRequest, resume: Optional[Resume], current_user: UserSchema
+) -> ResumeBatchAnalysisItem:
+    """Analyse un élément d'un lot ; les erreurs sont retournées dans le résultat."""
+    result = ResumeBatchAnalysisItem(index=index, resume_id=item.resume_id)
+    try:
+        if item.resume_id:
+            if resume is None:
+                raise HTTPException(status_code=404, detail="CV non trouvé")
+            # Vérifier que l'utilisateur a accès à ce CV
+            if resume.user_id != current_user.id and not current_user.is_superuser:
+                raise HTTPException(status_code=403, detail="Accès interdit")
+            result.analysis = load_resume_analysis(resume)
+            if result.analysis is None:
+                result.analysis = await run_analysis(normalize_content(await load_content(resume)))
+        elif item.content or item.file_content:
+            result.analysis = await run_analysis(normalize_content(item.content or item.file_content))
+        else:
+            raise HTTPException(status_code=400, detail="Élément sans ID de CV ni contenu")
+    except HTTPException as exc:
+        result.status_code = exc.status_code
+        result.error = exc.detail
+    return result
+
+async def _stream_batch_analysis(
+    items: List[ResumeAnalysisRequest], resumes: dict, current_user: UserSchema
+) -> AsyncIterator[str]:
+    """
+    Répartit les analyses d'un lot sur un nombre borné de tâches et produit
+    une ligne JSON par CV, dans l'ordre de fin des analyses.
+    """
+    concurrency = settings.ANALYSIS_BATCH_CONCURRENCY or analysis_executor.max_workers
+    results: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+    pending = iter(enumerate(items))
+
+    async def worker() -> None:
+        for index, item in pending:
+            resume = resumes.get(item.resume_id) if item.resume_id else None
+            await results.put(await _analyze_batch_item(index, item, resume, current_user))
+
+    async def close_when_done() -> None:
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            await results.put(None)
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, len(items)))]
+    closer = asyncio.create_task(close_when_done())
+    try:
+        while True:
+            result = await results.get()
+            if result is None:
+                break
+            yield result.json() + "\n"
+        # Propager une éventuelle erreur inattendue d'une tâche
+        await closer
+    finally:
+        # Client déconnecté : arrêter les tâches restantes
+        for task in workers:
+            task.cancel()
+        closer.cancel()
+
+@router.post("/analyze/batch")
+async def analyze_resume_batch(
+    request: ResumeBatchAnalysisRequest = Body(...),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSchema = Depends(get_current_user)
+):
+    """
+    Analyse un lot de CV (IDs et/ou contenus) et retourne les résultats au fil
+    de l'eau, au format NDJSON : une ligne par CV, dès que son analyse est terminée.
+    """
+    if len(request.items) > settings.ANALYSIS_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Un lot ne peut pas contenir plus de {settings.ANALYSIS_BATCH_MAX_ITEMS} CV"
+        )
+
+    # Récupérer tous les CV référencés en une seule requête
+    resume_ids = {item.resume_id for item in request.items if item.resume_id}
+    resumes = {}
+    if resume_ids:
+        result = await db.execute(select(Resume).where(Resume.id.in_(resume_ids)))
+        resumes = {resume.id: resume for resume in result.scalars()}
+
+    return StreamingResponse(
+        _stream_batch_analysis(request.items, resumes, current_user),
+        media_type="application/x-ndjson"
+    )
+
+async def read_upload(file: UploadFile) -> IngestedText:
+    """
+    Lit le contenu du fichier (texte, PDF ou DOCX) par morceaux, sans dépasser
+    la taille maximale.
+    """
+    try:
+        return await read_upload_document(file, settings.UPLOAD_MAX_BYTES, settings.UPLOAD_CHUNK_SIZE)
+    except UploadTooLarge:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Le fichier dépasse la taille maximale autorisée ({settings.UPLOAD_MAX_BYTES} octets)"
+        )
+    except UnsupportedDocument:
+        raise HTTPException(
+            status_code=415,
+            detail="Format de fichier non pris en charge (formats acceptés : texte, PDF, DOCX)"
+        )
+    except DocumentRejected as exc:
+        raise HTTPException(status_code=422, detail=str(exc) or "Document illisible")
+    except ExtractionQueueFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Le service d'extraction est saturé, veuillez réessayer plus tard",
+            headers={"Retry-After": "1"},
+        )
+
+# Champs des réponses détaillées de CV, sélectionnables par `?fields=`
+RESUME_FIELDS = frozenset(ResumeWithAnalysis.__fields__)
+
+
+class ResumeFields(NamedTuple):
+    """Champs demandés par le client pour un CV, et longueur maximale du contenu retourné."""
+    fields: FrozenSet[str]
+    content_max_chars: Optional[int]
+
+
+def resume_fields(
+    fields: Optional[str] = Query(
+        None, description="Champs retournés, séparés par des virgules (ex. `id,title,analysis`) ; tous par défaut"
+    ),
+    content_max_chars: Optional[int] = Query(None, ge=0, description="Tronquer le contenu à ce nombre de caractères"),
+) -> ResumeFields:
+    if not fields:
+        return ResumeFields(RESUME_FIELDS, content_max_chars)
+    selected = frozenset(field.strip() for field in fields.split(",") if field.strip())
+    unknown = selected - RESUME_FIELDS
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Champs inconnus : {', '.join(sorted(unknown))}")
+    return ResumeFields(selected, content_max_chars)
+
+
+async def resume_response(
+    resume: Resume,
+    analysis: Optional[ResumeAnalysisResponse],
+    requested: ResumeFields,
+    content: Optional[str] = None,
+    duplicate: Optional[Duplicate] = None,
+) -> ORJSONResponse:
+    """
+    Réponse détaillée d'un CV, limitée aux champs demandés. Le modèle est
+    construit une seule fois, sans nouvelle validation (les valeurs viennent
+    de la base ou de l'analyseur), et sérialisé directement par orjson. Le
+    texte complet n'est lu dans le stockage d'objets que s'il est retourné
+    au-delà du début conservé dans la table.
+    """
+    values = {
+        "id": resume.id,
+        "user_id": resume.user_id,
+        "title": resume.title,
+        "original_filename": resume.original_filename,
+        "created_at": resume.created_at,
+        "updated_at": resume.updated_at,
+        "analysis": analysis.dict() if analysis is not None and "analysis" in requested.fields else {},
+        "duplicate_of": duplicate.resume.id if duplicate is not None else None,
+        "duplicate_kind": duplicate.kind if duplicate is not None else None,
+        "content": "",
+        "content_truncated": False,
+    }
+    if "content" in requested.fields:
+        limit = requested.content_max_chars
+        partial = False
+        if content is None:
+            if limit is not None and (not resume.content_key or limit <= len(resume.content)):
+                # Le début du texte conservé dans la table suffit
+                content = resume.content
+                partial = bool(resume.content_key)
+            else:
+                content = await load_content(resume)
+        if limit is not None:
+            values["content_truncated"] = partial or len(content) > limit
+            content = content[:limit]
+        values["content"] = content
+    model = ResumeWithAnalysis.construct(**values)
+    return ORJSONResponse(model.dict(include=requested.fields))
+
+
+async def reusable_analysis(db: AsyncSession, content_hash: str) -> Optional[ResumeAnalysisResponse]:
+    """
+    Analyse déjà stockée pour un contenu importé : celle d'un CV de contenu
+    identique à l'octet près, quel que soit son utilisateur. L'analyse d'un CV
+    identique aux espaces et à la casse près n'est pas reprise telle quelle
+    (positions des sections, termes dans la casse de l'autre texte) : seuls les
+    résultats de ses sections inchangées le sont, par l'analyse incrémentale.
+    """
+    stored = await find_shared_analysis(db, content_hash)
+    return load_analysis(stored, None, content_hash) if stored is not None else None
+
+async def duplicate_response(db: AsyncSession, duplicate: Duplicate, requested: ResumeFields) -> ORJSONResponse:
+    """Réponse à l'import d'un CV identique à un CV existant : le CV existant."""
+    RESUME_DUPLICATES.inc(duplicate.kind)
+    analysis = await get_stored_analysis(db, duplicate.resume)
+    return await resume_response(duplicate.resume, analysis, requested, duplicate=duplicate)
+
 @router.post("/upload", response_model=ResumeWithAnalysis)
 async def upload_resume(
     file: UploadFile = File(...),
     title: str = Form(...),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)  # Ajout de la dépendance
+    requested: ResumeFields = Depends(resume_fields),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSchema = Depends(get_current_user)  # Ajout de la dépendance
 ):
     """
     Télécharge un CV, l'enregistre en base de données et retourne une analyse.
+
+    Si l'utilisateur a déjà importé ce contenu, le CV existant est retourné
+    (`duplicate_of`). Un CV identique aux espaces et à la casse près, ou
+    similaire au-delà de `DEDUP_MINHASH_THRESHOLD`, est enregistré et seules
+    ses sections différentes de celles du CV existant sont analysées.
+
+    `?fields=` restreint les champs retournés (ex. `fields=id,analysis` pour
+    ne pas recevoir le contenu) ; `content_max_chars` tronque le contenu.
     """
-    # Lire le contenu du fichier
-    content = await file.read()
-    content_text = content.decode("utf-8")
+    ingested = await read_upload(file)
+    content_text = ingested.text
+
+    # CV déjà importé par l'utilisateur : aucune nouvelle copie ni analyse
+    duplicate = await find_duplicate(db, current_user.id, content_text, ingested.content_hash)
+    if duplicate is not None and duplicate.kind == EXACT:
+        return await duplicate_response(db, duplicate, requested)
+
+    # Analyser le CV (seules les sections modifiées d'un CV similaire sont ré-analysées)
+    analysis = await reusable_analysis(db, ingested.content_hash)
+    if analysis is None:
+        previous_sections = load_sections(stored_analysis(duplicate.resume)) if duplicate is not None else None
+        analysis = await run_analysis(content_text, ingested.content_hash, previous_sections)
+    if duplicate is not None:
+        RESUME_DUPLICATES.inc(duplicate.kind)
     
-    # Créer l'entrée dans la base de données
+    # Créer l'entrée dans la base de données, avec l'analyse et son index
     resume_db = Resume(
         title=title,
-        content=content_text,
         original_filename=file.filename,
         user_id=current_user.id  # Utiliser l'ID de l'utilisateur connecté
     )
-    db.add(resume_db)
-    db.commit()
-    db.refresh(resume_db)
-    
-    # Analyser le CV
-    analysis = resume_analyzer.analyze_resume(content_text)
+    await set_content(resume_db, content_text, ingested.content_hash)
+    await store_original(resume_db, file, ingested.file_hash, ingested.size, ingested.format)
+    try:
+        db.add(resume_db)
+        await store_analysis(db, resume_db, analysis, ingested.content_hash)
+        await db.commit()
+    except IntegrityError:
+        # Même CV importé au même moment par une autre requête
+        await db.rollback()
+        duplicate = await find_duplicate(db, current_user.id, content_text, ingested.content_hash, threshold=0)
+        if duplicate is None or duplicate.kind != EXACT:
+            raise
+        return await duplicate_response(db, duplicate, requested)
+    await db.refresh(resume_db)
     
     # Créer la réponse
-    resume_schema = ResumeSchema.from_orm(resume_db)
-    return ResumeWithAnalysis(
-        **resume_schema.dict(),
-        analysis=analysis.dict()
+    return await resume_response(resume_db, analysis, requested, content_text, duplicate)
+
+
+@router.post("/upload/async", response_model=AnalysisJobStatus, status_code=202)
+async def upload_resume_async(
+    file: UploadFile = File(...),
+    title: str = Form(...),
+    callback_url: Optional[str] = Form(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSchema = Depends(get_current_user)
+):
+    """
+    Télécharge un CV et l'enregistre sans attendre son analyse, exécutée en
+    arrière-plan. Le résultat est disponible via `GET /api/jobs/{id}` ; si
+    `callback_url` est fourni, il reçoit un POST JSON à la fin de l'analyse
+    (adresses publiques uniquement, sauf `ANALYSIS_JOBS_CALLBACK_ALLOWED_HOSTS`).
+
+    Si l'utilisateur a déjà importé ce contenu, la tâche porte sur le CV
+    existant et se termine dès la lecture de son analyse stockée.
+    """
+    if callback_url:
+        try:
+            await check_callback_url(callback_url)
+        except CallbackRejected as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
+    ingested = await read_upload(file)
+    duplicate = await find_duplicate(db, current_user.id, ingested.text, ingested.content_hash)
+    if duplicate is not None:
+        RESUME_DUPLICATES.inc(duplicate.kind)
+    if duplicate is not None and duplicate.kind == EXACT:
+        job = await enqueue_analysis(db, duplicate.resume, callback_url)
+    else:
+        resume_db = Resume(
+            title=title,
+            original_filename=file.filename,
+            user_id=current_user.id
+        )
+        await set_content(resume_db, ingested.text, ingested.content_hash)
+        await store_original(resume_db, file, ingested.file_hash, ingested.size, ingested.format)
+        db.add(resume_db)
+        # Analyse d'un CV de même contenu réutilisable : la tâche n'aura rien à calculer
+        analysis = await reusable_analysis(db, ingested.content_hash)
+        if analysis is not None:
+            await store_analysis(db, resume_db, analysis, ingested.content_hash)
+        job = await enqueue_analysis(db, resume_db, callback_url)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Même CV importé au même moment par une autre requête
+        await db.rollback()
+        duplicate = await find_duplicate(db, current_user.id, ingested.text, ingested.content_hash, threshold=0)
+        if duplicate is None or duplicate.kind != EXACT:
+            raise
+        job = await enqueue_analysis(db, duplicate.resume, callback_url)
+        await db.commit()
+    analysis_job_worker.notify()
+
+    return AnalysisJobStatus.from_orm(job)
+
+@router.get("/search", response_model=ResumePage)
+async def search_resumes(
+    skills: List[str] = Query([]),
+    titles: List[str] = Query([]),
+    min_experience: Optional[float] = Query(None, ge=0),
+    user_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSchema = Depends(get_current_user)
+):
+    """
+    Recherche les CV qui contiennent toutes les compétences et tous les titres
+    de poste demandés, avec une expérience minimale optionnelle (ex.
+    `?skills=Python&skills=Kubernetes&min_experience=5`).
+
+    La recherche utilise l'index des termes extraits, sans relire les CV. Les
+    utilisateurs ne voient que leurs CV ; les administrateurs voient tous les
+    CV (ou ceux de `user_id`). La pagination se fait par curseur.
+    """
+    criteria = sorted({(SKILL, normalize_term(skill)) for skill in skills if skill.strip()}
+                      | {(TITLE, normalize_term(title)) for title in titles if title.strip()})
+    if not criteria and min_experience is None:
+        raise HTTPException(status_code=400, detail="Indiquez au moins une compétence, un titre ou une expérience minimale")
+
+    # Les utilisateurs ne peuvent chercher que parmi leurs propres CV
+    if not current_user.is_superuser:
+        if user_id and user_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Accès interdit")
+        user_id = current_user.id
+
+    query, id_column = build_search_query(
+        select(
+            Resume.id, Resume.user_id, Resume.title, Resume.original_filename,
+            Resume.experience_years, Resume.created_at, Resume.updated_at
+        ),
+        criteria,
+        min_experience
+    )
+    if user_id:
+        query = query.where(Resume.user_id == user_id)
+    if cursor:
+        try:
+            query = query.where(id_column < decode_id_cursor(cursor))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Curseur de pagination invalide")
+
+    # Une ligne de plus que demandé pour savoir s'il existe une page suivante
+    rows = (await db.execute(query.order_by(id_column.desc()).limit(limit + 1))).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_id_cursor(rows[-1].id)
+
+    return ResumePage(
+        items=[ResumeSummary.from_orm(row) for row in rows],
+        next_cursor=next_cursor
     )
 
+@router.get("/search/text", response_model=ResumeSearchPage)
+async def search_resume_text(
+    q: str = Query(..., min_length=1, max_length=500),
+    user_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSchema = Depends(get_current_user)
+):
+    """
+    Recherche plein texte dans les CV (titre et contenu, français et anglais),
+    par pertinence décroissante, avec un extrait mettant en évidence les mots
+    trouvés. `q` accepte la syntaxe des moteurs de recherche : guillemets,
+    "or", exclusion par "-".
+
+    Les utilisateurs ne voient que leurs CV ; les administrateurs voient tous
+    les CV (ou ceux de `user_id`). La pagination se fait par curseur.
+    """
+    # Mêmes règles d'accès que pour la consultation d'un CV
+    if not current_user.is_superuser:
+        if user_id and user_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Accès interdit")
+        user_id = current_user.id
+
+    after = None
+    if cursor:
+        try:
+            after = decode_rank_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Curseur de pagination invalide")
+
+    # Un résultat de plus que demandé pour savoir s'il existe une page suivante
+    hits = await search_text(db, q, user_id, limit + 1, after)
+
+    next_cursor = None
+    if len(hits) > limit:
+        hits = hits[:limit]
+        next_cursor = encode_rank_cursor(hits[-1].rank, hits[-1].id)
+
+    return ResumeSearchPage(items=hits, next_cursor=next_cursor)
+
+@router.post("/match", response_model=JobMatchResponse)
+async def match_resumes(
+    request: JobMatchRequest = Body(...),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSchema = Depends(get_current_user)
+):
+    """
+    Classe les CV selon leur adéquation avec une offre d'emploi.
+
+    La description de l'offre est analysée comme un CV (compétences, titres de
+    poste, expérience demandée) ; les compétences, le titre et l'expérience
+    minimale fournis explicitement s'y ajoutent. Le score combine la part des
+    compétences et des titres de l'offre présents dans le CV, et l'expérience
+    du candidat rapportée à l'expérience demandée.
+
+    Les utilisateurs ne classent que leurs CV ; les administrateurs classent
+    tous les CV (ou ceux de `user_id`).
+    """
+    user_id = request.user_id
+    if not current_user.is_superuser:
+        if user_id and user_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Accès interdit")
+        user_id = current_user.id
+
+    skills = {normalize_term(skill) for skill in request.skills if skill.strip()}
+    titles = title_terms(request.title) if request.title else set()
+    experience_years = request.min_experience
+    description = normalize_content(request.description)
+    if description:
+        analysis = await run_analysis(description)
+        for kind, term in extract_terms(analysis):
+            (skills if kind == SKILL else titles).add(term)
+        if experience_years is None:
+            experience_years = analysis.experience_years
+    if not skills and not titles and not experience_years:
+        raise HTTPException(status_code=400, detail="Aucun critère reconnu dans l'offre")
+
+    job = JobProfile(skills, titles, experience_years)
+    matrix = await candidate_index.get(db)
+    with MATCHING_SECONDS.time("score"):
+        matches = matrix.score(job, request.limit, user_id or None)
+
+    # Métadonnées des CV retenus (un CV supprimé depuis la construction de la matrice est ignoré)
+    rows = {}
+    if matches:
+        result = await db.execute(
+            select(
+                Resume.id, Resume.user_id, Resume.title, Resume.original_filename,
+                Resume.experience_years, Resume.created_at, Resume.updated_at
+            ).where(Resume.id.in_([match.resume_id for match in matches]))
+        )
+        rows = {row.id: row for row in result}
+
+    return JobMatchResponse(
+        criteria=JobCriteria(
+            skills=sorted(skills), job_titles=sorted(titles), experience_years=experience_years
+        ),
+        items=[
+            ResumeMatch(
+                **rows[match.resume_id]._asdict(), score=match.score,
+                matched_skills=match.skills, matched_titles=match.titles
+            )
+            for match in matches if match.resume_id in rows
+        ]
+    )
 
 @router.get("/{resume_id}", response_model=ResumeWithAnalysis)
-def get_resume(
+async def get_resume(
     resume_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    requested: ResumeFields = Depends(resume_fields),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSchema = Depends(get_current_user)
 ):
     """
     Récupère un CV avec son analyse.
+
+    `?fields=` restreint les champs retournés (ex. `fields=id,analysis` pour
+    ne pas recevoir le contenu) ; `content_max_chars` tronque le contenu.
     """
-    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    resume = await db.get(Resume, resume_id)
     if not resume:
         raise HTTPException(status_code=404, detail="CV non trouvé")
 
@@ -105,28 +624,121 @@ def get_resume(
     if resume.user_id != current_user.id and not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Accès interdit")
 
-    # Analyser le CV
-    analysis = resume_analyzer.analyze_resume(resume.content)
+    # Lire l'analyse stockée (recalculée uniquement si elle est périmée), si elle est demandée
+    analysis = await get_stored_analysis(db, resume) if "analysis" in requested.fields else None
 
-    # Créer la réponse
-    resume_schema = ResumeSchema.from_orm(resume)
-    return ResumeWithAnalysis(
-        **resume_schema.dict(),
-        analysis=analysis.dict()
+    # Créer la réponse, avec le texte complet sauf demande contraire
+    return await resume_response(resume, analysis, requested)
+
+@router.get("/{resume_id}/file")
+async def download_resume_file(
+    resume_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSchema = Depends(get_current_user)
+):
+    """
+    Télécharge le fichier d'origine d'un CV, lu par morceaux depuis le
+    stockage d'objets.
+    """
+    resume = await db.get(Resume, resume_id)
+    if not resume:
+        raise HTTPException(status_code=404, detail="CV non trouvé")
+
+    # Vérifier que l'utilisateur a accès à ce CV
+    if resume.user_id != current_user.id and not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Accès interdit")
+
+    if not resume.file_key or blob_storage is None:
+        raise HTTPException(status_code=404, detail="Le fichier d'origine de ce CV n'a pas été conservé")
+    chunks = blob_storage.iter_chunks(resume.file_key, settings.UPLOAD_CHUNK_SIZE)
+    try:
+        # Premier morceau lu avant l'envoi des en-têtes, pour détecter un objet absent
+        first_chunk = await chunks.__anext__()
+    except StopAsyncIteration:
+        first_chunk = b""
+    except BlobNotFound:
+        raise HTTPException(status_code=404, detail="Le fichier d'origine de ce CV n'a pas été conservé")
+
+    async def stream() -> AsyncIterator[bytes]:
+        yield first_chunk
+        async for chunk in chunks:
+            yield chunk
+
+    filename = quote(resume.original_filename or f"cv-{resume.id}")
+    return StreamingResponse(
+        stream(),
+        media_type=MEDIA_TYPES.get(resume.file_format, "application/octet-stream"),
+        headers={
+            "Content-Disposition": f"attachment; filename*=UTF-8''{filename}",
+            "Content-Length": str(resume.file_size),
+        },
     )
 
-@router.get("/", response_model=List[ResumeSchema])
-def list_resumes(
-    skip: int = 0,
-    limit: int = 100,
+@router.put("/{resume_id}", response_model=ResumeWithAnalysis)
+async def update_resume(
+    resume_id: int,
+    update: ResumeUpdate = Body(...),
+    requested: ResumeFields = Depends(resume_fields),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSchema = Depends(get_current_user)
+):
+    """
+    Modifie le titre et/ou le contenu d'un CV et retourne sa nouvelle analyse.
+
+    L'analyse est incrémentale : seules les sections dont le texte a changé
+    sont ré-analysées, les autres reprennent les résultats stockés. Les
+    champs retournés se choisissent comme pour `GET /{resume_id}`.
+    """
+    resume = await db.get(Resume, resume_id)
+    if not resume:
+        raise HTTPException(status_code=404, detail="CV non trouvé")
+
+    # Vérifier que l'utilisateur a accès à ce CV
+    if resume.user_id != current_user.id and not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Accès interdit")
+
+    if update.title is not None:
+        resume.title = update.title
+
+    content = normalize_content(update.content) if update.content is not None else None
+    content_hash = compute_content_hash(content) if content is not None else None
+    if content is None or content_hash == resume_content_hash(resume):
+        # Contenu inchangé : l'analyse stockée reste valable
+        analysis = await get_stored_analysis(db, resume)
+    else:
+        # Le contenu d'un CV est unique parmi les CV de son utilisateur
+        existing_id = (await db.execute(
+            select(Resume.id).where(Resume.user_id == resume.user_id, Resume.content_hash == content_hash)
+        )).scalar_one_or_none()
+        if existing_id is not None:
+            raise HTTPException(status_code=409, detail=f"Le CV {existing_id} a déjà ce contenu")
+        analysis = await run_analysis(content, content_hash, load_sections(stored_analysis(resume)))
+        await set_content(resume, content, content_hash)
+        await store_analysis(db, resume, analysis, content_hash)
+    await db.commit()
+
+    # Créer la réponse, avec le texte complet sauf demande contraire
+    return await resume_response(resume, analysis, requested, content)
+
+@router.get("/", response_model=ResumePage)
+async def list_resumes(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=100),
     user_id: Optional[int] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSchema = Depends(get_current_user)
 ):
     """
-    Liste tous les CV, avec filtrage optionnel par utilisateur.
+    Liste les CV (du plus récent au plus ancien), avec filtrage optionnel par utilisateur.
+
+    La pagination se fait par curseur : passer `next_cursor` de la page
+    précédente pour obtenir la suivante. Seules les métadonnées sont retournées.
     """
-    query = db.query(Resume)
+    # Ne charger que les colonnes affichées, jamais le contenu ni l'analyse
+    query = select(
+        Resume.id, Resume.user_id, Resume.title, Resume.original_filename,
+        Resume.experience_years, Resume.created_at, Resume.updated_at
+    )
 
     # Par défaut, limiter aux CV de l'utilisateur courant
     if not user_id:
@@ -136,7 +748,31 @@ def list_resumes(
         # Si l'utilisateur demande un autre utilisateur, vérifier les droits
         if user_id != current_user.id and not current_user.is_superuser:
             raise HTTPException(status_code=403, detail="Accès interdit")
-        query = query.filter(Resume.user_id == user_id)
+        query = query.where(Resume.user_id == user_id)
 
-    resumes = query.offset(skip).limit(limit).all()
-    return resumes
+    if cursor:
+        try:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Curseur de pagination invalide")
+        # Comparer à la date telle que stockée en base (la précision varie selon le SGBD) ;
+        # la date du curseur ne sert que si le CV a été supprimé entre-temps
+        stored_created_at = select(Resume.created_at).where(Resume.id == cursor_id).scalar_subquery()
+        query = query.where(
+            tuple_(Resume.created_at, Resume.id)
+            < tuple_(func.coalesce(stored_created_at, cursor_created_at), cursor_id)
+        )
+
+    # Une ligne de plus que demandé pour savoir s'il existe une page suivante
+    query = query.order_by(Resume.created_at.desc(), Resume.id.desc()).limit(limit + 1)
+    rows = (await db.execute(query)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    return ResumePage(
+        items=[ResumeSummary.from_orm(row) for row in rows],
+        next_cursor=next_cursor
+    )
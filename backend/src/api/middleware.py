@@ -0,0 +1,94 @@
+from typing import Callable, Dict, Optional, Tuple
+import cProfile
+import os
+import random
+import re
+import time
+
+from ..services.metrics import HTTP_REQUESTS, HTTP_REQUEST_SECONDS, SLOW_REQUEST_PROFILES
+
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI qui mesure chaque requête HTTP, par router et par route.
+
+    La route est le chemin déclaré (ex. "/api/resumes/{resume_id}") et non le
+    chemin demandé, pour borner le nombre de séries. La durée inclut l'envoi
+    complet de la réponse, y compris pour les réponses en flux (NDJSON).
+
+    Si `profile_threshold_ms` est non nul, une fraction `profile_sample_rate`
+    des requêtes est profilée avec cProfile ; le profil est enregistré dans
+    `profile_dir` lorsque la requête dépasse le seuil. Le profileur couvre tout
+    le thread de la boucle d'événements : une seule requête est profilée à la
+    fois, et le profil peut contenir des traces d'autres requêtes concurrentes.
+    """
+
+    def __init__(
+        self, app, profile_threshold_ms: float = 0, profile_sample_rate: float = 0, profile_dir: str = ""
+    ):
+        self.app = app
+        self.profile_threshold_ms = profile_threshold_ms
+        self.profile_sample_rate = profile_sample_rate
+        self.profile_dir = profile_dir
+        self._routes: Optional[Dict[Callable, Tuple[str, str]]] = None
+        self._profiling = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        profiler = self._start_profiler()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            router, route = self._route_labels(scope)
+            HTTP_REQUESTS.inc(router, route, scope["method"], str(status_code))
+            HTTP_REQUEST_SECONDS.observe(elapsed, router, route, scope["method"])
+            if profiler is not None:
+                self._finish_profiler(profiler, elapsed, scope["method"], router, route)
+
+    def _route_labels(self, scope) -> Tuple[str, str]:
+        # Le routeur de Starlette ajoute l'endpoint de la route trouvée au scope
+        if self._routes is None:
+            self._routes = {
+                route.endpoint: ((getattr(route, "tags", None) or ["app"])[0], route.path)
+                for route in scope["app"].routes
+                if hasattr(route, "endpoint")
+            }
+        return self._routes.get(scope.get("endpoint"), ("none", "unmatched"))
+
+    def _start_profiler(self) -> Optional[cProfile.Profile]:
+        if not self.profile_threshold_ms or self._profiling or random.random() >= self.profile_sample_rate:
+            return None
+        self._profiling = True
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    def _finish_profiler(
+        self, profiler: cProfile.Profile, elapsed: float, method: str, router: str, route: str
+    ) -> None:
+        profiler.disable()
+        self._profiling = False
+        if elapsed * 1000 < self.profile_threshold_ms:
+            return
+
+        # Fichier lisible avec `python -m pstats` ou snakeviz
+        os.makedirs(self.profile_dir, exist_ok=True)
+        name = _UNSAFE_FILENAME_CHARS.sub("_", f"{method}{route}").strip("_")
+        path = os.path.join(self.profile_dir, f"{int(time.time() * 1000)}-{name}-{int(elapsed * 1000)}ms.prof")
+        profiler.dump_stats(path)
+        SLOW_REQUEST_PROFILES.inc(router)
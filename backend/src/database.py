@@ -1,17 +1,78 @@
-from sqlalchemy import create_engine
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
+from .services.metrics import DB_QUERY_SECONDS, DB_SESSION_ERRORS, DB_SESSION_SECONDS
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# Pilotes asynchrones utilisés pour chaque base supportée
+ASYNC_DRIVERS = {
+    "postgresql": settings.DATABASE_ASYNC_DRIVER,
+    "sqlite": "aiosqlite",
+}
+
+def get_async_database_url(url: str) -> str:
+    """Convertit l'URL de connexion synchrone en URL pour le pilote asynchrone."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS.get(backend, parsed.get_driver_name())}").render_as_string(hide_password=False)
+
+def get_engine_options(url: str) -> dict:
+    """Options du pool de connexions (SQLite utilise son propre pool, non configurable)."""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+def instrument_engine(sync_engine) -> None:
+    """Mesure la durée des requêtes SQL exécutées par le moteur, par type d'instruction."""
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start_query(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _end_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        # Étiquette bornée : le premier mot-clé de l'instruction (SELECT, INSERT...)
+        DB_QUERY_SECONDS.observe(elapsed, (statement.split(None, 1) or [""])[0].upper())
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _failed_query(context):
+        starts = context.connection.info.get("query_start") if context.connection is not None else None
+        if starts:
+            starts.pop()
+
+# Moteur synchrone (migrations, scripts, tâches hors API)
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **get_engine_options(SQLALCHEMY_DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# Dépendance pour obtenir une session de base de données
-def get_db():
-    db = SessionLocal()
+# Moteur asynchrone utilisé par les endpoints de l'API
+SQLALCHEMY_ASYNC_DATABASE_URL = settings.DATABASE_ASYNC_URL or get_async_database_url(SQLALCHEMY_DATABASE_URL)
+async_engine = create_async_engine(SQLALCHEMY_ASYNC_DATABASE_URL, **get_engine_options(SQLALCHEMY_ASYNC_DATABASE_URL))
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
+# Dépendance des endpoints pour obtenir une session, sans bloquer la boucle d'événements
+async def get_async_db():
+    start = time.perf_counter()
     try:
-        yield db
+        async with AsyncSessionLocal() as db:
+            yield db
+    except Exception:
+        DB_SESSION_ERRORS.inc("async")
+        raise
     finally:
-        db.close()
+        DB_SESSION_SECONDS.observe(time.perf_counter() - start, "async")
@@ -1,13 +1,23 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from .api.endpoints import resume, auth
+from .api.endpoints import resume, auth, jobs
+from .api.middleware import MetricsMiddleware
 from .config import settings
+from .database import async_engine
+from .services.analysis_executor import analysis_executor
+from .services.document_extraction import document_extractor
+from .services.analysis_jobs import analysis_job_worker
+from .services.analyzer_backends import analyzer_backend
+from .services.metrics import registry
 
 app = FastAPI(
     title="Careernus API",
     description="API pour la plateforme de recrutement Careernus",
-    version="0.1.0"
+    version="0.1.0",
+    # Réponses JSON sérialisées par orjson
+    default_response_class=ORJSONResponse
 )
 
 # Configuration CORS
@@ -19,11 +29,36 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Métriques par router (et profilage optionnel des requêtes lentes)
+app.add_middleware(
+    MetricsMiddleware,
+    profile_threshold_ms=settings.PROFILE_SLOW_REQUEST_MS,
+    profile_sample_rate=settings.PROFILE_SAMPLE_RATE,
+    profile_dir=settings.PROFILE_DIR,
+)
+
 # Inclure les routers
 app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
 app.include_router(resume.router, prefix="/api/resumes", tags=["resumes"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["jobs"])
 
 
+@app.on_event("startup")
+async def start_workers():
+    # Analyses en arrière-plan exécutées par les processus de l'API
+    if settings.ANALYSIS_JOBS_IN_PROCESS:
+        analysis_job_worker.start()
+
+@app.on_event("shutdown")
+async def shutdown_resources():
+    # Terminer les analyses en arrière-plan, arrêter proprement les processus
+    # d'analyse et d'extraction et fermer les pools de connexions
+    await analysis_job_worker.stop()
+    await analyzer_backend.aclose()
+    analysis_executor.shutdown()
+    document_extractor.shutdown()
+    await async_engine.dispose()
+
 @app.get("/")
 async def root():
     return {"message": "Bienvenue sur l'API Careernus", "status": "online"}
@@ -32,6 +67,12 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        # Format texte Prometheus (métriques de ce processus uniquement)
+        return Response(registry.render(), media_type=registry.CONTENT_TYPE)
+
 # Point d'entrée pour exécuter l'application
 if __name__ == "__main__":
     import uvicorn
@@ -1,3 +1,5 @@
 from .base import Base
 from .user import User
 from .resume import Resume
+from .resume_term import ResumeTerm
+from .analysis_job import AnalysisJob
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
+from .base import Base, TimestampMixin
+
+class AnalysisJob(Base, TimestampMixin):
+    """
+    Analyse de CV en attente ou en cours d'exécution en arrière-plan. La table
+    sert de file d'attente : les workers réservent les tâches avec
+    `SELECT ... FOR UPDATE SKIP LOCKED`.
+    """
+    __tablename__ = "analysis_jobs"
+
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    id = Column(Integer, primary_key=True, index=True)
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    status = Column(String(16), nullable=False, default=PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    run_after = Column(DateTime(timezone=True), nullable=False)  # Prochaine tentative (UTC)
+    locked_at = Column(DateTime(timezone=True))  # Début de la tentative en cours
+    finished_at = Column(DateTime(timezone=True))
+    error = Column(Text)
+    callback_url = Column(String)
+
+    __table_args__ = (
+        # Réservation des tâches prêtes, par ordre d'échéance
+        Index("ix_analysis_jobs_status_run_after", "status", "run_after"),
+    )
@@ -8,3 +8,7 @@ Base = declarative_base()
 class TimestampMixin:
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Recharger les valeurs générées par la base dès l'écriture : les sessions
+    # asynchrones ne peuvent pas les charger paresseusement à l'accès
+    __mapper_args__ = {"eager_defaults": True}
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from sqlalchemy import Column, Integer, Float, String, Text, ForeignKey, Index, JSON, LargeBinary
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from .base import Base, TimestampMixin
 
@@ -9,12 +10,36 @@ class Resume(Base, TimestampMixin):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     title = Column(String, nullable=False)
     content = Column(Text, nullable=False)
+    # Détection des doublons : empreinte du texte complet (unique par utilisateur),
+    # empreinte aux espaces et à la casse près, et signature MinHash
+    content_hash = Column(String(64))
+    fingerprint = Column(String(64))
+    content_minhash = Column(LargeBinary)
     original_filename = Column(String)
-    parsed_data = Column(Text)  # JSON stocké sous forme de texte
+    # Fichier d'origine dans le stockage d'objets (clé dérivée de son empreinte SHA-256)
+    file_key = Column(String)
+    file_hash = Column(String(64))
+    file_size = Column(Integer)
+    file_format = Column(String(16))  # "text", "pdf" ou "docx"
+    # Texte complet stocké hors de la table (`content` n'en contient alors que le début)
+    content_key = Column(String)
+    # Analyse stockée (voir services.analysis_codec) : JSON (JSONB sur PostgreSQL),
+    # ou msgpack compressé selon ANALYSIS_STORAGE_FORMAT
+    parsed_data = Column(JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"))
+    parsed_packed = Column(LargeBinary)
+    experience_years = Column(Float)  # Issu de l'analyse, pour la recherche
     
     # Relations
     user = relationship("User", back_populates="resumes")
 
+    __table_args__ = (
+        # Pagination par curseur des CV d'un utilisateur
+        Index("ix_resumes_user_id_created_at_id", "user_id", "created_at", "id"),
+        # Doublons d'un utilisateur, et analyses partagées entre utilisateurs (même contenu)
+        Index("ux_resumes_content_hash_user_id", "content_hash", "user_id", unique=True),
+        Index("ix_resumes_user_id_fingerprint", "user_id", "fingerprint"),
+    )
+
 # Ajoutez cette relation dans le modèle User
 from .user import User
 User.resumes = relationship("Resume", back_populates="user")
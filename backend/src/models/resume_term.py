@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from .base import Base
+
+class ResumeTerm(Base):
+    """
+    Index inversé des CV : une ligne par terme extrait (compétence, titre de
+    poste) et par CV. La clé primaire (kind, term, resume_id) donne, pour
+    chaque terme, la liste triée des CV qui le contiennent.
+    """
+    __tablename__ = "resume_terms"
+
+    kind = Column(String(16), primary_key=True)  # "skill" ou "title"
+    term = Column(String, primary_key=True)  # Forme normalisée (minuscules)
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), primary_key=True)
+
+    __table_args__ = (
+        # Mise à jour des termes d'un CV
+        Index("ix_resume_terms_resume_id", "resume_id"),
+    )
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 
@@ -26,14 +26,78 @@ class ResumeInDBBase(ResumeBase):
 class Resume(ResumeInDBBase):
     pass
 
+class ResumeSummary(BaseModel):
+    """Métadonnées d'un CV, sans son contenu (listes)."""
+    id: int
+    user_id: int
+    title: str
+    original_filename: Optional[str] = None
+    experience_years: Optional[float] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+class ResumePage(BaseModel):
+    items: List[ResumeSummary] = []
+    next_cursor: Optional[str] = None
+
+class ResumeSearchHit(ResumeSummary):
+    """Résultat d'une recherche plein texte : score de pertinence et extrait."""
+    rank: float
+    snippet: Optional[str] = None
+
+class ResumeSearchPage(BaseModel):
+    items: List[ResumeSearchHit] = []
+    next_cursor: Optional[str] = None
+
+class JobMatchRequest(BaseModel):
+    """Offre d'emploi à rapprocher des CV : description libre, complétée de critères explicites."""
+    description: str = ""
+    title: Optional[str] = None
+    skills: List[str] = []
+    min_experience: Optional[float] = Field(None, ge=0)
+    user_id: Optional[int] = None
+    limit: int = Field(20, ge=1, le=100)
+
+class JobCriteria(BaseModel):
+    """Critères retenus pour une offre (termes normalisés)."""
+    skills: List[str] = []
+    job_titles: List[str] = []
+    experience_years: Optional[float] = None
+
+class ResumeMatch(ResumeSummary):
+    """CV rapproché d'une offre : score entre 0 et 1 et critères de l'offre présents dans le CV."""
+    score: float
+    matched_skills: List[str] = []
+    matched_titles: List[str] = []
+
+class JobMatchResponse(BaseModel):
+    criteria: JobCriteria
+    items: List[ResumeMatch] = []
+
 class ResumeWithAnalysis(Resume):
     analysis: Dict[str, Any] = {}
+    # CV existant identique ou proche du CV importé (le CV retourné, s'il est identique)
+    duplicate_of: Optional[int] = None
+    duplicate_kind: Optional[str] = None
+    # Contenu tronqué à la demande du client (`content_max_chars`)
+    content_truncated: bool = False
     
 class ResumeAnalysisRequest(BaseModel):
     resume_id: Optional[int] = None
     content: Optional[str] = None
     file_content: Optional[str] = None
     
+class ResumeSection(BaseModel):
+    """Section d'un CV analysé : position dans le contenu normalisé et résultats des extracteurs."""
+    kind: str
+    start: int
+    end: int
+    content_hash: str
+    results: Dict[str, Any] = {}
+
 class ResumeAnalysisResponse(BaseModel):
     skills: List[str] = []
     experience_years: Optional[float] = None
@@ -43,3 +107,30 @@ class ResumeAnalysisResponse(BaseModel):
     ats_score: Optional[int] = None
     strengths: List[str] = []
     weaknesses: List[str] = []
+    sections: List[ResumeSection] = []
+    analyzer_version: Optional[str] = None  # Analyseur qui a produit le résultat
+
+class AnalysisJobStatus(BaseModel):
+    """État d'une analyse en arrière-plan ; l'analyse est fournie une fois la tâche réussie."""
+    id: int
+    resume_id: int
+    status: str
+    attempts: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    analysis: Optional[ResumeAnalysisResponse] = None
+
+    class Config:
+        orm_mode = True
+
+class ResumeBatchAnalysisRequest(BaseModel):
+    items: List[ResumeAnalysisRequest]
+
+class ResumeBatchAnalysisItem(BaseModel):
+    index: int
+    resume_id: Optional[int] = None
+    status_code: int = 200
+    analysis: Optional[ResumeAnalysisResponse] = None
+    error: Optional[str] = None
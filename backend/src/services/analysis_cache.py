@@ -0,0 +1,78 @@
+from typing import Dict, Optional
+
+from ..config import settings
+from ..schemas.resume import ResumeAnalysisResponse
+from .analysis_store import compute_content_hash
+from .cache import CacheBackend, LRUCache, create_cache_backend
+from .metrics import cache_stats_callback, registry
+from .analyzer_backends import analyzer_backend
+
+
+class AnalysisCache:
+    """
+    Cache des analyses de CV, adressé par le contenu.
+
+    La clé est l'empreinte du contenu normalisé et la version du moteur
+    d'analyse : un même CV soumis plusieurs fois n'est analysé qu'une seule
+    fois. Un cache partagé optionnel (`CacheBackend`) permet aux différents
+    workers de profiter des analyses faites par les autres. Les analyses de
+    repli (produites par un autre moteur) ne sont pas mises en cache.
+    """
+
+    def __init__(self, max_entries: int, ttl: Optional[float] = None, backend: Optional[CacheBackend] = None):
+        self._local = LRUCache(max_entries, ttl)
+        self.ttl = ttl
+        self.backend = backend
+        self.shared_hits = 0
+
+    @staticmethod
+    def key_for(content: str, content_hash: Optional[str] = None) -> str:
+        """Clé de cache d'un contenu déjà normalisé (dont l'empreinte peut être fournie)."""
+        return f"analysis-{analyzer_backend.version}-{content_hash or compute_content_hash(content)}"
+
+    def get(self, content: str, content_hash: Optional[str] = None) -> Optional[ResumeAnalysisResponse]:
+        key = self.key_for(content, content_hash)
+        analysis = self._local.get(key)
+        if analysis is not None or self.backend is None:
+            return analysis
+
+        payload = self.backend.get(key)
+        if payload is None:
+            return None
+        try:
+            analysis = ResumeAnalysisResponse.parse_raw(payload)
+        except ValueError:
+            return None
+        self.shared_hits += 1
+        self._local.set(key, analysis)
+        return analysis
+
+    def set(self, content: str, analysis: ResumeAnalysisResponse, content_hash: Optional[str] = None) -> None:
+        if analysis.analyzer_version not in (None, analyzer_backend.version):
+            return
+        key = self.key_for(content, content_hash)
+        self._local.set(key, analysis)
+        if self.backend is not None:
+            self.backend.set(key, analysis.json().encode("utf-8"), self.ttl)
+
+    def clear(self) -> None:
+        self._local.clear()
+
+    def stats(self) -> Dict[str, int]:
+        stats = self._local.stats()
+        stats["shared_hits"] = self.shared_hits
+        return stats
+
+
+analysis_cache = AnalysisCache(
+    max_entries=settings.ANALYSIS_CACHE_MAX_ENTRIES,
+    ttl=settings.ANALYSIS_CACHE_TTL_SECONDS,
+    backend=create_cache_backend(
+        settings.ANALYSIS_CACHE_BACKEND, settings.ANALYSIS_CACHE_DIR, settings.FILE_CACHE_MAX_ENTRIES
+    ),
+)
+
+registry.callback(
+    "careernus_analysis_cache", "Statistiques du cache des analyses", ["cache", "stat"],
+    cache_stats_callback(analysis_cache.stats, "analysis"),
+)
@@ -0,0 +1,116 @@
+from typing import Any, Dict, List, Optional, Union
+import hashlib
+import json
+
+from ..schemas.resume import ResumeAnalysisResponse, ResumeSection
+from .vocabulary import DEGREES, JOB_TITLES, SKILLS
+
+# Version du format des analyses stockées (les analyses sans version sont au format 1,
+# sans identifiants de termes : elles restent lisibles)
+STORAGE_FORMAT_VERSION = 2
+
+# Encodages de `Resume.parsed_data` (JSON, JSONB sur PostgreSQL) ou de
+# `Resume.parsed_packed` (msgpack compressé par zstd)
+JSON = "json"
+MSGPACK = "msgpack"
+
+# Les termes du vocabulaire de l'analyseur sont stockés par leur position
+_VOCABULARY = list(dict.fromkeys(SKILLS + JOB_TITLES + DEGREES))
+_TERM_IDS = {term: index for index, term in enumerate(_VOCABULARY)}
+# Empreinte du vocabulaire : des identifiants produits avec un autre vocabulaire ne sont pas décodés
+VOCABULARY_ID = hashlib.sha256("\n".join(_VOCABULARY).encode("utf-8")).hexdigest()[:12]
+
+# Listes de termes remplacées par leurs identifiants, dans l'analyse et dans les résultats des sections
+_TERM_FIELDS = ("skills", "job_titles")
+
+StoredAnalysis = Union[Dict[str, Any], str, bytes]
+
+
+def _encode_terms(terms: List[str]) -> List[Union[int, str]]:
+    # Les termes hors vocabulaire (modèle de langage, titres complets) restent en clair
+    return [_TERM_IDS.get(term, term) for term in terms]
+
+
+def _decode_terms(values: List[Union[int, str]]) -> List[str]:
+    return [_VOCABULARY[value] if isinstance(value, int) else value for value in values]
+
+
+def _map_terms(results: Dict[str, Any], convert) -> Dict[str, Any]:
+    if not any(field in results for field in _TERM_FIELDS):
+        return results
+    results = dict(results)
+    for field in _TERM_FIELDS:
+        if field in results:
+            results[field] = convert(results[field])
+    return results
+
+
+def encode_analysis(analysis: ResumeAnalysisResponse, analyzer_version: str, content_hash: str) -> Dict[str, Any]:
+    """
+    Analyse au format de stockage : l'analyse elle-même, l'empreinte du
+    contenu analysé et la version de l'analyseur, avec les compétences et
+    titres du vocabulaire remplacés par des identifiants entiers.
+    """
+    data = analysis.dict()
+    data = _map_terms(data, _encode_terms)
+    data["sections"] = [
+        {**section, "results": _map_terms(section["results"], _encode_terms)} for section in data["sections"]
+    ]
+    return {
+        "format": STORAGE_FORMAT_VERSION,
+        "vocabulary": VOCABULARY_ID,
+        "analyzer_version": analyzer_version,
+        "content_hash": content_hash,
+        "analysis": data,
+    }
+
+
+def pack(stored: Dict[str, Any]) -> bytes:
+    """Encodage binaire compact (msgpack puis zstd) d'une analyse au format de stockage."""
+    import msgpack
+    import zstandard
+
+    return zstandard.ZstdCompressor().compress(msgpack.packb(stored, use_bin_type=True))
+
+
+def unpack(data: bytes) -> Dict[str, Any]:
+    import msgpack
+    import zstandard
+
+    return msgpack.unpackb(zstandard.ZstdDecompressor().decompress(data), raw=False)
+
+
+def read_stored(stored: Optional[StoredAnalysis]) -> Optional[Dict[str, Any]]:
+    """
+    Analyse stockée, quel que soit son encodage (JSON décodé, texte JSON des
+    versions précédentes, ou binaire compact), ou None si elle est vide,
+    illisible ou produite avec un autre vocabulaire.
+    """
+    if not stored:
+        return None
+    try:
+        if isinstance(stored, (bytes, bytearray, memoryview)):
+            stored = unpack(bytes(stored))
+        elif isinstance(stored, str):
+            stored = json.loads(stored)
+    except Exception:
+        return None
+    if not isinstance(stored, dict) or not isinstance(stored.get("analysis"), dict):
+        return None
+    if stored.get("format", 1) > 1 and stored.get("vocabulary") != VOCABULARY_ID:
+        return None
+    return stored
+
+
+def decode_analysis(stored: Dict[str, Any]) -> ResumeAnalysisResponse:
+    """
+    Analyse d'un résultat lu par `read_stored`. Les données ont été validées à
+    leur écriture : le modèle est construit sans nouvelle validation.
+    """
+    data = _map_terms(stored["analysis"], _decode_terms)
+    sections = [decode_section(section) for section in data.get("sections", [])]
+    return ResumeAnalysisResponse.construct(**{**data, "sections": sections})
+
+
+def decode_section(section: Dict[str, Any]) -> ResumeSection:
+    return ResumeSection.construct(**{**section, "results": _map_terms(section.get("results", {}), _decode_terms)})
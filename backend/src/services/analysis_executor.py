@@ -0,0 +1,117 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import os
+import time
+
+from ..config import settings
+from ..schemas.resume import ResumeAnalysisResponse, ResumeSection
+from .metrics import ANALYSIS_REJECTED, ANALYSIS_SECONDS, observe_stage_timings, registry
+from .resume_analyzer import ResumeAnalyzer
+
+
+class AnalysisQueueFull(Exception):
+    """Levée lorsque trop d'analyses sont déjà en attente d'exécution."""
+
+
+# Analyseur propre à chaque processus du pool (vocabulaires compilés une seule fois)
+_worker_analyzer: Optional[ResumeAnalyzer] = None
+
+
+def _init_worker() -> None:
+    global _worker_analyzer
+    _worker_analyzer = ResumeAnalyzer()
+
+
+def _analyze_in_worker(
+    content: str, previous_sections: Optional[List[ResumeSection]] = None
+) -> Tuple[ResumeAnalysisResponse, Dict[str, float]]:
+    # Les durées par étape sont renvoyées avec le résultat : les métriques
+    # enregistrées dans un processus du pool ne seraient pas exportées
+    if _worker_analyzer is None:
+        _init_worker()
+    timings: Dict[str, float] = {}
+    return _worker_analyzer.analyze_resume(content, timings, previous_sections), timings
+
+
+class AnalysisExecutor:
+    """
+    Exécute les analyses de CV hors de la boucle d'événements.
+
+    Modes disponibles :
+    - "process" : pool de processus, l'analyse (liée au CPU) n'est pas limitée par le GIL ;
+    - "thread" : pool de threads ;
+    - "inline" : exécution directe dans la boucle, pour les tests.
+
+    Le nombre d'analyses en cours ou en attente est borné par `max_queue_depth` :
+    au-delà, `AnalysisQueueFull` est levée au lieu d'allonger la file d'attente.
+    """
+
+    MODES = ("process", "thread", "inline")
+
+    def __init__(self, mode: str = "process", max_workers: int = 0, max_queue_depth: int = 0):
+        if mode not in self.MODES:
+            raise ValueError(f"Mode d'exécution inconnu : {mode}")
+        self.mode = mode
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue_depth = max_queue_depth or self.max_workers * 4
+        self._pool: Optional[Executor] = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Nombre d'analyses en cours d'exécution ou en attente."""
+        return self._pending
+
+    def _get_pool(self) -> Executor:
+        # Le pool est créé à la première utilisation, pas à l'import du module
+        if self._pool is None:
+            if self.mode == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="analysis")
+        return self._pool
+
+    async def analyze(
+        self, content: str, previous_sections: Optional[List[ResumeSection]] = None
+    ) -> ResumeAnalysisResponse:
+        """
+        Analyse un CV dans le pool configuré (de façon incrémentale si les
+        sections d'une analyse précédente sont fournies).
+        """
+        if self._pending >= self.max_queue_depth:
+            ANALYSIS_REJECTED.inc()
+            raise AnalysisQueueFull()
+
+        self._pending += 1
+        start = time.perf_counter()
+        try:
+            if self.mode == "inline":
+                analysis, timings = _analyze_in_worker(content, previous_sections)
+            else:
+                loop = asyncio.get_running_loop()
+                analysis, timings = await loop.run_in_executor(
+                    self._get_pool(), _analyze_in_worker, content, previous_sections
+                )
+        finally:
+            self._pending -= 1
+        ANALYSIS_SECONDS.observe(time.perf_counter() - start, self.mode)
+        observe_stage_timings(timings)
+        return analysis
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+
+analysis_executor = AnalysisExecutor(
+    mode=settings.ANALYSIS_EXECUTOR_MODE,
+    max_workers=settings.ANALYSIS_EXECUTOR_WORKERS,
+    max_queue_depth=settings.ANALYSIS_MAX_QUEUE_DEPTH,
+)
+
+registry.callback(
+    "careernus_analysis_queue_depth", "Analyses en cours ou en attente dans le pool", [],
+    lambda: {(): analysis_executor.pending},
+)
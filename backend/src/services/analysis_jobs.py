@@ -0,0 +1,317 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Set
+from urllib.parse import urlparse
+import asyncio
+import ipaddress
+import logging
+import socket
+
+import httpx
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..database import AsyncSessionLocal
+from ..models.analysis_job import AnalysisJob
+from ..models.resume import Resume
+from .analysis_cache import analysis_cache
+from .analysis_executor import AnalysisQueueFull, analysis_executor
+from .analysis_store import load_resume_analysis, normalize_content, store_analysis
+from .analyzer_backends import analyzer_backend
+from .metrics import ANALYSIS_JOBS, ANALYSIS_JOB_CALLBACKS, registry
+from .resume_storage import load_content
+
+logger = logging.getLogger(__name__)
+
+# Délai avant une nouvelle tentative lorsque le pool d'analyse est saturé (la tentative ne compte pas)
+_QUEUE_FULL_DELAY = timedelta(seconds=1)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class CallbackRejected(ValueError):
+    """Levée pour une URL de notification invalide ou qui désigne une adresse non publique."""
+
+
+async def check_callback_url(url: str) -> None:
+    """
+    Vérifie qu'une URL de notification est en http(s) et que son hôte ne se
+    résout qu'en adresses publiques : le worker ne doit pas pouvoir être
+    utilisé pour appeler des services internes (boucle locale, réseau privé,
+    métadonnées du cloud...). Les hôtes de `ANALYSIS_JOBS_CALLBACK_ALLOWED_HOSTS`
+    sont acceptés sans vérification de leurs adresses.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise CallbackRejected("URL de notification invalide")
+    host = parsed.hostname.lower()
+    allowed = {name.strip().lower() for name in settings.ANALYSIS_JOBS_CALLBACK_ALLOWED_HOSTS.split(",") if name.strip()}
+    if host in allowed:
+        return
+    try:
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        addresses = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except (OSError, ValueError):
+        raise CallbackRejected("Hôte de notification introuvable")
+    for *_, sockaddr in addresses:
+        address = ipaddress.ip_address(sockaddr[0].split("%", 1)[0])
+        if not address.is_global or address.is_multicast:
+            raise CallbackRejected("L'URL de notification doit désigner une adresse publique")
+
+
+async def enqueue_analysis(db: AsyncSession, resume: Resume, callback_url: Optional[str] = None) -> AnalysisJob:
+    """
+    Ajoute l'analyse d'un CV à la file d'attente (sans valider la transaction :
+    la tâche est créée avec le CV). Appeler `analysis_job_worker.notify()` après
+    la validation pour la démarrer sans attendre la prochaine scrutation.
+    """
+    if resume.id is None:
+        await db.flush()
+    job = AnalysisJob(
+        resume_id=resume.id,
+        user_id=resume.user_id,
+        status=AnalysisJob.PENDING,
+        attempts=0,
+        max_attempts=settings.ANALYSIS_JOBS_MAX_ATTEMPTS,
+        run_after=_now(),
+        callback_url=callback_url,
+    )
+    db.add(job)
+    await db.flush()
+    return job
+
+
+class AnalysisJobWorker:
+    """
+    Exécute les analyses en attente dans la table `analysis_jobs`.
+
+    Plusieurs workers (processus de l'API, ou `python -m src.services.analysis_jobs`)
+    peuvent partager la file : les tâches sont réservées avec `FOR UPDATE SKIP
+    LOCKED` sur PostgreSQL, puis par une mise à jour conditionnelle du statut,
+    qui suffit avec SQLite (une seule écriture à la fois). Chaque worker exécute
+    au plus `concurrency` tâches à la fois, dans le pool d'analyse.
+
+    Une tentative échouée est reprogrammée avec un délai doublé à chaque fois,
+    jusqu'à `max_attempts` tentatives ; une tâche en cours depuis plus de
+    `timeout` secondes (worker arrêté) est reprise. L'URL de notification de la
+    tâche est appelée lorsqu'elle se termine, en succès ou en échec définitif.
+    """
+
+    def __init__(
+        self, session_factory: Callable[[], AsyncSession], concurrency: int = 0, poll_interval: float = 2,
+        retry_delay: float = 5, timeout: float = 600, callback_timeout: float = 10, callback_attempts: int = 3
+    ):
+        self.session_factory = session_factory
+        self.concurrency = concurrency or analysis_executor.max_workers
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+        self.timeout = timeout
+        self.callback_timeout = callback_timeout
+        self.callback_attempts = callback_attempts
+        self._wakeup: Optional[asyncio.Event] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._jobs: Set[asyncio.Task] = set()
+        self._callbacks: Set[asyncio.Task] = set()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def running(self) -> int:
+        """Nombre de tâches en cours d'exécution dans ce processus."""
+        return len(self._jobs)
+
+    def start(self) -> None:
+        """Démarre la boucle de réservation des tâches dans la boucle d'événements courante."""
+        if self._runner is None:
+            self._wakeup = asyncio.Event()
+            self._runner = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        """Cesse de réserver des tâches et attend la fin des tâches et notifications en cours."""
+        if self._runner is not None:
+            self._runner.cancel()
+            await asyncio.gather(self._runner, return_exceptions=True)
+            self._runner = None
+        await asyncio.gather(*self._jobs, *self._callbacks, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def notify(self) -> None:
+        """Signale une nouvelle tâche (ou une place libre) au worker de ce processus."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def run(self) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        while True:
+            # Effacé avant la réservation : un signal reçu pendant celle-ci n'est pas perdu
+            self._wakeup.clear()
+            try:
+                for job_id in await self._claim(self.concurrency - len(self._jobs)):
+                    self._track(self._jobs, self._process(job_id))
+            except Exception:
+                logger.exception("Échec de la réservation des analyses en attente")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def _track(self, tasks: Set[asyncio.Task], coroutine) -> None:
+        task = asyncio.get_running_loop().create_task(coroutine)
+        tasks.add(task)
+
+        def done(task: asyncio.Task) -> None:
+            tasks.discard(task)
+            self.notify()
+
+        task.add_done_callback(done)
+
+    def _claimable(self, now: datetime):
+        return or_(
+            and_(AnalysisJob.status == AnalysisJob.PENDING, AnalysisJob.run_after <= now),
+            and_(
+                AnalysisJob.status == AnalysisJob.RUNNING,
+                AnalysisJob.locked_at < now - timedelta(seconds=self.timeout)
+            ),
+        )
+
+    async def _claim(self, limit: int) -> List[int]:
+        """Réserve jusqu'à `limit` tâches prêtes et retourne leurs identifiants."""
+        if limit <= 0:
+            return []
+
+        now = _now()
+        async with self.session_factory() as db:
+            job_ids = (await db.execute(
+                select(AnalysisJob.id)
+                .where(self._claimable(now))
+                .order_by(AnalysisJob.run_after, AnalysisJob.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )).scalars().all()
+
+            claimed = []
+            for job_id in job_ids:
+                result = await db.execute(
+                    update(AnalysisJob)
+                    .where(AnalysisJob.id == job_id, self._claimable(now))
+                    .values(status=AnalysisJob.RUNNING, locked_at=now, attempts=AnalysisJob.attempts + 1)
+                )
+                if result.rowcount:
+                    claimed.append(job_id)
+            await db.commit()
+        return claimed
+
+    async def _process(self, job_id: int) -> None:
+        async with self.session_factory() as db:
+            job = await db.get(AnalysisJob, job_id)
+            if job is None:
+                return
+            resume_id, attempts, max_attempts, callback_url = (
+                job.resume_id, job.attempts, job.max_attempts, job.callback_url
+            )
+            values: Dict[str, Any]
+            analysis = None
+            try:
+                if attempts > max_attempts:
+                    raise TimeoutError("Analyse interrompue trop de fois")
+                resume = await db.get(Resume, resume_id)
+                if resume is None:
+                    raise LookupError("CV supprimé")
+
+                # L'analyse a pu être calculée entre-temps (consultation du CV)
+                analysis = load_resume_analysis(resume)
+                if analysis is None:
+                    content = normalize_content(await load_content(resume))
+                    analysis = analysis_cache.get(content)
+                    if analysis is None:
+                        analysis = await analyzer_backend.analyze(content)
+                        analysis_cache.set(content, analysis)
+                    await store_analysis(db, resume, analysis)
+                values = {"status": AnalysisJob.SUCCEEDED, "finished_at": _now(), "error": None}
+            except AnalysisQueueFull:
+                await db.rollback()
+                values = {
+                    "status": AnalysisJob.PENDING, "run_after": _now() + _QUEUE_FULL_DELAY,
+                    "attempts": attempts - 1,
+                }
+            except Exception as exc:
+                await db.rollback()
+                logger.warning("Échec de l'analyse %s (tentative %s/%s) : %r", job_id, attempts, max_attempts, exc)
+                if attempts < max_attempts:
+                    values = {
+                        "status": AnalysisJob.PENDING, "error": repr(exc),
+                        "run_after": _now() + timedelta(seconds=self.retry_delay * 2 ** (attempts - 1)),
+                    }
+                else:
+                    values = {"status": AnalysisJob.FAILED, "finished_at": _now(), "error": repr(exc)}
+
+            await db.execute(update(AnalysisJob).where(AnalysisJob.id == job_id).values(**values))
+            await db.commit()
+
+        ANALYSIS_JOBS.inc("retried" if values["status"] == AnalysisJob.PENDING else values["status"])
+        if callback_url and values["status"] != AnalysisJob.PENDING:
+            self._track(self._callbacks, self._send_callback(callback_url, {
+                "job_id": job_id,
+                "resume_id": resume_id,
+                "status": values["status"],
+                "error": values["error"],
+                "analysis": analysis.dict() if values["status"] == AnalysisJob.SUCCEEDED else None,
+            }))
+
+    async def _send_callback(self, url: str, payload: Dict[str, Any]) -> None:
+        """
+        Notifie la fin d'une tâche, avec de nouvelles tentatives en cas d'échec.
+        L'adresse est vérifiée à nouveau à chaque envoi (sa résolution DNS peut
+        avoir changé depuis la création de la tâche) et les redirections ne
+        sont pas suivies.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.callback_timeout, follow_redirects=False)
+        for attempt in range(self.callback_attempts):
+            if attempt:
+                await asyncio.sleep(2 ** (attempt - 1))
+            try:
+                await check_callback_url(url)
+            except CallbackRejected as exc:
+                ANALYSIS_JOB_CALLBACKS.inc("blocked")
+                logger.warning("Notification de l'analyse %s refusée (%s) : %s", payload["job_id"], exc, url)
+                return
+            try:
+                response = await self._client.post(url, json=payload)
+                if response.status_code < 500:
+                    ANALYSIS_JOB_CALLBACKS.inc("delivered" if response.is_success else "rejected")
+                    return
+            except httpx.HTTPError:
+                pass
+        ANALYSIS_JOB_CALLBACKS.inc("failed")
+        logger.warning("Notification de l'analyse %s impossible : %s", payload["job_id"], url)
+
+
+analysis_job_worker = AnalysisJobWorker(
+    AsyncSessionLocal,
+    concurrency=settings.ANALYSIS_JOBS_CONCURRENCY,
+    poll_interval=settings.ANALYSIS_JOBS_POLL_SECONDS,
+    retry_delay=settings.ANALYSIS_JOBS_RETRY_DELAY_SECONDS,
+    timeout=settings.ANALYSIS_JOBS_TIMEOUT_SECONDS,
+    callback_timeout=settings.ANALYSIS_JOBS_CALLBACK_TIMEOUT_SECONDS,
+    callback_attempts=settings.ANALYSIS_JOBS_CALLBACK_ATTEMPTS,
+)
+
+registry.callback(
+    "careernus_analysis_jobs_running", "Analyses en arrière-plan en cours dans ce processus", [],
+    lambda: {(): analysis_job_worker.running},
+)
+
+
+if __name__ == "__main__":
+    # Worker dédié, hors des processus de l'API (ANALYSIS_JOBS_IN_PROCESS=false)
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(analysis_job_worker.run())
+    finally:
+        analysis_executor.shutdown()
@@ -0,0 +1,102 @@
+from typing import Any, Dict, List, Optional
+import unicodedata
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..models.resume import Resume
+from ..schemas.resume import ResumeAnalysisResponse, ResumeSection
+from .analysis_codec import (
+    MSGPACK, StoredAnalysis, decode_analysis, decode_section, encode_analysis, pack, read_stored
+)
+from .analyzer_backends import analyzer_backend
+from .resume_analyzer import ANALYZER_VERSION
+from .resume_index import index_resume
+from .resume_storage import compute_content_hash, resume_content_hash
+
+
+def normalize_content(content: str) -> str:
+    """
+    Normalise le texte d'un CV avant analyse : forme Unicode NFC, fins de ligne
+    Unix et suppression des espaces en début et fin de document.
+    """
+    content = unicodedata.normalize("NFC", content)
+    return content.replace("\r\n", "\n").replace("\r", "\n").strip()
+
+
+def serialize_analysis(
+    content: str, analysis: ResumeAnalysisResponse, content_hash: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Analyse au format de stockage (voir `analysis_codec`).
+
+    L'analyse est stockée avec l'empreinte du contenu analysé et la version de
+    l'analyseur qui l'a produite, afin de pouvoir détecter un résultat périmé
+    (ou une analyse de repli) à la lecture.
+    """
+    return encode_analysis(
+        analysis, analysis.analyzer_version or ANALYZER_VERSION, content_hash or compute_content_hash(content)
+    )
+
+
+def set_analysis(resume: Resume, analysis: ResumeAnalysisResponse, content_hash: Optional[str] = None) -> None:
+    """
+    Enregistre l'analyse d'un CV dans la colonne de l'encodage configuré
+    (`ANALYSIS_STORAGE_FORMAT`) : `parsed_data` (JSON) ou `parsed_packed` (binaire).
+    """
+    stored = serialize_analysis(resume.content, analysis, content_hash or resume_content_hash(resume))
+    if settings.ANALYSIS_STORAGE_FORMAT == MSGPACK:
+        resume.parsed_data, resume.parsed_packed = None, pack(stored)
+    else:
+        resume.parsed_data, resume.parsed_packed = stored, None
+
+
+async def store_analysis(
+    db: AsyncSession, resume: Resume, analysis: ResumeAnalysisResponse, content_hash: Optional[str] = None
+) -> None:
+    """Enregistre l'analyse d'un CV et met à jour l'index de recherche (sans valider la transaction)."""
+    set_analysis(resume, analysis, content_hash)
+    await index_resume(db, resume, analysis)
+
+
+def stored_analysis(resume: Resume) -> Optional[StoredAnalysis]:
+    """Analyse stockée d'un CV, encore encodée, quelle que soit sa colonne."""
+    return resume.parsed_packed if resume.parsed_packed is not None else resume.parsed_data
+
+
+def load_analysis(
+    stored: Optional[StoredAnalysis], content: Optional[str], content_hash: Optional[str] = None
+) -> Optional[ResumeAnalysisResponse]:
+    """
+    Décode une analyse stockée (le contenu sert uniquement à vérifier son
+    empreinte, qui peut être fournie à la place).
+
+    Retourne None si aucune analyse n'est stockée, si elle est illisible, si elle
+    a été produite par une autre version de l'analyseur ou pour un autre contenu.
+    """
+    stored = read_stored(stored)
+    if (
+        stored is None
+        or stored.get("analyzer_version") != analyzer_backend.version
+        or stored.get("content_hash") != (content_hash or compute_content_hash(content))
+    ):
+        return None
+
+    return decode_analysis(stored)
+
+
+def load_resume_analysis(resume: Resume) -> Optional[ResumeAnalysisResponse]:
+    """Analyse stockée d'un CV, si elle est à jour, sans lire son texte hors de la table."""
+    return load_analysis(stored_analysis(resume), None, resume_content_hash(resume))
+
+
+def load_sections(stored: Optional[StoredAnalysis]) -> List[ResumeSection]:
+    """
+    Sections d'une analyse stockée, même si le contenu a changé depuis : leurs
+    résultats restent valables pour les sections dont le texte est identique.
+    """
+    stored = read_stored(stored)
+    # Les sections proviennent toujours de l'analyseur par regex, quel que soit le moteur
+    if stored is None or str(stored.get("analyzer_version")).split("+")[0] != ANALYZER_VERSION:
+        return []
+    return [decode_section(section) for section in stored["analysis"].get("sections", [])]
@@ -0,0 +1,295 @@
+from functools import partial
+from typing import Any, Dict, List, Optional
+import asyncio
+import hashlib
+import importlib
+import time
+
+import httpx
+from pydantic import BaseModel
+
+from ..config import settings
+from ..schemas.resume import ResumeAnalysisResponse, ResumeSection
+from .analysis_executor import analysis_executor
+from .cache import CacheBackend, create_cache_backend
+from .metrics import ANALYSIS_FALLBACKS, LLM_REQUESTS, LLM_REQUEST_SECONDS
+from .resume_analyzer import ANALYZER_VERSION, ResumeAnalyzer
+
+# Version de la demande faite au modèle : à incrémenter dès que le prompt change
+LLM_PROMPT_VERSION = "1"
+
+_SYSTEM_PROMPT = (
+    "Tu extrais les informations d'un CV (en français ou en anglais). Réponds uniquement "
+    "par un objet JSON de la forme : "
+    '{"skills": ["compétence"], "experience_years": 5, '
+    '"education": [{"degree": "intitulé", "year": "2018", "institution": "établissement"}], '
+    '"job_titles": ["titre de poste"]}. '
+    "experience_years est le nombre total d'années d'expérience professionnelle (null si inconnu). "
+    "Les champs inconnus d'une formation valent null. N'invente aucune information absente du CV."
+)
+
+
+class AnalyzerBackend:
+    """
+    Moteur d'analyse des CV.
+
+    `version` identifie les résultats produits : elle est stockée avec chaque
+    analyse et fait partie des clés de cache, de sorte qu'un changement de
+    moteur (ou de modèle) fait recalculer les analyses existantes.
+    """
+
+    name = ""
+    version = ""
+
+    async def analyze(
+        self, content: str, previous_sections: Optional[List[ResumeSection]] = None
+    ) -> ResumeAnalysisResponse:
+        """Analyse un contenu normalisé (de façon incrémentale si des sections précédentes sont fournies)."""
+        raise NotImplementedError
+
+    async def aclose(self) -> None:
+        """Libère les ressources du moteur (connexions)."""
+
+
+class RegexAnalyzerBackend(AnalyzerBackend):
+    """Analyse par expressions régulières et vocabulaires, dans le pool d'analyse (moteur par défaut)."""
+
+    name = "regex"
+    version = ANALYZER_VERSION
+
+    async def analyze(
+        self, content: str, previous_sections: Optional[List[ResumeSection]] = None
+    ) -> ResumeAnalysisResponse:
+        return await analysis_executor.analyze(content, previous_sections)
+
+
+class TokenBucket:
+    """
+    Limiteur de débit : `rate` jetons par seconde, avec au plus `capacity`
+    jetons accumulés (rafales). Les appelants sont servis dans l'ordre d'arrivée.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+class LLMExtraction(BaseModel):
+    """Informations extraites d'un CV par le modèle (réponse JSON)."""
+    skills: List[str] = []
+    experience_years: Optional[float] = None
+    education: List[Dict[str, Optional[str]]] = []
+    job_titles: List[str] = []
+
+    def overrides(self) -> Dict[str, Any]:
+        """Résultats au format de l'analyseur (`ResumeAnalyzer.build_response`)."""
+        return {
+            "skills": [skill.strip() for skill in self.skills if skill.strip()],
+            "experience_years": self.experience_years,
+            "education": [
+                {
+                    "degree": entry["degree"].strip(),
+                    "year": entry.get("year"),
+                    "institution": entry.get("institution") or "Non spécifié",
+                }
+                for entry in self.education if (entry.get("degree") or "").strip()
+            ],
+            "job_titles": [title.strip() for title in self.job_titles if title.strip()],
+        }
+
+
+class LLMAnalyzerBackend(AnalyzerBackend):
+    """
+    Analyse par un modèle de langage, via une API compatible OpenAI
+    (`POST {base_url}/chat/completions`).
+
+    L'analyse par regex est toujours calculée, en parallèle : elle fournit les
+    sections du CV, et sert de repli. Le modèle fournit les compétences,
+    l'expérience, les formations et les titres, dont découlent le score et les
+    recommandations.
+
+    - les appels simultanés sont bornés par un sémaphore, et leur débit par un
+      seau à jetons ;
+    - les demandes simultanées pour un même contenu partagent un seul appel ;
+    - les réponses du modèle sont conservées dans `cache` pendant `cache_ttl`
+      secondes, par empreinte du contenu (lectures et écritures exécutées
+      dans un thread, hors de la boucle d'événements) ;
+    - au-delà de `timeout` secondes, ou en cas d'erreur, l'analyse par regex
+      est retournée ; l'appel en cours se poursuit et alimente le cache.
+    """
+
+    name = "llm"
+
+    def __init__(
+        self, base_url: str, api_key: str, model: str, fallback: AnalyzerBackend, timeout: float = 20,
+        max_concurrency: int = 4, rate_per_minute: float = 0, burst: int = 1, max_input_chars: int = 20000,
+        cache: Optional[CacheBackend] = None, cache_ttl: Optional[float] = None
+    ):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.model = model
+        self.fallback = fallback
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.rate_per_minute = rate_per_minute
+        self.burst = burst
+        self.max_input_chars = max_input_chars
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        self.version = f"{ANALYZER_VERSION}+llm-{model}-{LLM_PROMPT_VERSION}"
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._analyzer: Optional[ResumeAnalyzer] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        # Les primitives asyncio et le client HTTP sont liés à une boucle d'événements
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._bucket = TokenBucket(self.rate_per_minute / 60, self.burst) if self.rate_per_minute else None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": f"Bearer {self.api_key}"} if self.api_key else {},
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_concurrency),
+            )
+        return self._client
+
+    async def analyze(
+        self, content: str, previous_sections: Optional[List[ResumeSection]] = None
+    ) -> ResumeAnalysisResponse:
+        deadline = asyncio.get_running_loop().time() + self.timeout
+        extraction = self._extraction(content)
+        fallback = await self.fallback.analyze(content, previous_sections)
+        try:
+            # Attente partagée : l'abandon d'un appelant n'annule pas l'appel des autres
+            result = await asyncio.wait_for(
+                asyncio.shield(extraction), max(0.0, deadline - asyncio.get_running_loop().time())
+            )
+        except asyncio.TimeoutError:
+            ANALYSIS_FALLBACKS.inc("timeout")
+            return fallback
+        except Exception:
+            ANALYSIS_FALLBACKS.inc("error")
+            return fallback
+
+        if self._analyzer is None:
+            self._analyzer = ResumeAnalyzer()
+        analysis = self._analyzer.build_response(fallback.sections, overrides=result.overrides())
+        analysis.analyzer_version = self.version
+        return analysis
+
+    def _extraction(self, content: str) -> asyncio.Task:
+        """Extraction en cours pour ce contenu, ou nouvelle extraction."""
+        key = f"llm-{self.model}-{LLM_PROMPT_VERSION}-{hashlib.sha256(content.encode('utf-8')).hexdigest()}"
+        task = self._inflight.get(key)
+        if task is not None:
+            LLM_REQUESTS.inc("coalesced")
+            return task
+        task = asyncio.get_running_loop().create_task(self._extract(content, key))
+        self._inflight[key] = task
+        task.add_done_callback(partial(self._forget, key))
+        return task
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        # L'erreur a pu n'être attendue par personne (appelants partis en repli)
+        if not task.cancelled():
+            task.exception()
+
+    async def _extract(self, content: str, key: str) -> LLMExtraction:
+        if self.cache is not None:
+            payload = await asyncio.to_thread(self.cache.get, key)
+            if payload is not None:
+                try:
+                    extraction = LLMExtraction.parse_raw(payload)
+                    LLM_REQUESTS.inc("cached")
+                    return extraction
+                except ValueError:
+                    pass
+
+        async with self._semaphore:
+            if self._bucket is not None:
+                await self._bucket.acquire()
+            start = time.perf_counter()
+            try:
+                extraction = await self._request(content)
+            except Exception:
+                LLM_REQUESTS.inc("error")
+                raise
+            finally:
+                LLM_REQUEST_SECONDS.observe(time.perf_counter() - start)
+
+        LLM_REQUESTS.inc("success")
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.set, key, extraction.json().encode("utf-8"), self.cache_ttl)
+        return extraction
+
+    async def _request(self, content: str) -> LLMExtraction:
+        response = await self._get_client().post("/chat/completions", json={
+            "model": self.model,
+            "temperature": 0,
+            "response_format": {"type": "json_object"},
+            "messages": [
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {"role": "user", "content": content[:self.max_input_chars]},
+            ],
+        })
+        response.raise_for_status()
+        return LLMExtraction.parse_raw(response.json()["choices"][0]["message"]["content"])
+
+    async def aclose(self) -> None:
+        await asyncio.gather(*self._inflight.values(), return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+        self._reset()
+
+
+def create_analyzer_backend(name: str) -> AnalyzerBackend:
+    """
+    Instancie le moteur d'analyse configuré : "regex", "llm" ou le chemin d'une
+    classe `AnalyzerBackend` sous la forme "module:Classe".
+    """
+    if name == "regex":
+        return RegexAnalyzerBackend()
+    if name == "llm":
+        return LLMAnalyzerBackend(
+            base_url=settings.LLM_API_BASE,
+            api_key=settings.OPENAI_API_KEY,
+            model=settings.LLM_MODEL,
+            fallback=RegexAnalyzerBackend(),
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+            max_concurrency=settings.LLM_MAX_CONCURRENCY,
+            rate_per_minute=settings.LLM_RATE_LIMIT_PER_MINUTE,
+            burst=settings.LLM_RATE_LIMIT_BURST,
+            max_input_chars=settings.LLM_MAX_INPUT_CHARS,
+            cache=create_cache_backend(
+                settings.LLM_CACHE_BACKEND, settings.LLM_CACHE_DIR, settings.LLM_CACHE_MAX_ENTRIES
+            ),
+            cache_ttl=settings.LLM_CACHE_TTL_SECONDS,
+        )
+
+    module_name, _, class_name = name.partition(":")
+    if not class_name:
+        raise ValueError(f"Moteur d'analyse inconnu : {name}")
+    backend_class = getattr(importlib.import_module(module_name), class_name)
+    return backend_class()
+
+
+analyzer_backend = create_analyzer_backend(settings.ANALYZER_BACKEND)
@@ -1,11 +1,44 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+import asyncio
+import os
+import time
 from jose import jwt
 from passlib.context import CryptContext
+from sqlalchemy import event
 from ..config import settings
+from ..models.user import User
+from ..schemas.user import User as UserSchema
+from .cache import LRUCache
+from .metrics import cache_stats_callback, registry
 
-# Configuration de la sécurité
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Configuration de la sécurité : les hashs d'un coût différent de BCRYPT_ROUNDS
+# sont signalés par `needs_update` et recalculés à la connexion
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# Pool dédié au hachage : bcrypt libère le GIL, les calculs s'exécutent en
+# parallèle sans bloquer la boucle d'événements
+_hashing_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1,
+    thread_name_prefix="password-hash",
+)
+
+# Utilisateurs authentifiés, indexés par token : évite le décodage du JWT et la
+# requête en base pour les requêtes successives d'une même session
+_principal_cache = LRUCache(settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CACHE_TTL_SECONDS)
+# Dernière invalidation de chaque utilisateur (numéro d'invalidation, date), de la plus
+# ancienne à la plus récente. Une invalidation plus ancienne que la durée de vie du cache
+# ne concerne plus aucune entrée : elle est oubliée
+_invalidations: "OrderedDict[int, Tuple[int, float]]" = OrderedDict()
+_invalidation_count = 0
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -21,14 +54,89 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
     return encoded_jwt
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Vérifie un mot de passe dans le pool de hachage.
+
+    Retourne (valide, nouveau_hash) : le nouveau hash est fourni lorsque le hash
+    stocké doit être recalculé (coût bcrypt modifié), sinon il vaut None.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _hashing_executor, pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+async def hash_password(password: str) -> str:
+    """
+    Génère un hash sécurisé pour un mot de passe, dans le pool de hachage.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hashing_executor, pwd_context.hash, password)
+
+def _last_invalidation(user_id: int) -> int:
+    """Numéro de la dernière invalidation encore pertinente d'un utilisateur (0 : aucune)."""
+    entry = _invalidations.get(user_id)
+    return entry[0] if entry is not None else 0
+
+def get_invalidation_marker() -> int:
     """
-    Vérifie si un mot de passe en clair correspond au hash stocké.
+    Retourne un marqueur à lire avant de charger un utilisateur depuis la base :
+    il permet de détecter une invalidation survenue pendant le chargement.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return _invalidation_count
 
-def get_password_hash(password: str) -> str:
+def get_cached_principal(token: str) -> Optional[UserSchema]:
     """
-    Génère un hash sécurisé pour un mot de passe.
+    Retourne l'utilisateur associé à un token s'il est en cache et toujours valide.
     """
-    return pwd_context.hash(password)
+    entry = _principal_cache.get(token)
+    if entry is None:
+        return None
+    principal, marker = entry
+    if _last_invalidation(principal.id) > marker:
+        _principal_cache.delete(token)
+        return None
+    return principal
+
+def cache_principal(token: str, principal: UserSchema, marker: int, expires_at: Optional[float] = None) -> None:
+    """
+    Met en cache l'utilisateur associé à un token, sans dépasser l'expiration du token.
+    """
+    if marker != _invalidation_count:
+        # Un utilisateur a été modifié pendant le chargement : la donnée peut être périmée
+        return
+    ttl = settings.AUTH_CACHE_TTL_SECONDS
+    if expires_at is not None:
+        ttl = min(ttl, expires_at - time.time())
+        if ttl <= 0:
+            return
+    _principal_cache.set(token, (principal, marker), ttl)
+
+def invalidate_user(user_id: int) -> None:
+    """
+    Invalide les entrées en cache d'un utilisateur (modification, désactivation, suppression).
+    """
+    global _invalidation_count
+    _invalidation_count += 1
+    now = time.monotonic()
+    _invalidations[user_id] = (_invalidation_count, now)
+    _invalidations.move_to_end(user_id)
+
+    # Les entrées mises en cache avant les invalidations expirées ont elles-mêmes expiré
+    horizon = now - settings.AUTH_CACHE_TTL_SECONDS
+    while _invalidations and next(iter(_invalidations.values()))[1] < horizon:
+        _invalidations.popitem(last=False)
+    if len(_invalidations) > settings.AUTH_CACHE_MAX_ENTRIES:
+        # Trop d'invalidations récentes pour les conserver toutes : tout le cache est vidé
+        _principal_cache.clear()
+        _invalidations.clear()
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user_on_change(mapper, connection, target: User) -> None:
+    invalidate_user(target.id)
+
+registry.callback(
+    "careernus_auth_cache", "Statistiques du cache des utilisateurs authentifiés", ["cache", "stat"],
+    cache_stats_callback(_principal_cache.stats, "principal"),
+)
@@ -0,0 +1,190 @@
+from typing import AsyncIterator, BinaryIO, Iterator, Optional, Tuple
+import asyncio
+import contextlib
+import importlib
+import mmap
+import os
+import re
+import shutil
+import tempfile
+
+from ..config import settings
+
+_KEY_PATTERN = re.compile(r"^[A-Za-z0-9_-][A-Za-z0-9._-]*(/[A-Za-z0-9_-][A-Za-z0-9._-]*)*$")
+
+
+class BlobNotFound(Exception):
+    """Levée lorsqu'aucun objet n'est stocké sous la clé demandée."""
+
+
+class BlobStorage:
+    """
+    Stockage d'objets (fichiers d'origine des CV, textes volumineux) hors de
+    la base de données, identifiés par une clé de la forme "dossier/nom".
+
+    Les méthodes de base sont synchrones et lisent ou écrivent par morceaux,
+    sans charger les objets en entier ; les variantes asynchrones les
+    exécutent dans un thread.
+    """
+
+    def put(self, key: str, stream: BinaryIO) -> None:
+        """Enregistre le contenu d'un flux (lu par morceaux) sous `key`, en remplaçant l'existant."""
+        raise NotImplementedError
+
+    def open(self, key: str) -> BinaryIO:
+        """Flux en lecture sur l'objet `key`, à fermer par l'appelant."""
+        raise NotImplementedError
+
+    def read(self, key: str) -> bytes:
+        with contextlib.closing(self.open(key)) as stream:
+            return stream.read()
+
+    def read_text(self, key: str) -> str:
+        return self.read(key).decode("utf-8")
+
+    def delete(self, key: str) -> None:
+        """Supprime l'objet `key` (sans erreur s'il n'existe pas)."""
+        raise NotImplementedError
+
+    def iter_keys(self, prefix: str) -> Iterator[Tuple[str, float]]:
+        """Clés des objets commençant par `prefix`, avec leur date de dernière écriture (timestamp)."""
+        raise NotImplementedError
+
+    async def aput(self, key: str, stream: BinaryIO) -> None:
+        await asyncio.to_thread(self.put, key, stream)
+
+    async def iter_chunks(self, key: str, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        """Contenu de l'objet `key`, par morceaux (réponses en streaming)."""
+        stream = await asyncio.to_thread(self.open, key)
+        try:
+            while chunk := await asyncio.to_thread(stream.read, chunk_size):
+                yield chunk
+        finally:
+            stream.close()
+
+
+class LocalBlobStorage(BlobStorage):
+    """
+    Objets stockés dans un répertoire local (développement, tests, ou volume
+    partagé). Les écritures sont atomiques (fichier temporaire puis
+    renommage) ; les textes sont décodés directement depuis le fichier
+    projeté en mémoire.
+    """
+
+    _TMP_PREFIX = ".tmp-"
+
+    def __init__(self, directory: str):
+        # Chemin absolu : indépendant des changements ultérieurs du répertoire courant.
+        # Le répertoire n'est créé qu'à la première écriture
+        self.directory = os.path.abspath(directory)
+
+    def _path(self, key: str) -> str:
+        if not _KEY_PATTERN.match(key):
+            raise ValueError(f"Clé d'objet invalide : {key}")
+        return os.path.join(self.directory, *key.split("/"))
+
+    def put(self, key: str, stream: BinaryIO) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=self._TMP_PREFIX)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                shutil.copyfileobj(stream, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def open(self, key: str) -> BinaryIO:
+        try:
+            return open(self._path(key), "rb")
+        except FileNotFoundError:
+            raise BlobNotFound(key)
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def iter_keys(self, prefix: str) -> Iterator[Tuple[str, float]]:
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.startswith(self._TMP_PREFIX):
+                    continue  # Écriture en cours
+                path = os.path.join(root, name)
+                key = os.path.relpath(path, self.directory).replace(os.sep, "/")
+                if key.startswith(prefix):
+                    try:
+                        yield key, os.stat(path).st_mtime
+                    except FileNotFoundError:
+                        pass
+
+    def read_text(self, key: str) -> str:
+        with self.open(key) as f:
+            if not os.fstat(f.fileno()).st_size:
+                return ""
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return str(mapped, "utf-8")
+
+
+class S3BlobStorage(BlobStorage):
+    """
+    Objets stockés dans un bucket S3, ou d'un service compatible (MinIO...)
+    via `endpoint_url`. Les identifiants sont ceux de la configuration AWS
+    habituelle (variables d'environnement, profil, rôle).
+    """
+
+    def __init__(self, bucket: str, prefix: str = "", endpoint_url: str = "", region: str = ""):
+        import boto3
+        from botocore.exceptions import ClientError
+
+        self.bucket = bucket
+        self.prefix = prefix
+        self._client = boto3.client("s3", endpoint_url=endpoint_url or None, region_name=region or None)
+        self._client_error = ClientError
+
+    def put(self, key: str, stream: BinaryIO) -> None:
+        # Envoi en plusieurs parties au-delà de quelques Mo, sans charger le flux en mémoire
+        self._client.upload_fileobj(stream, self.bucket, self.prefix + key)
+
+    def open(self, key: str) -> BinaryIO:
+        try:
+            return self._client.get_object(Bucket=self.bucket, Key=self.prefix + key)["Body"]
+        except self._client_error as exc:
+            if exc.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                raise BlobNotFound(key)
+            raise
+
+    def delete(self, key: str) -> None:
+        self._client.delete_object(Bucket=self.bucket, Key=self.prefix + key)
+
+    def iter_keys(self, prefix: str) -> Iterator[Tuple[str, float]]:
+        pages = self._client.get_paginator("list_objects_v2").paginate(Bucket=self.bucket, Prefix=self.prefix + prefix)
+        for page in pages:
+            for item in page.get("Contents", ()):
+                yield item["Key"][len(self.prefix):], item["LastModified"].timestamp()
+
+
+def create_blob_storage(name: str) -> Optional[BlobStorage]:
+    """
+    Instancie le stockage d'objets configuré : "" (aucun : les fichiers
+    d'origine ne sont pas conservés), "local", "s3" ou le chemin d'une classe
+    `BlobStorage` sous la forme "module:Classe".
+    """
+    if not name:
+        return None
+    if name == "local":
+        return LocalBlobStorage(settings.BLOB_STORAGE_DIR)
+    if name == "s3":
+        return S3BlobStorage(
+            settings.BLOB_S3_BUCKET, settings.BLOB_S3_PREFIX, settings.BLOB_S3_ENDPOINT_URL, settings.BLOB_S3_REGION
+        )
+
+    module_name, _, class_name = name.partition(":")
+    storage_class = getattr(importlib.import_module(module_name), class_name)
+    return storage_class()
+
+
+blob_storage = create_blob_storage(settings.BLOB_STORAGE_BACKEND)
@@ -0,0 +1,213 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+import importlib
+import os
+import tempfile
+import threading
+import time
+
+
+class LRUCache:
+    """
+    Cache en mémoire borné, avec éviction LRU et expiration optionnelle (TTL).
+
+    Le cache est protégé par un verrou et peut être partagé entre threads.
+    """
+
+    def __init__(self, max_entries: int, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Retourne la valeur associée à la clé, ou None si elle est absente ou expirée."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Ajoute ou remplace une valeur, en évinçant les entrées les moins récemment utilisées."""
+        if self.max_entries <= 0:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CacheBackend:
+    """
+    Interface d'un cache partagé entre processus (Redis, memcached, disque...).
+
+    Les valeurs sont des octets, la sérialisation est à la charge de l'appelant.
+    """
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Cache propre au processus, borné (éviction LRU), pour les déploiements sans cache partagé."""
+
+    def __init__(self, max_entries: int):
+        self._cache = LRUCache(max_entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        self._cache.set(key, value, ttl)
+
+
+class FileCacheBackend(CacheBackend):
+    """
+    Cache partagé stocké dans un répertoire local.
+
+    Permet à plusieurs workers uvicorn d'une même machine de partager leurs
+    résultats. Les écritures sont atomiques (fichier temporaire puis renommage).
+
+    Les entrées expirées sont supprimées à leur lecture ; au plus toutes les
+    `sweep_interval` secondes, une écriture parcourt aussi le répertoire pour
+    supprimer les entrées expirées puis, au-delà de `max_entries` (0 : sans
+    limite), les moins récemment écrites.
+    """
+
+    _TMP_PREFIX = ".tmp-"
+
+    def __init__(self, directory: str, max_entries: int = 10000, sweep_interval: float = 60):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.sweep_interval = sweep_interval
+        self._next_sweep = 0.0
+        self._sweep_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key.replace(os.sep, "_"))
+
+    @staticmethod
+    def _read_expiry(f) -> float:
+        return float(f.readline())
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass  # Déjà supprimé par un autre worker
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                expires_at = self._read_expiry(f)
+                if not expires_at or expires_at >= time.time():
+                    return f.read()
+        except (OSError, ValueError):
+            return None
+        self._remove(path)
+        return None
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        expires_at = time.time() + ttl if ttl else 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=self._TMP_PREFIX)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(f"{expires_at}\n".encode("ascii"))
+                f.write(value)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        if time.monotonic() >= self._next_sweep:
+            self.sweep()
+
+    def sweep(self) -> int:
+        """Supprime les entrées expirées, puis les plus anciennes au-delà de `max_entries`."""
+        if not self._sweep_lock.acquire(blocking=False):
+            return 0  # Nettoyage déjà en cours dans un autre thread
+        try:
+            self._next_sweep = time.monotonic() + self.sweep_interval
+            now = time.time()
+            removed = 0
+            entries = []
+            with os.scandir(self.directory) as scan:
+                for entry in scan:
+                    if entry.name.startswith(self._TMP_PREFIX) or not entry.is_file():
+                        continue
+                    try:
+                        with open(entry.path, "rb") as f:
+                            expires_at = self._read_expiry(f)
+                        modified_at = entry.stat().st_mtime
+                    except (OSError, ValueError):
+                        continue
+                    if expires_at and expires_at < now:
+                        self._remove(entry.path)
+                        removed += 1
+                    else:
+                        entries.append((modified_at, entry.path))
+            if self.max_entries and len(entries) > self.max_entries:
+                entries.sort()
+                for _, path in entries[:len(entries) - self.max_entries]:
+                    self._remove(path)
+                    removed += 1
+            return removed
+        finally:
+            self._sweep_lock.release()
+
+
+def create_cache_backend(name: str, directory: str, max_entries: int = 10000) -> Optional[CacheBackend]:
+    """
+    Instancie le cache partagé configuré : "" (aucun), "memory" (propre au
+    processus), "file" (au plus `max_entries` entrées chacun) ou le chemin
+    d'une classe `CacheBackend` sous la forme "module:Classe".
+    """
+    if not name:
+        return None
+    if name == "memory":
+        return MemoryCacheBackend(max_entries)
+    if name == "file":
+        return FileCacheBackend(directory, max_entries)
+
+    module_name, _, class_name = name.partition(":")
+    backend_class = getattr(importlib.import_module(module_name), class_name)
+    return backend_class()
@@ -0,0 +1,161 @@
+from typing import NamedTuple, Optional
+import hashlib
+
+import numpy as np
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.resume import Resume
+from .analysis_codec import StoredAnalysis
+
+# Types de doublons, du plus strict au plus large
+EXACT = "exact"  # Même texte
+NORMALIZED = "normalized"  # Même texte aux espaces et à la casse près
+SIMILAR = "similar"  # Similarité MinHash au-delà du seuil configuré
+
+# Signature MinHash : une valeur de 32 bits par permutation, sur les séquences de mots
+MINHASH_PERMUTATIONS = 64
+SHINGLE_WORDS = 3
+
+
+def _permutation_coefficients(name: str) -> np.ndarray:
+    # Dérivés d'empreintes fixes : les signatures stockées restent comparables d'une version à l'autre
+    return np.array([
+        int.from_bytes(hashlib.sha256(f"{name}{index}".encode("ascii")).digest()[:8], "little") | 1
+        for index in range(MINHASH_PERMUTATIONS)
+    ], dtype=np.uint64)
+
+
+_MULTIPLIERS = _permutation_coefficients("a")
+_OFFSETS = _permutation_coefficients("b")
+
+
+class Duplicate(NamedTuple):
+    """CV existant de l'utilisateur dont le contenu est identique ou proche de celui importé."""
+    resume: Resume
+    kind: str
+    similarity: float
+
+
+def fingerprint(content: str) -> str:
+    """Empreinte du texte aux espaces et à la casse près."""
+    return hashlib.sha256(" ".join(content.casefold().split()).encode("utf-8")).hexdigest()
+
+
+def minhash_signature(content: str) -> Optional[bytes]:
+    """
+    Signature MinHash des séquences de `SHINGLE_WORDS` mots du texte (casse
+    ignorée). La part de valeurs égales entre deux signatures estime la
+    similarité de Jaccard des deux textes. None pour un texte vide.
+    """
+    words = content.casefold().split()
+    if not words:
+        return None
+    shingles = {
+        " ".join(words[start:start + SHINGLE_WORDS]) for start in range(max(1, len(words) - SHINGLE_WORDS + 1))
+    }
+    hashes = np.fromiter(
+        (
+            int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+            for shingle in shingles
+        ),
+        dtype=np.uint64, count=len(shingles),
+    )
+    # Hachage multiplicatif (modulo 2^64) : les 32 bits de poids fort forment chaque permutation
+    permuted = (_MULTIPLIERS[:, None] * hashes[None, :] + _OFFSETS[:, None]) >> np.uint64(32)
+    return permuted.min(axis=1).astype(np.uint32).tobytes()
+
+
+def set_fingerprints(resume: Resume, content: str) -> None:
+    """Met à jour les empreintes de détection des doublons d'un CV (texte complet)."""
+    resume.fingerprint = fingerprint(content)
+    resume.content_minhash = minhash_signature(content)
+
+
+async def find_duplicate(
+    db: AsyncSession, user_id: int, content: str, content_hash: str, threshold: Optional[float] = None
+) -> Optional[Duplicate]:
+    """
+    Cherche parmi les CV de l'utilisateur un doublon du contenu importé :
+    identique, identique aux espaces et à la casse près, puis, si `threshold`
+    (par défaut `DEDUP_MINHASH_THRESHOLD`) n'est pas nul, le plus similaire
+    au-delà de ce seuil.
+    """
+    resume = (await db.execute(
+        select(Resume).where(Resume.content_hash == content_hash, Resume.user_id == user_id).limit(1)
+    )).scalar_one_or_none()
+    if resume is not None:
+        return Duplicate(resume, EXACT, 1.0)
+
+    resume = (await db.execute(
+        select(Resume)
+        .where(Resume.user_id == user_id, Resume.fingerprint == fingerprint(content))
+        .order_by(Resume.id.desc())
+        .limit(1)
+    )).scalar_one_or_none()
+    if resume is not None:
+        return Duplicate(resume, NORMALIZED, 1.0)
+
+    threshold = settings.DEDUP_MINHASH_THRESHOLD if threshold is None else threshold
+    signature = minhash_signature(content) if threshold else None
+    if signature is None:
+        return None
+    # Seules les signatures sont lues, jamais les textes
+    rows = (await db.execute(
+        select(Resume.id, Resume.content_minhash)
+        .where(Resume.user_id == user_id, Resume.content_minhash.isnot(None))
+    )).all()
+    if not rows:
+        return None
+    signatures = np.frombuffer(b"".join(row.content_minhash for row in rows), dtype=np.uint32)
+    scores = (signatures.reshape(len(rows), -1) == np.frombuffer(signature, dtype=np.uint32)).mean(axis=1)
+    best = int(np.argmax(scores))
+    if scores[best] < threshold:
+        return None
+    return Duplicate(await db.get(Resume, rows[best].id), SIMILAR, round(float(scores[best]), 4))
+
+
+async def find_shared_analysis(db: AsyncSession, content_hash: str) -> Optional[StoredAnalysis]:
+    """Analyse stockée (encodée) d'un CV de même contenu, quel que soit son utilisateur."""
+    row = (await db.execute(
+        select(Resume.parsed_data, Resume.parsed_packed)
+        .where(
+            Resume.content_hash == content_hash,
+            or_(Resume.parsed_data.isnot(None), Resume.parsed_packed.isnot(None))
+        )
+        .limit(1)
+    )).first()
+    if row is None:
+        return None
+    return row.parsed_packed if row.parsed_packed is not None else row.parsed_data
+
+
+def backfill_fingerprints(db: Session, batch_size: int = 500) -> int:
+    """Calcule les empreintes des CV qui n'en ont pas (CV antérieurs à la détection des doublons)."""
+    from .resume_storage import read_content
+
+    count = 0
+    last_id = 0
+    while True:
+        resumes = db.execute(
+            select(Resume)
+            .where(Resume.id > last_id, Resume.fingerprint.is_(None))
+            .order_by(Resume.id)
+            .limit(batch_size)
+        ).scalars().all()
+        if not resumes:
+            return count
+        for resume in resumes:
+            set_fingerprints(resume, read_content(resume))
+            count += 1
+        last_id = resumes[-1].id
+        db.commit()
+
+
+if __name__ == "__main__":
+    from ..database import SessionLocal
+
+    with SessionLocal() as session:
+        print(f"{backfill_fingerprints(session)} CV mis à jour")
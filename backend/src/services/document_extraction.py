@@ -0,0 +1,366 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+from xml.etree import ElementTree
+import asyncio
+import hashlib
+import io
+import multiprocessing
+import os
+import signal
+import time
+import weakref
+import zipfile
+
+from ..config import settings
+from .cache import CacheBackend, LRUCache, create_cache_backend
+from .metrics import EXTRACTION_REJECTED, EXTRACTION_SECONDS, cache_stats_callback, registry
+
+# Version de l'extraction : à incrémenter dès que le texte extrait d'un fichier peut changer
+EXTRACTOR_VERSION = "1"
+
+# Formats reconnus
+TEXT = "text"
+PDF = "pdf"
+DOCX = "docx"
+
+_PDF_MAGIC = b"%PDF-"
+_ZIP_MAGIC = b"PK\x03\x04"
+_OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"  # Word 97-2003 (.doc), Excel...
+_UTF16_BOMS = (b"\xff\xfe", b"\xfe\xff")
+
+_WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_WORD_PARAGRAPH = _WORD_NAMESPACE + "p"
+_WORD_TEXT = _WORD_NAMESPACE + "t"
+_WORD_TAB = _WORD_NAMESPACE + "tab"
+_WORD_BREAKS = (_WORD_NAMESPACE + "br", _WORD_NAMESPACE + "cr")
+# Taille maximale d'une partie XML décompressée (protection contre les bombes ZIP)
+_MAX_DOCX_PART_BYTES = 50 * 1024 * 1024
+# Nouvelles soumissions d'un document dont le pool a été arrêté à cause d'un autre document
+_MAX_RESUBMISSIONS = 3
+
+
+class UnsupportedDocument(Exception):
+    """Levée pour un fichier dont le format n'est pas pris en charge."""
+
+
+class DocumentRejected(Exception):
+    """Levée pour un document illisible, sans texte, ou qui dépasse les limites d'extraction."""
+
+
+class ExtractionQueueFull(Exception):
+    """Levée lorsque trop de documents sont déjà en attente d'extraction."""
+
+
+def detect_format(head: bytes) -> str:
+    """
+    Format d'un fichier d'après ses premiers octets : PDF, DOCX (archive ZIP,
+    vérifiée à l'extraction) ou texte. `UnsupportedDocument` est levée pour
+    les autres fichiers binaires.
+    """
+    # Des octets peuvent précéder l'en-tête d'un PDF
+    if _PDF_MAGIC in head[:1024]:
+        return PDF
+    if head.startswith(_ZIP_MAGIC):
+        return DOCX
+    if head.startswith(_OLE_MAGIC) or (b"\x00" in head and not head.startswith(_UTF16_BOMS)):
+        raise UnsupportedDocument()
+    return TEXT
+
+
+def _extract_pdf(data: bytes, max_pages: int) -> str:
+    from pypdf import PdfReader
+    from pypdf.errors import PyPdfError
+
+    try:
+        reader = PdfReader(io.BytesIO(data))
+        if reader.is_encrypted and not reader.decrypt(""):
+            raise DocumentRejected("Le document est protégé par un mot de passe")
+        if len(reader.pages) > max_pages:
+            raise DocumentRejected(f"Le document dépasse {max_pages} pages")
+        return "\n\n".join(page.extract_text() or "" for page in reader.pages)
+    except (PyPdfError, ValueError, KeyError, TypeError) as exc:
+        raise DocumentRejected("Fichier PDF illisible") from exc
+
+
+def _docx_part_text(xml: bytes) -> List[str]:
+    """Paragraphes d'une partie XML d'un document Word."""
+    # Les documents Word n'ont pas de DTD : refusée, pour éviter toute expansion d'entités
+    if b"<!DOCTYPE" in xml:
+        raise DocumentRejected("Fichier DOCX invalide")
+
+    paragraphs = []
+    for _, element in ElementTree.iterparse(io.BytesIO(xml)):
+        if element.tag != _WORD_PARAGRAPH:
+            continue
+        pieces = []
+        for node in element.iter():
+            if node.tag == _WORD_TEXT:
+                pieces.append(node.text or "")
+            elif node.tag == _WORD_TAB:
+                pieces.append("\t")
+            elif node.tag in _WORD_BREAKS:
+                pieces.append("\n")
+        paragraphs.append("".join(pieces))
+        element.clear()
+    return paragraphs
+
+
+def _extract_docx(data: bytes, max_pages: int) -> str:
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            names = archive.namelist()
+            if "word/document.xml" not in names:
+                raise UnsupportedDocument()
+
+            # En-têtes (coordonnées), corps du document, puis pieds de page
+            parts = (
+                sorted(name for name in names if name.startswith("word/header") and name.endswith(".xml"))
+                + ["word/document.xml"]
+                + sorted(name for name in names if name.startswith("word/footer") and name.endswith(".xml"))
+            )
+            paragraphs = []
+            for name in parts:
+                if archive.getinfo(name).file_size > _MAX_DOCX_PART_BYTES:
+                    raise DocumentRejected("Le document est trop volumineux")
+                xml = archive.read(name)
+                if name == "word/document.xml":
+                    # Word enregistre la position des sauts de page de la dernière mise en page
+                    pages = 1 + xml.count(b"<w:lastRenderedPageBreak")
+                    if pages > max_pages:
+                        raise DocumentRejected(f"Le document dépasse {max_pages} pages")
+                paragraphs.extend(_docx_part_text(xml))
+    except (zipfile.BadZipFile, ElementTree.ParseError, EOFError) as exc:
+        raise DocumentRejected("Fichier DOCX illisible") from exc
+    return "\n".join(paragraphs)
+
+
+_EXTRACTORS = {PDF: _extract_pdf, DOCX: _extract_docx}
+
+
+def _on_timeout(signum, frame):
+    raise DocumentRejected("Durée maximale d'extraction dépassée")
+
+
+def _init_worker(max_memory_bytes: int) -> None:
+    # Processus dédié à l'extraction : la limite de mémoire s'ajoute à l'espace
+    # d'adressage déjà occupé par l'interpréteur
+    signal.signal(signal.SIGALRM, _on_timeout)
+    if max_memory_bytes:
+        try:
+            import resource
+
+            with open("/proc/self/statm") as statm:
+                current = int(statm.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+            limit = current + max_memory_bytes
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ImportError, OSError, ValueError):
+            pass  # Plateforme sans /proc ni RLIMIT_AS : pas de limite de mémoire
+
+
+def _extract_in_worker(data: bytes, document_format: str, max_pages: int, timeout: float) -> str:
+    if timeout:
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return _EXTRACTORS[document_format](data, max_pages)
+    except MemoryError:
+        raise DocumentRejected("Mémoire maximale d'extraction dépassée")
+    finally:
+        if timeout:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+class DocumentExtractor:
+    """
+    Extrait le texte des documents PDF et DOCX, avec des analyseurs en Python
+    pur exécutés dans un pool de processus dédié, isolé des workers de l'API.
+
+    Chaque document est limité en nombre de pages, en durée et en mémoire ;
+    au-delà, `DocumentRejected` est levée. Un processus bloqué au-delà de la
+    durée maximale est arrêté avec le reste du pool (le pool de la
+    bibliothèque standard ne survit pas à l'arrêt d'un de ses processus) :
+    les autres documents en cours sont soumis à nouveau à un pool neuf. Si un
+    processus s'arrête de lui-même (mémoire), chaque document touché est
+    extrait à nouveau seul dans un processus isolé, pour ne rejeter que celui
+    qui en est la cause. Les processus sont renouvelés après
+    `max_tasks_per_worker` documents.
+
+    Le texte extrait est mis en cache par empreinte du fichier : un fichier
+    téléversé à nouveau n'est pas réanalysé. Le mode "inline" (tests) extrait
+    dans la boucle d'événements, sans limite de durée ni de mémoire.
+    """
+
+    MODES = ("process", "inline")
+
+    def __init__(
+        self, mode: str = "process", max_workers: int = 2, max_queue_depth: int = 0, max_pages: int = 30,
+        timeout: float = 20, max_memory_bytes: int = 0, max_tasks_per_worker: int = 100,
+        cache_max_entries: int = 512, cache_ttl: Optional[float] = None, cache_backend: Optional[CacheBackend] = None
+    ):
+        if mode not in self.MODES:
+            raise ValueError(f"Mode d'extraction inconnu : {mode}")
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth or max_workers * 4
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.max_memory_bytes = max_memory_bytes
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.cache_ttl = cache_ttl
+        self._cache = LRUCache(cache_max_entries, cache_ttl)
+        self._cache_backend = cache_backend
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Pools arrêtés volontairement (extraction bloquée), par opposition à un processus mort
+        self._terminated: "weakref.WeakSet[ProcessPoolExecutor]" = weakref.WeakSet()
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Nombre de documents en cours d'extraction ou en attente."""
+        return self._pending
+
+    def _new_pool(self, max_workers: int, max_tasks_per_worker: Optional[int]) -> ProcessPoolExecutor:
+        # "spawn" : processus neufs, sans l'état (connexions, boucle) des workers de l'API
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.max_memory_bytes,),
+            max_tasks_per_child=max_tasks_per_worker,
+        )
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = self._new_pool(self.max_workers, self.max_tasks_per_worker or None)
+        return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        """Abandonne un pool inutilisable ; le prochain document en démarre un neuf."""
+        if self._pool is pool:
+            self._pool = None
+        # Sans annuler les tâches en attente : elles échouent avec BrokenProcessPool et sont soumises à nouveau
+        pool.shutdown(wait=False)
+
+    def _kill_pool(self, pool: ProcessPoolExecutor) -> None:
+        """Arrête immédiatement les processus d'un pool (extraction bloquée)."""
+        self._terminated.add(pool)
+        # Aucune API publique ne permet d'interrompre une tâche en cours
+        for process in list(getattr(pool, "_processes", {}).values()):
+            process.terminate()
+        self._discard_pool(pool)
+
+    async def _extract_in_pool(self, pool: ProcessPoolExecutor, data: bytes, document_format: str) -> str:
+        future = asyncio.get_running_loop().run_in_executor(
+            pool, _extract_in_worker, data, document_format, self.max_pages, self.timeout
+        )
+        try:
+            # Délai de secours si le processus ne peut pas être interrompu (code natif)
+            return await asyncio.wait_for(future, self.timeout + 5 if self.timeout else None)
+        except asyncio.TimeoutError:
+            self._kill_pool(pool)
+            raise DocumentRejected("Durée maximale d'extraction dépassée")
+
+    async def _extract_in_process(self, data: bytes, document_format: str) -> str:
+        for _ in range(_MAX_RESUBMISSIONS + 1):
+            pool = self._get_pool()
+            try:
+                return await self._extract_in_pool(pool, data, document_format)
+            except BrokenProcessPool:
+                self._discard_pool(pool)
+                if pool not in self._terminated:
+                    break
+                # Pool arrêté à cause d'un autre document bloqué : ce document n'y est pour rien
+        else:
+            # Pools arrêtés à répétition par des documents bloqués
+            EXTRACTION_REJECTED.inc(document_format, "queue_full")
+            raise ExtractionQueueFull()
+
+        # Processus mort (mémoire) : seul le document qui en est la cause échoue à nouveau, isolé
+        isolated = self._new_pool(1, 1)
+        try:
+            return await self._extract_in_pool(isolated, data, document_format)
+        except BrokenProcessPool:
+            raise DocumentRejected("Mémoire maximale d'extraction dépassée")
+        finally:
+            isolated.shutdown(wait=False)
+
+    def _cache_key(self, file_hash: str) -> str:
+        return f"text-{EXTRACTOR_VERSION}-{file_hash}"
+
+    def _get_cached(self, key: str) -> Optional[str]:
+        text = self._cache.get(key)
+        if text is None and self._cache_backend is not None:
+            payload = self._cache_backend.get(key)
+            if payload is not None:
+                text = payload.decode("utf-8")
+                self._cache.set(key, text)
+        return text
+
+    def _set_cached(self, key: str, text: str) -> None:
+        self._cache.set(key, text)
+        if self._cache_backend is not None:
+            self._cache_backend.set(key, text.encode("utf-8"), self.cache_ttl)
+
+    async def extract(self, data: bytes, document_format: str) -> str:
+        """Texte brut (non normalisé) d'un document PDF ou DOCX."""
+        key = self._cache_key(hashlib.sha256(data).hexdigest())
+        text = self._get_cached(key)
+        if text is not None:
+            return text
+
+        if self._pending >= self.max_queue_depth:
+            EXTRACTION_REJECTED.inc(document_format, "queue_full")
+            raise ExtractionQueueFull()
+
+        self._pending += 1
+        start = time.perf_counter()
+        try:
+            if self.mode == "inline":
+                text = _EXTRACTORS[document_format](data, self.max_pages)
+            else:
+                text = await self._extract_in_process(data, document_format)
+        except (DocumentRejected, UnsupportedDocument):
+            EXTRACTION_REJECTED.inc(document_format, "invalid")
+            raise
+        finally:
+            self._pending -= 1
+        EXTRACTION_SECONDS.observe(time.perf_counter() - start, document_format)
+
+        if not text.strip():
+            EXTRACTION_REJECTED.inc(document_format, "empty")
+            raise DocumentRejected("Aucun texte n'a pu être extrait (document numérisé ?)")
+        self._set_cached(key, text)
+        return text
+
+    def stats(self) -> Dict[str, int]:
+        return self._cache.stats()
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+
+document_extractor = DocumentExtractor(
+    mode=settings.EXTRACTION_MODE,
+    max_workers=settings.EXTRACTION_WORKERS,
+    max_queue_depth=settings.EXTRACTION_MAX_QUEUE_DEPTH,
+    max_pages=settings.EXTRACTION_MAX_PAGES,
+    timeout=settings.EXTRACTION_TIMEOUT_SECONDS,
+    max_memory_bytes=settings.EXTRACTION_MAX_MEMORY_BYTES,
+    max_tasks_per_worker=settings.EXTRACTION_MAX_TASKS_PER_WORKER,
+    cache_max_entries=settings.EXTRACTION_CACHE_MAX_ENTRIES,
+    cache_ttl=settings.EXTRACTION_CACHE_TTL_SECONDS,
+    cache_backend=create_cache_backend(
+        settings.EXTRACTION_CACHE_BACKEND, settings.EXTRACTION_CACHE_DIR, settings.FILE_CACHE_MAX_ENTRIES
+    ),
+)
+
+registry.callback(
+    "careernus_extraction_cache", "Statistiques du cache des textes extraits", ["cache", "stat"],
+    cache_stats_callback(document_extractor.stats, "extraction"),
+)
+registry.callback(
+    "careernus_extraction_queue_depth", "Documents en cours d'extraction ou en attente", [],
+    lambda: {(): document_extractor.pending},
+)
@@ -0,0 +1,180 @@
+from typing import List, NamedTuple
+import codecs
+import hashlib
+import unicodedata
+
+from fastapi import UploadFile
+
+from .document_extraction import TEXT, detect_format, document_extractor
+
+# Encodage utilisé lorsque le fichier n'est pas de l'UTF-8 valide
+FALLBACK_ENCODING = "cp1252"
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+class UploadTooLarge(Exception):
+    """Levée lorsqu'un fichier dépasse la taille maximale autorisée."""
+
+
+class IngestedText(NamedTuple):
+    """Texte extrait d'un fichier téléversé, déjà normalisé."""
+    text: str
+    content_hash: str
+    size: int
+    encoding: str
+    file_hash: str  # Empreinte SHA-256 du fichier tel que téléversé
+    format: str = TEXT
+
+
+class _StreamNormalizer:
+    """
+    Applique `normalize_content` sur un flux de texte, morceau par morceau.
+
+    Le résultat est identique à la normalisation du document complet : les
+    caractères qui pourraient encore être modifiés par la suite du flux (fin
+    de ligne "\\r", caractères combinables, espaces finaux) sont retenus
+    jusqu'au morceau suivant.
+    """
+
+    def __init__(self):
+        self._pending = ""
+        self._started = False
+        self._trailing_space = ""
+
+    def feed(self, piece: str) -> str:
+        text = self._pending + piece
+        # Conserver les caractères à partir du dernier caractère de base (classe combinatoire 0)
+        cut = len(text)
+        while cut > 0 and unicodedata.combining(text[cut - 1]):
+            cut -= 1
+        if cut > 0:
+            cut -= 1
+        # Ne pas séparer un "\r" du "\n" qui peut le suivre
+        if cut > 0 and text[cut - 1] == "\r":
+            cut -= 1
+        self._pending = text[cut:]
+        return self._emit(text[:cut])
+
+    def finish(self) -> str:
+        text, self._pending = self._pending, ""
+        output = self._emit(text)
+        # Les espaces de fin de document sont supprimés
+        self._trailing_space = ""
+        return output
+
+    def _emit(self, text: str) -> str:
+        text = unicodedata.normalize("NFC", text.replace("\r\n", "\n").replace("\r", "\n"))
+        if not self._started:
+            text = text.lstrip()
+            if not text:
+                return ""
+            self._started = True
+
+        text = self._trailing_space + text
+        stripped = text.rstrip()
+        self._trailing_space = text[len(stripped):]
+        return stripped
+
+
+def _detect_encoding(head: bytes) -> str:
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    return "utf-8"
+
+
+def _decode(decoder: codecs.IncrementalDecoder, encoding: str, chunk: bytes, final: bool = False):
+    state = decoder.getstate()
+    try:
+        return decoder, encoding, decoder.decode(chunk, final)
+    except UnicodeDecodeError:
+        # Le début du fichier était valide : seule la suite est décodée autrement
+        decoder = codecs.getincrementaldecoder(FALLBACK_ENCODING)(errors="replace")
+        return decoder, FALLBACK_ENCODING, decoder.decode(state[0] + chunk, final)
+
+
+async def read_upload_text(file: UploadFile, max_bytes: int, chunk_size: int = 64 * 1024) -> IngestedText:
+    """
+    Lit un fichier texte téléversé par morceaux, sans jamais le charger en entier.
+
+    L'encodage est détecté sur le premier morceau (BOM, sinon UTF-8) ; si le
+    fichier s'avère ne pas être de l'UTF-8 valide, la suite est décodée en
+    `FALLBACK_ENCODING`. Le texte est normalisé et son empreinte calculée au fil
+    de la lecture. `UploadTooLarge` est levée dès que `max_bytes` est dépassé.
+    """
+    pieces: List[str] = []
+    digest = hashlib.sha256()
+    file_digest = hashlib.sha256()
+    normalizer = _StreamNormalizer()
+    decoder = None
+    encoding = "utf-8"
+    head = b""
+    size = 0
+
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk and decoder is not None:
+            break
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadTooLarge()
+        file_digest.update(chunk)
+
+        if decoder is None:
+            # Attendre les premiers octets pour détecter un éventuel BOM
+            head += chunk
+            if chunk and len(head) < 4:
+                continue
+            chunk, head = head, b""
+            encoding = _detect_encoding(chunk)
+            decoder = codecs.getincrementaldecoder(encoding)()
+
+        decoder, encoding, piece = _decode(decoder, encoding, chunk)
+        normalized = normalizer.feed(piece)
+        if normalized:
+            pieces.append(normalized)
+            digest.update(normalized.encode("utf-8"))
+
+    decoder, encoding, piece = _decode(decoder, encoding, b"", final=True)
+    tail = normalizer.feed(piece) + normalizer.finish()
+    if tail:
+        pieces.append(tail)
+        digest.update(tail.encode("utf-8"))
+
+    return IngestedText("".join(pieces), digest.hexdigest(), size, encoding, file_digest.hexdigest())
+
+
+async def read_upload_document(file: UploadFile, max_bytes: int, chunk_size: int = 64 * 1024) -> IngestedText:
+    """
+    Lit un fichier téléversé quel que soit son format, détecté d'après ses
+    premiers octets : les fichiers texte sont lus par `read_upload_text`, le
+    texte des PDF et DOCX est extrait par `document_extractor` puis normalisé.
+
+    Lève `UploadTooLarge`, ainsi que `UnsupportedDocument`, `DocumentRejected`
+    et `ExtractionQueueFull` (voir `document_extraction`).
+    """
+    data = await file.read(chunk_size)
+    document_format = detect_format(data)
+    if document_format == TEXT:
+        await file.seek(0)
+        return await read_upload_text(file, max_bytes, chunk_size)
+
+    # Les analyseurs PDF et DOCX ont besoin du fichier complet
+    while chunk := await file.read(chunk_size):
+        data += chunk
+        if len(data) > max_bytes:
+            raise UploadTooLarge()
+    if len(data) > max_bytes:
+        raise UploadTooLarge()
+
+    normalizer = _StreamNormalizer()
+    text = normalizer.feed(await document_extractor.extract(data, document_format)) + normalizer.finish()
+    return IngestedText(
+        text, hashlib.sha256(text.encode("utf-8")).hexdigest(), len(data), "utf-8",
+        hashlib.sha256(data).hexdigest(), document_format
+    )
@@ -0,0 +1,195 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+import asyncio
+import time
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..models.resume import Resume
+from ..models.resume_term import ResumeTerm
+from .metrics import MATCHING_SECONDS, registry
+from .resume_index import SKILL, TITLE
+
+# Poids de chaque critère dans le score, renormalisés sur les critères présents dans l'offre
+SKILL_WEIGHT = 0.6
+TITLE_WEIGHT = 0.25
+EXPERIENCE_WEIGHT = 0.15
+
+
+class JobProfile(NamedTuple):
+    """Critères d'une offre d'emploi : termes normalisés (`normalize_term`) et expérience requise."""
+    skills: Set[str]
+    titles: Set[str]
+    experience_years: Optional[float]
+
+
+class CandidateMatch(NamedTuple):
+    resume_id: int
+    score: float
+    skills: List[str]
+    titles: List[str]
+
+
+class CandidateMatrix:
+    """
+    Candidats vectorisés : une ligne par CV, une colonne par terme indexé
+    (compétence ou titre), au format CSR.
+
+    Une offre est vectorisée sur les mêmes colonnes ; les scores de tous les
+    candidats sont obtenus par un seul produit matrice-vecteur creux, puis les
+    meilleurs sont sélectionnés par `argpartition`, sans trier tous les scores.
+    """
+
+    def __init__(
+        self, resume_ids: np.ndarray, user_ids: np.ndarray, experience: np.ndarray,
+        terms: Sequence[Tuple[str, str]], matrix: sparse.csr_matrix
+    ):
+        self.resume_ids = resume_ids
+        self.user_ids = user_ids
+        self.experience = experience  # NaN si inconnue
+        self.terms = terms
+        self.columns = {term: column for column, term in enumerate(terms)}
+        self.matrix = matrix
+
+    def __len__(self) -> int:
+        return len(self.resume_ids)
+
+    @classmethod
+    def build(
+        cls, resumes: Iterable[Tuple[int, int, Optional[float]]], postings: Iterable[Tuple[int, str, str]]
+    ) -> "CandidateMatrix":
+        """
+        Construit la matrice à partir des CV (id, user_id, années d'expérience)
+        et de leurs termes indexés (resume_id, type, terme).
+        """
+        resumes = sorted(resumes)
+        resume_ids = np.array([resume[0] for resume in resumes], dtype=np.int64)
+        user_ids = np.array([resume[1] for resume in resumes], dtype=np.int64)
+        experience = np.array(
+            [np.nan if resume[2] is None else resume[2] for resume in resumes], dtype=np.float64
+        )
+
+        columns: Dict[Tuple[str, str], int] = {}
+        posting_ids, posting_columns = [], []
+        for resume_id, kind, term in postings:
+            posting_ids.append(resume_id)
+            posting_columns.append(columns.setdefault((kind, term), len(columns)))
+
+        ids = np.array(posting_ids, dtype=np.int64)
+        rows = np.searchsorted(resume_ids, ids)
+        # Termes d'un CV créé entre les deux lectures : ignorés jusqu'à la prochaine construction
+        known = rows < len(resume_ids)
+        known[known] = resume_ids[rows[known]] == ids[known]
+        matrix = sparse.csr_matrix(
+            (
+                np.ones(int(known.sum()), dtype=np.float32),
+                (rows[known], np.array(posting_columns, dtype=np.int64)[known])
+            ),
+            shape=(len(resume_ids), len(columns))
+        )
+        return cls(resume_ids, user_ids, experience, list(columns), matrix)
+
+    def vectorize(self, job: JobProfile) -> Tuple[np.ndarray, float]:
+        """
+        Vecteur d'une offre : chaque terme de l'offre présent dans les CV vaut sa
+        part du score. Les termes qu'aucun CV ne contient comptent dans le
+        nombre de termes requis. Retourne aussi le poids de l'expérience.
+        """
+        criteria = [(SKILL, job.skills, SKILL_WEIGHT), (TITLE, job.titles, TITLE_WEIGHT)]
+        experience_weight = EXPERIENCE_WEIGHT if job.experience_years else 0.0
+        total = sum(weight for _, terms, weight in criteria if terms) + experience_weight
+
+        vector = np.zeros(len(self.terms), dtype=np.float64)
+        if not total:
+            return vector, 0.0
+        for kind, terms, weight in criteria:
+            for term in terms:
+                column = self.columns.get((kind, term))
+                if column is not None:
+                    vector[column] = weight / total / len(terms)
+        return vector, experience_weight / total
+
+    def score(self, job: JobProfile, limit: int, user_id: Optional[int] = None) -> List[CandidateMatch]:
+        """
+        Les `limit` meilleurs candidats pour une offre (score entre 0 et 1),
+        parmi les CV de `user_id` s'il est fourni. Les CV sans aucun critère en
+        commun avec l'offre ne sont pas retournés.
+        """
+        vector, experience_weight = self.vectorize(job)
+        scores = self.matrix @ vector
+        if experience_weight:
+            fit = np.nan_to_num(self.experience / job.experience_years, nan=0.0)
+            scores += experience_weight * np.clip(fit, 0.0, 1.0)
+        if user_id is not None:
+            scores[self.user_ids != user_id] = 0.0
+
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        # Score décroissant, puis CV le plus récent
+        candidates = candidates[np.lexsort((-self.resume_ids[candidates], -scores[candidates]))]
+
+        matches = []
+        for row in candidates:
+            columns = self.matrix.indices[self.matrix.indptr[row]:self.matrix.indptr[row + 1]]
+            matched = [self.terms[column] for column in columns if vector[column]]
+            matches.append(CandidateMatch(
+                resume_id=int(self.resume_ids[row]),
+                score=round(float(scores[row]), 4),
+                skills=sorted(term for kind, term in matched if kind == SKILL),
+                titles=sorted(term for kind, term in matched if kind == TITLE),
+            ))
+        return matches
+
+
+class CandidateIndex:
+    """
+    Matrice des candidats partagée par les requêtes du processus.
+
+    Elle est reconstruite depuis l'index des termes (`resume_terms`) lorsqu'elle
+    a plus de `ttl` secondes : un CV ajouté ou modifié est pris en compte au
+    plus tard après ce délai. La construction a lieu dans un thread, une seule
+    fois pour les requêtes concurrentes.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._matrix: Optional[CandidateMatrix] = None
+        self._built_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def size(self) -> int:
+        return len(self._matrix) if self._matrix is not None else 0
+
+    def _expired(self) -> bool:
+        return self._matrix is None or time.monotonic() - self._built_at > self.ttl
+
+    async def get(self, db: AsyncSession) -> CandidateMatrix:
+        if self._expired():
+            async with self._lock:
+                if self._expired():
+                    with MATCHING_SECONDS.time("build"):
+                        resumes = (await db.execute(
+                            select(Resume.id, Resume.user_id, Resume.experience_years)
+                        )).tuples().all()
+                        postings = (await db.execute(
+                            select(ResumeTerm.resume_id, ResumeTerm.kind, ResumeTerm.term)
+                        )).tuples().all()
+                        self._matrix = await asyncio.to_thread(CandidateMatrix.build, resumes, postings)
+                    self._built_at = time.monotonic()
+        return self._matrix
+
+    def invalidate(self) -> None:
+        self._matrix = None
+
+
+candidate_index = CandidateIndex(settings.MATCHING_MATRIX_TTL_SECONDS)
+
+registry.callback(
+    "careernus_matching_candidates", "CV de la matrice de rapprochement avec les offres", [],
+    lambda: {(): candidate_index.size},
+)
@@ -0,0 +1,102 @@
+from typing import Dict, Iterator, List, NamedTuple, Sequence
+import re
+
+_WORD_CHAR = re.compile(r"\w")
+
+
+class KeywordMatch(NamedTuple):
+    """Occurrence d'un terme du vocabulaire dans un texte."""
+    term: str
+    index: int
+    start: int
+    end: int
+
+
+class KeywordMatcher:
+    """
+    Recherche en une seule passe tous les termes d'un vocabulaire dans un texte.
+
+    Les termes sont compilés en une unique expression régulière structurée en
+    arbre de préfixes (trie) : à chaque position du texte, le moteur ne suit
+    qu'une branche de l'arbre, le coût de la recherche dépend donc de la
+    longueur du texte et non de la taille du vocabulaire. La recherche est
+    insensible à la casse et retourne le terme canonique du vocabulaire.
+    """
+
+    _END = ""
+
+    def __init__(self, terms: Sequence[str], whole_word: bool = True):
+        self.terms = list(terms)
+        self._index: Dict[str, int] = {}
+        for index, term in enumerate(self.terms):
+            self._index.setdefault(term.lower(), index)
+
+        # À chaque position, l'expression ne retient que le terme le plus long : les termes
+        # plus courts qui en sont préfixes sont retournés avec lui. Sans limite de mot en fin
+        # de terme, tout préfixe compte ("Architect" / "Architecte") ; avec limite de mot,
+        # seulement ceux suivis d'un caractère hors mot ("React" / "React Native", "Node" / "Node.js")
+        trie = self._build_trie(self._index)
+        self._prefixes: Dict[int, List[int]] = {}
+        for key, index in self._index.items():
+            # Termes rencontrés en descendant l'arbre le long de la clé : ses préfixes
+            prefixes = []
+            node = trie
+            for position, char in enumerate(key):
+                if position and self._END in node and not (whole_word and _WORD_CHAR.match(char)):
+                    prefixes.append(self._index[key[:position]])
+                node = node[char]
+            if prefixes:
+                self._prefixes[index] = sorted(prefixes)
+
+        pattern = self._build_pattern(trie)
+        if whole_word:
+            pattern += r"(?!\w)"
+        # Recherche en avant (lookahead) : les occurrences qui se chevauchent sont toutes
+        # retournées, comme si chaque terme était recherché indépendamment
+        self._regex = re.compile(r"(?<!\w)(?=(" + pattern + "))", re.IGNORECASE)
+
+    @classmethod
+    def _build_trie(cls, keys: Sequence[str]) -> Dict[str, dict]:
+        trie: Dict[str, dict] = {}
+        for key in keys:
+            node = trie
+            for char in key:
+                node = node.setdefault(char, {})
+            node[cls._END] = {}
+        return trie
+
+    @classmethod
+    def _build_pattern(cls, node: Dict[str, dict]) -> str:
+        alternatives = [
+            re.escape(char) + cls._build_pattern(child)
+            for char, child in sorted(node.items())
+            if char != cls._END
+        ]
+        if not alternatives:
+            return ""
+
+        optional = cls._END in node
+        if len(alternatives) == 1 and not optional:
+            return alternatives[0]
+
+        # Les alternatives plus longues sont essayées en premier (quantificateur gourmand)
+        pattern = "(?:" + "|".join(alternatives) + ")"
+        return pattern + "?" if optional else pattern
+
+    def finditer(self, content: str) -> Iterator[KeywordMatch]:
+        """Parcourt le texte une seule fois et retourne chaque occurrence trouvée."""
+        for match in self._regex.finditer(content):
+            term = match.group(1)
+            index = self._index.get(term.lower())
+            if index is None:
+                # Variante de casse Unicode sans équivalent en minuscules dans le vocabulaire
+                continue
+            start = match.start()
+            yield KeywordMatch(self.terms[index], index, start, start + len(term))
+            for prefix in self._prefixes.get(index, ()):
+                yield KeywordMatch(self.terms[prefix], prefix, start, start + len(self.terms[prefix]))
+
+    def find_terms(self, content: str) -> List[str]:
+        """Retourne les termes présents dans le texte, dans l'ordre du vocabulaire."""
+        found = {match.index for match in self.finditer(content)}
+        return [self.terms[index] for index in sorted(found)]
@@ -0,0 +1,277 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+import math
+import threading
+import time
+
+# Bornes par défaut des histogrammes de durée (en secondes)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """Base des métriques : un nom, une description et des séries par valeurs d'étiquettes."""
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Sequence[str]) -> LabelValues:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} attend les étiquettes {self.labelnames}")
+        return tuple(str(value) for value in labels)
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in self.samples())
+        return lines
+
+
+class Counter(_Metric):
+    """Compteur monotone."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield self.name, _format_labels(self.labelnames, key), value
+
+
+class Histogram(_Metric):
+    """Histogramme cumulatif (durées), au format Prometheus."""
+
+    type = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Par série : effectifs de chaque intervalle (le dernier pour +Inf), somme
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        """Mesure la durée du bloc `with`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        with self._lock:
+            series = [(key, list(counts), total[0]) for key, (counts, total) in self._series.items()]
+        for key, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = 'le="{}"'.format(_format_value(bound))
+                yield f"{self.name}_bucket", _format_labels(self.labelnames, key, le), cumulative
+            yield f"{self.name}_sum", _format_labels(self.labelnames, key), total
+            yield f"{self.name}_count", _format_labels(self.labelnames, key), cumulative
+
+
+class CallbackMetric(_Metric):
+    """
+    Métrique dont les valeurs sont lues au moment de l'export (statistiques de
+    cache, taille de file d'attente...) : `callback` retourne les valeurs par
+    tuple d'étiquettes.
+    """
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str],
+        callback: Callable[[], Dict[LabelValues, float]], type: str = "gauge"
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+        self.type = type
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        for key, value in self.callback().items():
+            yield self.name, _format_labels(self.labelnames, key), value
+
+
+class MetricsRegistry:
+    """Ensemble des métriques exportées par le processus, au format texte Prometheus."""
+
+    CONTENT_TYPE = "text/plain; version=0.0.4"
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Métrique déjà enregistrée : {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(
+        self, name: str, documentation: str, labelnames: Sequence[str],
+        callback: Callable[[], Dict[LabelValues, float]], type: str = "gauge"
+    ) -> CallbackMetric:
+        return self.register(CallbackMetric(name, documentation, labelnames, callback, type))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# Analyse des CV
+ANALYSIS_STAGE_SECONDS = registry.histogram(
+    "careernus_analysis_stage_seconds", "Durée de chaque étape de l'analyse d'un CV", ["stage"]
+)
+ANALYSIS_SECONDS = registry.histogram(
+    "careernus_analysis_seconds", "Durée d'une analyse, attente dans le pool comprise", ["mode"]
+)
+ANALYSIS_REJECTED = registry.counter(
+    "careernus_analysis_rejected_total", "Analyses refusées car le pool d'analyse est saturé"
+)
+
+# Extraction du texte des documents (PDF, DOCX)
+EXTRACTION_SECONDS = registry.histogram(
+    "careernus_extraction_seconds", "Durée d'extraction du texte d'un document, attente dans le pool comprise",
+    ["format"]
+)
+EXTRACTION_REJECTED = registry.counter(
+    "careernus_extraction_rejected_total", "Documents refusés à l'extraction, par motif", ["format", "reason"]
+)
+
+# CV importés en double
+RESUME_DUPLICATES = registry.counter(
+    "careernus_resume_duplicates_total", "CV importés en double d'un CV existant, par type de doublon", ["kind"]
+)
+
+# Analyse par modèle de langage
+LLM_REQUESTS = registry.counter(
+    "careernus_llm_requests_total", "Extractions demandées au modèle de langage, par résultat", ["outcome"]
+)
+LLM_REQUEST_SECONDS = registry.histogram(
+    "careernus_llm_request_seconds", "Durée des appels au modèle de langage"
+)
+ANALYSIS_FALLBACKS = registry.counter(
+    "careernus_analysis_fallbacks_total", "Analyses par modèle remplacées par l'analyse par regex", ["reason"]
+)
+
+# Analyses en arrière-plan
+ANALYSIS_JOBS = registry.counter(
+    "careernus_analysis_jobs_total", "Tentatives d'analyse en arrière-plan terminées, par résultat", ["outcome"]
+)
+ANALYSIS_JOB_CALLBACKS = registry.counter(
+    "careernus_analysis_job_callbacks_total", "Notifications de fin d'analyse (webhooks), par résultat", ["outcome"]
+)
+
+# Base de données
+DB_SESSION_SECONDS = registry.histogram(
+    "careernus_db_session_seconds", "Durée de vie des sessions de base de données", ["mode"]
+)
+DB_SESSION_ERRORS = registry.counter(
+    "careernus_db_session_errors_total", "Sessions de base de données terminées par une erreur", ["mode"]
+)
+DB_QUERY_SECONDS = registry.histogram(
+    "careernus_db_query_seconds", "Durée d'exécution des requêtes SQL", ["statement"]
+)
+
+# Authentification
+AUTH_SECONDS = registry.histogram(
+    "careernus_auth_seconds", "Durée de résolution de l'utilisateur courant", ["source"]
+)
+
+# Rapprochement CV / offres d'emploi
+MATCHING_SECONDS = registry.histogram(
+    "careernus_matching_seconds", "Durée de construction de la matrice des candidats et de calcul des scores",
+    ["stage"]
+)
+
+# Requêtes HTTP
+HTTP_REQUESTS = registry.counter(
+    "careernus_http_requests_total", "Requêtes HTTP traitées", ["router", "route", "method", "status"]
+)
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "careernus_http_request_seconds", "Durée des requêtes HTTP, envoi de la réponse compris",
+    ["router", "route", "method"]
+)
+SLOW_REQUEST_PROFILES = registry.counter(
+    "careernus_slow_request_profiles_total", "Profils enregistrés pour des requêtes lentes", ["router"]
+)
+
+
+def observe_stage_timings(timings: Dict[str, float]) -> None:
+    """Enregistre les durées par étape retournées par l'analyseur."""
+    for stage, seconds in timings.items():
+        ANALYSIS_STAGE_SECONDS.observe(seconds, stage)
+
+
+def cache_stats_callback(stats: Callable[[], Dict[str, int]], cache: str) -> Callable[[], Dict[LabelValues, float]]:
+    """Adapte les statistiques d'un cache (`LRUCache.stats()`) aux étiquettes (cache, stat)."""
+    return lambda: {(cache, name): value for name, value in stats().items()}
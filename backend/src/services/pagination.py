@@ -0,0 +1,48 @@
+from datetime import datetime
+from typing import Tuple
+import base64
+
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """Encode la position (created_at, id) du dernier élément d'une page en curseur opaque."""
+    raw = f"{created_at.isoformat()}|{item_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Décode un curseur produit par `encode_cursor` ; lève ValueError s'il est invalide."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        created_at, item_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(item_id)
+    except (UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Curseur invalide") from exc
+
+
+def encode_id_cursor(item_id: int) -> str:
+    """Curseur opaque pour une pagination par identifiant décroissant."""
+    return base64.urlsafe_b64encode(str(item_id).encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_id_cursor(cursor: str) -> int:
+    """Décode un curseur produit par `encode_id_cursor` ; lève ValueError s'il est invalide."""
+    try:
+        return int(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii"))
+    except (UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Curseur invalide") from exc
+
+
+def encode_rank_cursor(rank: float, item_id: int) -> str:
+    """Curseur opaque pour une pagination par (score, identifiant) décroissants."""
+    raw = f"{rank!r}|{item_id}"
+    return base64.urlsafe_b64encode(raw.encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, int]:
+    """Décode un curseur produit par `encode_rank_cursor` ; lève ValueError s'il est invalide."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        rank, item_id = raw.rsplit("|", 1)
+        return float(rank), int(item_id)
+    except (UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Curseur invalide") from exc
@@ -1,6 +1,67 @@
+from bisect import bisect_left
 from typing import Dict, Any, List, Optional
 import re
-from ..schemas.resume import ResumeAnalysisResponse
+import time
+from ..schemas.resume import ResumeAnalysisResponse, ResumeSection
+from .keyword_matcher import KeywordMatcher
+from .resume_segmenter import HEADER_SECTION, Section, section_hash, segment_resume
+from .vocabulary import SKILLS, DEGREES, JOB_TITLES
+
+# Version de l'analyseur : à incrémenter dès que le résultat d'une analyse peut changer,
+# les analyses stockées avec une autre version sont recalculées à la lecture
+ANALYZER_VERSION = "3"
+
+# Expressions compilées une seule fois au chargement du module
+# Fins de phrase ou de paragraphe (le point de "Node.js" n'en est pas une)
+_CLAUSE_BOUNDARY_PATTERN = re.compile(r'\.(?=\s|$)|\n[ \t]*\n')
+# Éléments d'une formation à l'intérieur d'une phrase : années, institutions et délimiteurs
+_EDUCATION_TOKEN_PATTERN = re.compile(
+    r'(?P<year>(?<!\d)(?:19|20)\d{2}(?!\d))'
+    r"|(?P<institution>(?:\b[lL]['’])?\b(?:Université|École|University|Institute?|College|School)\b)"
+    r'|(?P<separator>[,;:()|\n–—]|\s-\s)'
+    r'|(?P<connector>\s(?:à|au|at|from|chez)\s)',
+    re.IGNORECASE
+)
+_ELISION_PATTERN = re.compile(r"^[lL]['’]")
+_TRAILING_CONNECTOR_PATTERN = re.compile(r"(?:\s+(?:de|du|des|of|in|en|à|au|at|from))+$", re.IGNORECASE)
+_SENTENCE_END_PATTERN = re.compile(r'[^.]*?\.')
+_EXPERIENCE_PATTERNS = [
+    re.compile(r'(\d+)[\+]?\s*(?:ans|années|an|année)(?:\s+d\'expérience|\s+d\'exp\.)?', re.IGNORECASE),
+    re.compile(r'expérience\s+(?:de|d\')\s*(\d+)[\+]?\s*(?:ans|années|an|année)', re.IGNORECASE),
+    re.compile(r'(\d+)[\+]?\s*(?:years|year)(?:\s+of\s+experience|\s+exp\.)?', re.IGNORECASE)
+]
+_EMAIL_PATTERN = re.compile(r'[\w\.-]+@[\w\.-]+')
+_PHONE_PATTERN = re.compile(r'\b\d{10}\b|\(\d{3}\)\s*\d{3}[-\s]?\d{4}|\+\d{1,3}\s\d{1,14}')
+
+# Extracteurs exécutés sur chaque type de section ("words" est calculé pour toutes).
+# Un extracteur dont aucune section n'est présente dans le CV s'exécute sur tout le texte.
+SECTION_EXTRACTORS: Dict[str, frozenset] = {
+    HEADER_SECTION: frozenset({"skills", "experience_years", "job_titles", "email", "phone"}),
+    "contact": frozenset({"email", "phone"}),
+    "summary": frozenset({"skills", "experience_years", "job_titles"}),
+    "experience": frozenset({"skills", "experience_years", "job_titles"}),
+    "education": frozenset({"education"}),
+    "skills": frozenset({"skills"}),
+    "projects": frozenset({"skills"}),
+    "certifications": frozenset({"skills"}),
+    "languages": frozenset(),
+    "interests": frozenset(),
+    "publications": frozenset(),
+}
+
+class _StageClock:
+    """Chronomètre les étapes successives d'une analyse (inactif sans `timings`)."""
+
+    def __init__(self, timings: Optional[Dict[str, float]]):
+        self.timings = timings
+        self._last = time.perf_counter() if timings is not None else 0.0
+
+    def lap(self, stage: str) -> None:
+        # Les durées d'une même étape (sur plusieurs sections) s'additionnent
+        if self.timings is not None:
+            now = time.perf_counter()
+            self.timings[stage] = self.timings.get(stage, 0.0) + now - self._last
+            self._last = now
 
 class ResumeAnalyzer:
     """Service pour analyser les CV et fournir des recommandations."""
@@ -8,20 +69,118 @@ class ResumeAnalyzer:
     def __init__(self):
         # Dans un MVP, nous utiliserons une implémentation simplifiée
         # Plus tard, nous intégrerons OpenAI ou d'autres APIs d'IA
-        pass
+        # Les vocabulaires sont compilés une seule fois, à la création de l'analyseur
+        self._skill_matcher = KeywordMatcher(SKILLS)
+        self._degree_matcher = KeywordMatcher(DEGREES)
+        self._title_matcher = KeywordMatcher(JOB_TITLES, whole_word=False)
+        self._skill_order = {skill: index for index, skill in enumerate(SKILLS)}
+        self._extractors = {
+            "skills": self._extract_skills,
+            "experience_years": self._estimate_experience_years,
+            "education": self._extract_education,
+            "job_titles": self._extract_job_titles,
+            "email": lambda text: _EMAIL_PATTERN.search(text) is not None,
+            "phone": lambda text: _PHONE_PATTERN.search(text) is not None,
+            "words": lambda text: len(text.split()),
+        }
         
-    def analyze_resume(self, content: str) -> ResumeAnalysisResponse:
+    def analyze_resume(
+        self, content: str, timings: Optional[Dict[str, float]] = None,
+        previous_sections: Optional[List[ResumeSection]] = None
+    ) -> ResumeAnalysisResponse:
         """
         Analyse un CV et retourne des insights.
         
         Pour le MVP, nous utilisons une analyse basique basée sur des regex.
         Dans une version future, cela sera remplacé par des appels à l'API OpenAI.
+
+        Le CV est d'abord découpé en sections (expérience, formation,
+        compétences...) ; chaque extracteur ne parcourt que les sections qui le
+        concernent. Les résultats et positions de chaque section sont conservés
+        dans `sections`.
+
+        Si `timings` est fourni, la durée de chaque étape (en secondes) y est
+        enregistrée : l'analyse pouvant s'exécuter dans un autre processus, les
+        durées sont retournées à l'appelant plutôt qu'exportées directement.
+
+        `previous_sections` (sections d'une analyse précédente du même CV)
+        permet une analyse incrémentale : les sections dont le texte n'a pas
+        changé réutilisent leurs résultats au lieu de relancer les extracteurs.
         """
-        # Analyse simplifiée pour le MVP
-        skills = self._extract_skills(content)
-        experience_years = self._estimate_experience_years(content)
-        education = self._extract_education(content)
-        job_titles = self._extract_job_titles(content)
+        clock = _StageClock(timings)
+        sections = segment_resume(content)
+        clock.lap("segmentation")
+
+        # Les résultats d'une section ne dépendent que de son texte
+        reusable = {section.content_hash: section.results for section in previous_sections or ()}
+
+        plan = self._plan_extractors(sections)
+        analyzed = []
+        for section, extractors in zip(sections, plan):
+            text = content[section.start:section.end]
+            content_hash = section_hash(text)
+            previous = reusable.get(content_hash, {})
+            results = {}
+            for name in extractors:
+                if name in previous:
+                    results[name] = previous[name]
+                    continue
+                results[name] = self._extractors[name](text)
+                clock.lap(name)
+            analyzed.append(ResumeSection(
+                kind=section.kind,
+                start=section.start,
+                end=section.end,
+                content_hash=content_hash,
+                results=results
+            ))
+        return self.build_response(analyzed, clock)
+
+    def _plan_extractors(self, sections: List[Section]) -> List[List[str]]:
+        """Liste, pour chaque section, les extracteurs à exécuter sur son texte."""
+        kinds = {section.kind for section in sections}
+        covered = set().union(*(SECTION_EXTRACTORS[kind] for kind in kinds))
+        # Extracteurs sans section dédiée dans ce CV : exécutés partout
+        fallback = set(self._extractors) - covered - {"words"}
+        return [
+            sorted(SECTION_EXTRACTORS[section.kind] | fallback | {"words"})
+            for section in sections
+        ]
+
+    def build_response(
+        self, sections: List[ResumeSection], clock: Optional[_StageClock] = None,
+        overrides: Optional[Dict[str, Any]] = None
+    ) -> ResumeAnalysisResponse:
+        """
+        Agrège les résultats par section en une analyse complète (score ATS,
+        forces, faiblesses, suggestions), sans relire le texte du CV.
+
+        `overrides` remplace les résultats agrégés ("skills", "experience_years",
+        "education", "job_titles") par ceux d'une autre source, un modèle de
+        langage par exemple ; le score et les recommandations en découlent.
+        """
+        clock = clock or _StageClock(None)
+        overrides = overrides or {}
+
+        def collect(name: str) -> List[Any]:
+            return [section.results[name] for section in sections if name in section.results]
+
+        if "skills" in overrides:
+            skills = list(dict.fromkeys(overrides["skills"]))
+        else:
+            skills = sorted({skill for found in collect("skills") for skill in found}, key=self._skill_order.__getitem__)
+        if "experience_years" in overrides:
+            experience_years = overrides["experience_years"]
+        else:
+            experience_years = next((years for years in collect("experience_years") if years is not None), None)
+        if "education" in overrides:
+            education = overrides["education"]
+        else:
+            education = [entry for found in collect("education") for entry in found]
+        if "job_titles" in overrides:
+            job_titles = list(dict.fromkeys(overrides["job_titles"]))
+        else:
+            job_titles = list(dict.fromkeys(title for found in collect("job_titles") for title in found))
         
         # Générer des suggestions d'amélioration basiques
         suggestions = []
@@ -33,11 +192,16 @@ class ResumeAnalyzer:
             suggestions.append("Ajoutez des détails sur votre formation académique.")
             
         # Calcul d'un score ATS basique
-        ats_score = self._calculate_ats_score(content, skills, len(job_titles), bool(education))
+        ats_score = self._calculate_ats_score(
+            skills, len(job_titles), bool(education),
+            words=sum(collect("words")), has_email=any(collect("email")), has_phone=any(collect("phone"))
+        )
+        clock.lap("ats_score")
         
         # Forces et faiblesses
         strengths = self._identify_strengths(skills, experience_years, education)
         weaknesses = self._identify_weaknesses(skills, experience_years, education)
+        clock.lap("insights")
         
         return ResumeAnalysisResponse(
             skills=skills,
@@ -47,90 +211,157 @@ class ResumeAnalyzer:
             improvement_suggestions=suggestions,
             ats_score=ats_score,
             strengths=strengths,
-            weaknesses=weaknesses
+            weaknesses=weaknesses,
+            sections=sections,
+            analyzer_version=ANALYZER_VERSION
         )
     
     def _extract_skills(self, content: str) -> List[str]:
         """Extrait une liste de compétences du CV."""
-        # Liste simplifiée de compétences techniques courantes
-        common_skills = [
-            "Python", "JavaScript", "Java", "C\\+\\+", "C#", "SQL", "React", "Angular", 
-            "Vue", "Node.js", "Django", "Flask", "Spring", "Docker", "Kubernetes",
-            "AWS", "Azure", "GCP", "Machine Learning", "Deep Learning", "TensorFlow",
-            "PyTorch", "NLP", "Data Analysis", "Excel", "PowerBI", "Tableau"
-        ]
-        
-        # Recherche des compétences dans le contenu
-        found_skills = []
-        for skill in common_skills:
-            if re.search(r'\b' + skill + r'\b', content, re.IGNORECASE):
-                found_skills.append(skill)
-                
-        return found_skills
+        return self._skill_matcher.find_terms(content)
     
     def _estimate_experience_years(self, content: str) -> Optional[float]:
         """Estime le nombre d'années d'expérience."""
         # Recherche de patterns comme "X ans d'expérience" ou "X+ années"
-        patterns = [
-            r'(\d+)[\+]?\s*(?:ans|années|an|année)(?:\s+d\'expérience|\s+d\'exp\.)?',
-            r'expérience\s+(?:de|d\')\s*(\d+)[\+]?\s*(?:ans|années|an|année)',
-            r'(\d+)[\+]?\s*(?:years|year)(?:\s+of\s+experience|\s+exp\.)?'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, content, re.IGNORECASE)
+        for pattern in _EXPERIENCE_PATTERNS:
+            match = pattern.search(content)
             if match:
                 return float(match.group(1))
         
         return None
     
     def _extract_education(self, content: str) -> List[Dict[str, Any]]:
-        """Extrait les informations sur l'éducation."""
+        """
+        Extrait les informations sur l'éducation.
+
+        Chaque diplôme est associé à l'année et à l'institution de sa propre
+        phrase (ou paragraphe) : celles qui le suivent avant le diplôme
+        suivant, ou à défaut celles qui le précèdent pour le premier diplôme
+        de la phrase. Le texte est découpé en phrases en un seul parcours, et
+        seules les phrases qui contiennent un diplôme sont analysées en détail.
+        """
+        degrees = list(self._degree_matcher.finditer(content))
+        if not degrees:
+            return []
+
+        boundaries = [match.span() for match in _CLAUSE_BOUNDARY_PATTERN.finditer(content)]
+        boundary_starts = [start for start, _ in boundaries]
+
         education = []
-        
-        # Recherche de diplômes courants
-        degrees = [
-            "Master", "MBA", "Doctorat", "PhD", "Licence", "Bachelor", 
-            "Ingénieur", "BTS", "DUT", "Bac\\+\\d"
-        ]
-        
-        for degree in degrees:
-            matches = re.finditer(r'\b' + degree + r'\b(?:[^.]*?(\d{4}))?', content, re.IGNORECASE)
-            for match in matches:
-                year = match.group(1) if match.groups() and match.group(1) else None
-                # Essayer d'extraire l'institution
-                institution_match = re.search(r'\b' + degree + r'\b[^.]*?(Université|École|University|Institute|College|School)[^.]*?\.', content, re.IGNORECASE)
-                institution = institution_match.group(0) if institution_match else "Non spécifié"
-                
-                education.append({
-                    "degree": match.group(0),
-                    "year": year,
-                    "institution": institution
-                })
-                
+        previous_end = 0
+        clause_start = 0
+        clause_end = -1
+        tokens: List[tuple] = []
+        token_starts: List[int] = []
+        for position, match in enumerate(degrees):
+            # Diplôme inclus dans le précédent (ex. "Bac+5" dans un intitulé)
+            if match.start < previous_end:
+                continue
+            previous_end = match.end
+
+            first_in_clause = match.start >= clause_end
+            if first_in_clause:
+                boundary = bisect_left(boundary_starts, match.start)
+                clause_start = boundaries[boundary - 1][1] if boundary else 0
+                clause_end = boundary_starts[boundary] if boundary < len(boundaries) else len(content)
+                tokens = [
+                    (token.start(), token.end(), token.lastgroup)
+                    for token in _EDUCATION_TOKEN_PATTERN.finditer(content, clause_start, clause_end)
+                ]
+                token_starts = [token[0] for token in tokens]
+
+            # L'entrée s'étend jusqu'au diplôme suivant de la même phrase
+            entry_end = clause_end
+            following = position + 1
+            while following < len(degrees) and degrees[following].start < match.end:
+                following += 1
+            if following < len(degrees):
+                entry_end = min(entry_end, degrees[following].start)
+
+            first = bisect_left(token_starts, match.end)
+            last = bisect_left(token_starts, entry_end, first)
+            entry_tokens = tokens[first:last]
+            before_tokens = []
+            if first_in_clause:
+                before_tokens = tokens[:bisect_left(token_starts, match.start)]
+
+            # L'intitulé s'arrête au premier délimiteur, année ou institution
+            degree_end = entry_tokens[0][0] if entry_tokens else entry_end
+            degree = _TRAILING_CONNECTOR_PATTERN.sub("", content[match.start:degree_end].strip(" \t-–—"))
+            education.append({
+                "degree": degree,
+                "year": self._find_year(content, entry_tokens, before_tokens),
+                "institution": self._find_institution(content, entry_tokens, degree_end, entry_end)
+                    or self._find_institution(content, before_tokens, clause_start, match.start, last=True)
+                    or "Non spécifié"
+            })
+
         return education
+
+    @staticmethod
+    def _find_year(content: str, entry_tokens: List[tuple], before_tokens: List[tuple]) -> Optional[str]:
+        """Première année après le diplôme, sinon la plus proche avant lui."""
+        for start, end, kind in entry_tokens:
+            if kind == "year":
+                return content[start:end]
+        for start, end, kind in reversed(before_tokens):
+            if kind == "year":
+                return content[start:end]
+        return None
+
+    @staticmethod
+    def _find_institution(
+        content: str, tokens: List[tuple], lower: int, upper: int, last: bool = False
+    ) -> Optional[str]:
+        """
+        Nom de la première (ou dernière) institution trouvée parmi `tokens` : le
+        segment qui contient le mot-clé, délimité par la ponctuation, un
+        connecteur ("à", "at"...), une année ou les bornes `lower` et `upper`.
+        """
+        keywords = [token[0] for token in tokens if token[2] == "institution"]
+        if not keywords:
+            return None
+        position = keywords[-1] if last else keywords[0]
+
+        start, end = lower, upper
+        for token_start, token_end, kind in tokens:
+            if kind == "institution":
+                continue
+            if token_end <= position:
+                start = max(start, token_end)
+            elif token_start > position:
+                end = min(end, token_start)
+                break
+
+        institution = _ELISION_PATTERN.sub("", content[start:end].strip(" \t-–—"))
+        return institution or None
     
     def _extract_job_titles(self, content: str) -> List[str]:
         """Extrait les titres de postes du CV."""
-        # Liste de titres de postes courants
-        common_titles = [
-            "Développeur", "Developer", "Ingénieur", "Engineer", "Architecte", "Architect",
-            "Chef de Projet", "Project Manager", "Directeur", "Director", "Consultant",
-            "Analyste", "Analyst", "Designer", "Technicien", "Technician", "Responsable",
-            "Manager", "Lead", "Senior", "Junior"
-        ]
+        entries = []
+        last_end: Dict[int, int] = {}
+        
+        # Un seul parcours du texte pour tous les titres
+        for match in self._title_matcher.finditer(content):
+            if match.start < last_end.get(match.index, 0):
+                continue
+            sentence_match = _SENTENCE_END_PATTERN.match(content, match.end)
+            if not sentence_match:
+                continue
+            last_end[match.index] = sentence_match.end()
+            entries.append((match.index, match.start, content[match.start:sentence_match.end()].strip('.')))
         
         job_titles = []
-        for title in common_titles:
-            matches = re.finditer(r'\b' + title + r'[^.]*?\.', content, re.IGNORECASE)
-            for match in matches:
-                job_title = match.group(0).strip('.')
-                if job_title not in job_titles:
-                    job_titles.append(job_title)
+        for _, _, job_title in sorted(entries):
+            if job_title not in job_titles:
+                job_titles.append(job_title)
                     
         return job_titles
     
-    def _calculate_ats_score(self, content: str, skills: List[str], job_titles_count: int, has_education: bool) -> int:
+    def _calculate_ats_score(
+        self, skills: List[str], job_titles_count: int, has_education: bool,
+        words: int, has_email: bool, has_phone: bool
+    ) -> int:
         """Calcule un score ATS basique."""
         score = 0
         
@@ -145,17 +376,16 @@ class ResumeAnalyzer:
             score += 20
             
         # Points pour la longueur du CV
-        words = len(content.split())
         if words > 300:
             score += 10
         elif words > 150:
             score += 5
             
         # Points pour les coordonnées
-        if re.search(r'[\w\.-]+@[\w\.-]+', content):  # Email
+        if has_email:  # Email
             score += 5
             
-        if re.search(r'\b\d{10}\b|\(\d{3}\)\s*\d{3}[-\s]?\d{4}|\+\d{1,3}\s\d{1,14}', content):  # Téléphone
+        if has_phone:  # Téléphone
             score += 5
             
         return min(score, 100)  # Plafonner à 100
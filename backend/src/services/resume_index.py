@@ -0,0 +1,121 @@
+from typing import List, Optional, Set, Tuple
+import unicodedata
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.sql import Select
+
+from ..models.resume import Resume
+from ..models.resume_term import ResumeTerm
+from ..schemas.resume import ResumeAnalysisResponse
+from .keyword_matcher import KeywordMatcher
+from .vocabulary import JOB_TITLES
+
+# Types de termes indexés
+SKILL = "skill"
+TITLE = "title"
+
+# Les titres extraits sont des phrases ("Développeur chez Acme (2020)") : seuls
+# les titres du vocabulaire qu'elles contiennent sont indexés
+_title_matcher = KeywordMatcher(JOB_TITLES, whole_word=False)
+
+
+def normalize_term(term: str) -> str:
+    """Forme indexée d'un terme : NFC, sans espaces de bord, insensible à la casse."""
+    return unicodedata.normalize("NFC", term).strip().casefold()
+
+
+def title_terms(text: str) -> Set[str]:
+    """Titres du vocabulaire contenus dans un texte, sous leur forme indexée."""
+    return {normalize_term(title) for title in _title_matcher.find_terms(text)}
+
+
+def extract_terms(analysis: ResumeAnalysisResponse) -> Set[Tuple[str, str]]:
+    """Termes (type, terme) à indexer pour une analyse."""
+    terms = {(SKILL, normalize_term(skill)) for skill in analysis.skills}
+    for job_title in analysis.job_titles:
+        terms.update((TITLE, title) for title in title_terms(job_title))
+    return terms
+
+
+def _term_rows(resume_id: int, analysis: ResumeAnalysisResponse) -> List[ResumeTerm]:
+    return [ResumeTerm(kind=kind, term=term, resume_id=resume_id) for kind, term in sorted(extract_terms(analysis))]
+
+
+async def index_resume(db: AsyncSession, resume: Resume, analysis: ResumeAnalysisResponse) -> None:
+    """
+    Remplace les termes indexés d'un CV par ceux de son analyse (sans valider
+    la transaction : l'index est écrit avec l'analyse).
+    """
+    if resume.id is None:
+        await db.flush()
+    resume.experience_years = analysis.experience_years
+    await db.execute(delete(ResumeTerm).where(ResumeTerm.resume_id == resume.id))
+    db.add_all(_term_rows(resume.id, analysis))
+
+
+def build_search_query(
+    columns: Select, criteria: List[Tuple[str, str]], min_experience: Optional[float] = None
+) -> Tuple[Select, object]:
+    """
+    Construit la recherche des CV qui contiennent tous les termes de `criteria`.
+
+    Les listes de CV de chaque terme sont intersectées par jointures sur la
+    clé primaire de l'index : la base parcourt la liste du premier terme par
+    ordre décroissant d'identifiant et ne vérifie la présence des autres termes
+    que pour ces CV, ce qui permet de s'arrêter dès la page remplie.
+    Retourne la requête et la colonne d'identifiant sur laquelle paginer.
+    """
+    query = columns
+    id_column = Resume.id
+    if criteria:
+        postings = [aliased(ResumeTerm) for _ in criteria]
+        first = postings[0]
+        id_column = first.resume_id
+        query = query.select_from(first).join(Resume, Resume.id == first.resume_id)
+        for posting in postings[1:]:
+            query = query.join(posting, posting.resume_id == first.resume_id)
+        for posting, (kind, term) in zip(postings, criteria):
+            query = query.where(posting.kind == kind, posting.term == term)
+    if min_experience is not None:
+        query = query.where(Resume.experience_years >= min_experience)
+    return query, id_column
+
+
+def reindex_all(db: Session, batch_size: int = 500) -> int:
+    """
+    Reconstruit l'index de tous les CV (après la migration qui crée l'index, ou
+    un changement d'analyseur). Les analyses périmées sont recalculées.
+    """
+    from .analysis_store import load_resume_analysis, normalize_content, set_analysis
+    from .resume_storage import read_content
+    from .resume_analyzer import ResumeAnalyzer
+
+    analyzer = ResumeAnalyzer()
+    count = 0
+    last_id = 0
+    while True:
+        resumes = db.execute(
+            select(Resume).where(Resume.id > last_id).order_by(Resume.id).limit(batch_size)
+        ).scalars().all()
+        if not resumes:
+            return count
+        for resume in resumes:
+            analysis = load_resume_analysis(resume)
+            if analysis is None:
+                analysis = analyzer.analyze_resume(normalize_content(read_content(resume)))
+                set_analysis(resume, analysis)
+            resume.experience_years = analysis.experience_years
+            db.execute(delete(ResumeTerm).where(ResumeTerm.resume_id == resume.id))
+            db.add_all(_term_rows(resume.id, analysis))
+            count += 1
+        last_id = resumes[-1].id
+        db.commit()
+
+
+if __name__ == "__main__":
+    from ..database import SessionLocal
+
+    with SessionLocal() as session:
+        print(f"{reindex_all(session)} CV indexés")
@@ -0,0 +1,77 @@
+from typing import Dict, List, NamedTuple
+import hashlib
+import re
+
+# Section du texte précédant le premier titre (nom, coordonnées, accroche)
+HEADER_SECTION = "header"
+
+# Titres de section reconnus, en français et en anglais
+SECTION_HEADINGS: Dict[str, List[str]] = {
+    "contact": [
+        r"contact", r"coordonn[ée]es", r"informations personnelles", r"contact information",
+        r"personal (?:information|details)",
+    ],
+    "summary": [
+        r"profil(?: professionnel)?", r"r[ée]sum[ée]", r"[àa] propos(?: de moi)?", r"objectifs?",
+        r"(?:professional )?summary", r"profile", r"about me", r"objective",
+    ],
+    "experience": [
+        r"exp[ée]riences?(?: professionnelles?)?", r"parcours professionnel", r"emplois?",
+        r"(?:professional |work )?experiences?", r"employment(?: history)?", r"work history",
+    ],
+    "education": [
+        r"formations?(?: acad[ée]miques?)?", r"dipl[ôo]mes?", r"[ée]tudes", r"cursus(?: acad[ée]mique)?",
+        r"education", r"academic background", r"qualifications", r"degrees",
+    ],
+    "skills": [
+        r"comp[ée]tences?(?: techniques| cl[ée]s)?", r"savoir-faire", r"outils",
+        r"(?:technical |key )?skills", r"competenc(?:ies|es)", r"expertise", r"technologies",
+    ],
+    "languages": [r"langues", r"languages"],
+    "projects": [r"projets?(?: personnels)?", r"r[ée]alisations", r"(?:personal )?projects?"],
+    "certifications": [r"certifications?", r"certificats?", r"licenses(?: (?:&|and) certifications)?"],
+    "interests": [r"centres? d'int[ée]r[êe]ts?", r"int[ée]r[êe]ts", r"loisirs", r"interests", r"hobbies"],
+    "publications": [r"publications", r"communications"],
+}
+
+# Un titre occupe seul sa ligne (éventuellement décorée : "## ", "- ", majuscules),
+# ou introduit le contenu de la ligne après deux-points ("Compétences : Python, SQL")
+_HEADING_PATTERN = re.compile(
+    r"^[ \t]*(?:[#*•=\-–][ \t]*)*(?:"
+    + "|".join(
+        "(?P<{}>{})".format(kind, "|".join(patterns)) for kind, patterns in SECTION_HEADINGS.items()
+    )
+    + r")[ \t]*(?::|[ \t]*$)",
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+class Section(NamedTuple):
+    """Section d'un CV : type et position dans le texte (titre compris)."""
+    kind: str
+    start: int
+    end: int
+
+
+def segment_resume(content: str) -> List[Section]:
+    """
+    Découpe un CV en sections contiguës, en un seul parcours du texte.
+
+    Le texte qui précède le premier titre forme une section `HEADER_SECTION` ;
+    un CV sans titre reconnu n'a donc qu'une seule section. Les sections
+    couvrent tout le texte, sans chevauchement.
+    """
+    sections: List[Section] = []
+    kind, start = HEADER_SECTION, 0
+    for match in _HEADING_PATTERN.finditer(content):
+        if match.start() > start or kind != HEADER_SECTION:
+            sections.append(Section(kind, start, match.start()))
+        kind, start = match.lastgroup, match.start()
+    if start < len(content) or not sections:
+        sections.append(Section(kind, start, len(content)))
+    return sections
+
+
+def section_hash(text: str) -> str:
+    """Empreinte du texte d'une section, pour retrouver ses résultats après une modification."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
@@ -0,0 +1,141 @@
+from typing import List, Optional
+import asyncio
+import hashlib
+import io
+import time
+
+from fastapi import UploadFile
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.resume import Resume
+from .blob_storage import BlobNotFound, blob_storage
+from .deduplication import set_fingerprints
+
+# Préfixes des clés d'objets ; les clés se terminent par l'empreinte SHA-256 du contenu
+UPLOAD_PREFIX = "uploads/"
+TEXT_PREFIX = "texts/"
+
+# Types MIME des fichiers d'origine, par format détecté
+MEDIA_TYPES = {
+    "text": "text/plain",
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+
+def compute_content_hash(content: str) -> str:
+    """Calcule l'empreinte SHA-256 du contenu d'un CV."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def resume_content_hash(resume: Resume) -> str:
+    """Empreinte du texte complet d'un CV, sans le lire s'il est stocké hors de la table."""
+    if resume.content_hash:
+        return resume.content_hash
+    if resume.content_key:
+        return resume.content_key[len(TEXT_PREFIX):]
+    return compute_content_hash(resume.content)
+
+
+async def set_content(resume: Resume, content: str, content_hash: Optional[str] = None) -> None:
+    """
+    Remplace le texte d'un CV et ses empreintes. Au-delà de
+    `BLOB_CONTENT_MIN_CHARS` caractères, le texte complet est stocké hors de
+    la table : seul son début reste dans `resumes.content`, pour les
+    recherches et les extraits.
+    """
+    content_hash = content_hash or compute_content_hash(content)
+    resume.content_hash = content_hash
+    set_fingerprints(resume, content)
+
+    limit = settings.BLOB_CONTENT_MIN_CHARS
+    if blob_storage is None or not limit or len(content) <= limit:
+        resume.content = content
+        resume.content_key = None
+        return
+
+    key = TEXT_PREFIX + content_hash
+    await blob_storage.aput(key, io.BytesIO(content.encode("utf-8")))
+    resume.content = content[:limit]
+    resume.content_key = key
+
+
+def read_content(resume: Resume) -> str:
+    """Texte complet d'un CV (lecture synchrone du stockage d'objets si nécessaire)."""
+    if not resume.content_key:
+        return resume.content
+    if blob_storage is None:
+        raise BlobNotFound(resume.content_key)
+    return blob_storage.read_text(resume.content_key)
+
+
+async def load_content(resume: Resume) -> str:
+    """Texte complet d'un CV, lu dans le stockage d'objets seulement s'il y est."""
+    if not resume.content_key:
+        return resume.content
+    return await asyncio.to_thread(read_content, resume)
+
+
+async def store_original(resume: Resume, file: UploadFile, file_hash: str, size: int, file_format: str) -> None:
+    """
+    Conserve le fichier téléversé tel quel, sous une clé dérivée de son
+    empreinte (un même fichier n'est stocké qu'une fois). Sans stockage
+    d'objets configuré, seul le nom du fichier est conservé.
+    """
+    if blob_storage is None:
+        return
+    key = UPLOAD_PREFIX + file_hash
+    await file.seek(0)
+    await blob_storage.aput(key, file.file)
+    resume.file_key = key
+    resume.file_hash = file_hash
+    resume.file_size = size
+    resume.file_format = file_format
+
+
+def _delete_unreferenced(db: Session, keys: List[str]) -> int:
+    referenced = set(db.execute(select(Resume.file_key).where(Resume.file_key.in_(keys))).scalars())
+    referenced.update(db.execute(select(Resume.content_key).where(Resume.content_key.in_(keys))).scalars())
+    orphans = [key for key in keys if key not in referenced]
+    for key in orphans:
+        blob_storage.delete(key)
+    return len(orphans)
+
+
+def collect_orphans(db: Session, min_age: float = 3600, batch_size: int = 500) -> int:
+    """
+    Supprime du stockage d'objets les fichiers d'origine et les textes
+    qu'aucun CV ne référence plus : texte remplacé par une modification du
+    CV, CV supprimé, import annulé après l'écriture de son fichier. À
+    exécuter périodiquement (`python -m src.services.resume_storage`).
+
+    Seuls les objets écrits il y a plus de `min_age` secondes sont supprimés :
+    un import en cours a pu écrire le sien sans avoir encore validé sa
+    transaction (les clés dérivent du contenu, un même objet peut être
+    réécrit par un nouvel import).
+    """
+    if blob_storage is None:
+        return 0
+    cutoff = time.time() - min_age
+    count = 0
+    for prefix in (UPLOAD_PREFIX, TEXT_PREFIX):
+        batch: List[str] = []
+        for key, modified_at in blob_storage.iter_keys(prefix):
+            if modified_at >= cutoff:
+                continue
+            batch.append(key)
+            if len(batch) >= batch_size:
+                count += _delete_unreferenced(db, batch)
+                batch = []
+        if batch:
+            count += _delete_unreferenced(db, batch)
+    return count
+
+
+if __name__ == "__main__":
+    from ..database import SessionLocal
+
+    with SessionLocal() as session:
+        print(f"{collect_orphans(session)} objets supprimés")
@@ -0,0 +1,136 @@
+from typing import List, Optional, Tuple
+import html
+import re
+
+from sqlalchemy import Float, cast, func, literal_column, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.resume import Resume
+from ..schemas.resume import ResumeSearchHit
+
+SNIPPET_START = "<mark>"
+SNIPPET_STOP = "</mark>"
+SNIPPET_WORDS = 25
+
+# Délimiteurs temporaires des mots trouvés par ts_headline (caractères à usage privé,
+# retirés du contenu au préalable), remplacés par les balises une fois l'extrait échappé
+_HEADLINE_START = "\ue000"
+_HEADLINE_STOP = "\ue001"
+
+# Colonne tsvector générée par PostgreSQL (migration c41d7e5a9b20) : volontairement
+# absente du modèle, elle n'est jamais chargée par l'ORM
+_CONTENT_TSV = literal_column("resumes.content_tsv")
+_HEADLINE_OPTIONS = (
+    f"StartSel={_HEADLINE_START}, StopSel={_HEADLINE_STOP}, MaxFragments=2, "
+    f"MinWords=8, MaxWords={SNIPPET_WORDS}, FragmentDelimiter=\" … \""
+)
+_WORD_PATTERN = re.compile(r"\w+")
+
+_SUMMARY_COLUMNS = (
+    Resume.id, Resume.user_id, Resume.title, Resume.original_filename,
+    Resume.experience_years, Resume.created_at, Resume.updated_at
+)
+
+
+async def search_text(
+    db: AsyncSession, text: str, user_id: Optional[int], limit: int,
+    after: Optional[Tuple[float, int]] = None
+) -> List[ResumeSearchHit]:
+    """
+    Recherche plein texte dans le titre et le contenu des CV, par pertinence
+    décroissante. `after` (score, id) est la position du dernier résultat de la
+    page précédente.
+
+    Sur PostgreSQL, la recherche utilise l'index GIN de `content_tsv` (français
+    et anglais). Les autres bases (SQLite pour les tests) utilisent une
+    recherche par LIKE, plus lente, avec un score calculé en Python.
+
+    Les extraits sont du HTML : le texte du CV y est échappé et seuls les mots
+    trouvés sont entourés de `SNIPPET_START` et `SNIPPET_STOP`.
+    """
+    if db.bind.dialect.name == "postgresql":
+        return await _search_postgresql(db, text, user_id, limit, after)
+    return await _search_like(db, text, user_id, limit, after)
+
+
+async def _search_postgresql(
+    db: AsyncSession, text: str, user_id: Optional[int], limit: int, after: Optional[Tuple[float, int]]
+) -> List[ResumeSearchHit]:
+    # Syntaxe des moteurs de recherche ("python -java", "chef de projet"), dans les deux langues
+    tsquery = func.websearch_to_tsquery("french", text).op("||")(func.websearch_to_tsquery("english", text))
+    rank = cast(func.ts_rank_cd(_CONTENT_TSV, tsquery), Float)
+
+    ranked = select(Resume.id.label("id"), rank.label("rank")).where(_CONTENT_TSV.op("@@")(tsquery))
+    if user_id:
+        ranked = ranked.where(Resume.user_id == user_id)
+    if after:
+        ranked = ranked.where(tuple_(rank, Resume.id) < tuple_(*after))
+    ranked = ranked.order_by(rank.desc(), Resume.id.desc()).limit(limit).subquery()
+
+    # Les extraits (coûteux) ne sont calculés que pour les CV de la page
+    query = (
+        select(
+            *_SUMMARY_COLUMNS, ranked.c.rank,
+            func.ts_headline(
+                "french", func.translate(Resume.content, _HEADLINE_START + _HEADLINE_STOP, ""), tsquery,
+                _HEADLINE_OPTIONS
+            ).label("snippet")
+        )
+        .join(ranked, ranked.c.id == Resume.id)
+        .order_by(ranked.c.rank.desc(), Resume.id.desc())
+    )
+    return [
+        ResumeSearchHit(**{**row._asdict(), "snippet": _escape_headline(row.snippet)})
+        for row in (await db.execute(query)).all()
+    ]
+
+
+def _escape_headline(headline: Optional[str]) -> Optional[str]:
+    """Extrait de ts_headline échappé pour HTML, avec les délimiteurs remplacés par les balises."""
+    if headline is None:
+        return None
+    return html.escape(headline).replace(_HEADLINE_START, SNIPPET_START).replace(_HEADLINE_STOP, SNIPPET_STOP)
+
+
+async def _search_like(
+    db: AsyncSession, text: str, user_id: Optional[int], limit: int, after: Optional[Tuple[float, int]]
+) -> List[ResumeSearchHit]:
+    words = list(dict.fromkeys(word.casefold() for word in _WORD_PATTERN.findall(text)))
+    if not words:
+        return []
+
+    query = select(*_SUMMARY_COLUMNS, Resume.content)
+    for word in words:
+        query = query.where(func.lower(Resume.title + " " + Resume.content).contains(word, autoescape=True))
+    if user_id:
+        query = query.where(Resume.user_id == user_id)
+
+    hits = []
+    for row in (await db.execute(query)).all():
+        document = f"{row.title} {row.content}".casefold()
+        rank = float(sum(document.count(word) for word in words))
+        if after and (rank, row.id) >= after:
+            continue
+        hits.append((rank, row))
+    hits.sort(key=lambda hit: (hit[0], hit[1].id), reverse=True)
+
+    return [
+        ResumeSearchHit(**row._asdict(), rank=rank, snippet=_snippet(row.content, words))
+        for rank, row in hits[:limit]
+    ]
+
+
+def _snippet(content: str, words: List[str]) -> Optional[str]:
+    """Extrait (HTML échappé) autour de la première occurrence, avec les mots recherchés mis en évidence."""
+    tokens = content.split()
+    position = next(
+        (index for index, token in enumerate(tokens) if any(word in token.casefold() for word in words)), None
+    )
+    if position is None:
+        return None
+    start = max(0, position - SNIPPET_WORDS // 2)
+    return " ".join(
+        f"{SNIPPET_START}{html.escape(token)}{SNIPPET_STOP}" if any(word in token.casefold() for word in words)
+        else html.escape(token)
+        for token in tokens[start:start + SNIPPET_WORDS]
+    )
@@ -0,0 +1,29 @@
+"""
+Vocabulaires utilisés par l'analyseur de CV.
+
+Les termes sont des chaînes littérales (pas des expressions régulières) : ils
+sont compilés une seule fois par `KeywordMatcher`. L'ordre des listes est
+significatif, il détermine l'ordre des résultats retournés par l'analyseur.
+"""
+
+# Compétences techniques courantes
+SKILLS = [
+    "Python", "JavaScript", "Java", "C++", "C#", "SQL", "React", "Angular",
+    "Vue", "Node.js", "Django", "Flask", "Spring", "Docker", "Kubernetes",
+    "AWS", "Azure", "GCP", "Machine Learning", "Deep Learning", "TensorFlow",
+    "PyTorch", "NLP", "Data Analysis", "Excel", "PowerBI", "Tableau"
+]
+
+# Diplômes courants ("Bac+N" est décliné pour chaque niveau)
+DEGREES = [
+    "Master", "MBA", "Doctorat", "PhD", "Licence", "Bachelor",
+    "Ingénieur", "BTS", "DUT"
+] + [f"Bac+{level}" for level in range(10)]
+
+# Titres de postes courants
+JOB_TITLES = [
+    "Développeur", "Developer", "Ingénieur", "Engineer", "Architecte", "Architect",
+    "Chef de Projet", "Project Manager", "Directeur", "Director", "Consultant",
+    "Analyste", "Analyst", "Designer", "Technicien", "Technician", "Responsable",
+    "Manager", "Lead", "Senior", "Junior"
+]
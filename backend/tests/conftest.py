@@ -0,0 +1,12 @@
+import os
+import sys
+import tempfile
+
+# Configuration lue à l'import de l'application : à définir avant tout import de `src`
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='careernus-tests-')}/tests.db")
+os.environ.setdefault("ANALYSIS_EXECUTOR_MODE", "inline")
+os.environ.setdefault("EXTRACTION_MODE", "inline")
+os.environ.setdefault("ANALYSIS_CACHE_BACKEND", "")
+os.environ.setdefault("BLOB_STORAGE_BACKEND", "")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
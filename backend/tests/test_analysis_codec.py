@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from src.schemas.resume import ResumeAnalysisResponse, ResumeSection
+from src.services.analysis_codec import (
+    STORAGE_FORMAT_VERSION, VOCABULARY_ID, decode_analysis, encode_analysis, pack, read_stored
+)
+from src.services.resume_analyzer import ResumeAnalyzer
+
+CV = (
+    "Jean Dupont\n"
+    "Expérience\n"
+    "Développeur Python senior chez Acme de 2015 à 2020\n"
+    "Formation\n"
+    "Master Informatique, Université de Lyon 2014\n"
+    "Compétences\n"
+    "Python, Docker, SQL, Rust\n"
+)
+
+
+@pytest.fixture(scope="module")
+def analysis():
+    analysis = ResumeAnalyzer().analyze_resume(CV)
+    # Terme hors vocabulaire (moteur LLM) : conservé en clair
+    analysis.skills.append("Zig")
+    return analysis
+
+
+def test_vocabulary_terms_are_interned(analysis):
+    stored = encode_analysis(analysis, "3", "hash")
+    assert stored["format"] == STORAGE_FORMAT_VERSION
+    assert stored["vocabulary"] == VOCABULARY_ID
+    assert all(isinstance(term, int) for term in stored["analysis"]["skills"][:-1])
+    assert stored["analysis"]["skills"][-1] == "Zig"
+
+
+@pytest.mark.parametrize("encoding", [lambda stored: stored, json.dumps, pack])
+def test_round_trip(analysis, encoding):
+    stored = read_stored(encoding(encode_analysis(analysis, "3", "hash")))
+    assert stored["content_hash"] == "hash"
+    decoded = decode_analysis(stored)
+    assert decoded.dict() == analysis.dict()
+    assert all(isinstance(section, ResumeSection) for section in decoded.sections)
+
+
+def test_legacy_format_is_readable():
+    legacy = {"analyzer_version": "2", "analysis": {"skills": ["Python"], "sections": []}}
+    decoded = decode_analysis(read_stored(json.dumps(legacy)))
+    assert isinstance(decoded, ResumeAnalysisResponse)
+    assert decoded.skills == ["Python"]
+
+
+@pytest.mark.parametrize("stored", [None, "", b"", "{", b"not zstd", "[]", {"format": 2}])
+def test_unreadable_values(stored):
+    assert read_stored(stored) is None
+
+
+def test_other_vocabulary_is_rejected(analysis):
+    stored = encode_analysis(analysis, "3", "hash")
+    assert read_stored({**stored, "vocabulary": "autre"}) is None
@@ -0,0 +1,81 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.database import AsyncSessionLocal, SessionLocal, engine
+from src.models import Base, Resume, User
+from src.services.deduplication import (
+    EXACT, NORMALIZED, SIMILAR, find_duplicate, fingerprint, minhash_signature, set_fingerprints
+)
+from src.services.resume_storage import compute_content_hash
+
+CV = "\n".join([
+    "Jean Dupont",
+    "Expérience",
+    "Développeur Python senior chez Acme de 2015 à 2020, puis ingénieur logiciel chez Foo de 2020 à 2024.",
+    "Mise en place de pipelines d'intégration continue avec Docker, Kubernetes et AWS.",
+    "Formation",
+    "Master Informatique, Université Paris 2015",
+    "Compétences",
+    "Python, Docker, AWS, SQL, React, Kubernetes, Linux, Git",
+])
+
+
+def _similarity(first, second):
+    return (np.frombuffer(minhash_signature(first), np.uint32) == np.frombuffer(minhash_signature(second), np.uint32)).mean()
+
+
+def test_fingerprint_ignores_whitespace_and_case():
+    assert fingerprint(CV) == fingerprint(CV.upper().replace("\n", "  \n "))
+    assert fingerprint(CV) != fingerprint(CV + " Rust")
+
+
+def test_minhash_similarity():
+    assert minhash_signature("") is None
+    assert _similarity(CV, CV) == 1
+    assert _similarity(CV, CV + "\nLangues : anglais courant") >= 0.8
+    assert _similarity(CV, "Marie Curie, chimiste, prix Nobel de physique et de chimie") < 0.2
+
+
+@pytest.fixture(scope="module")
+def user_ids():
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        users = [User(email=f"dedup{index}@example.com", hashed_password="x") for index in range(2)]
+        db.add_all(users)
+        db.commit()
+        resume = Resume(user_id=users[0].id, title="CV", content=CV, content_hash=compute_content_hash(CV))
+        set_fingerprints(resume, CV)
+        db.add(resume)
+        db.commit()
+        return users[0].id, users[1].id
+
+
+def _find(user_id, content, threshold=None):
+    async def find():
+        async with AsyncSessionLocal() as db:
+            duplicate = await find_duplicate(db, user_id, content, compute_content_hash(content), threshold)
+            return duplicate and (duplicate.kind, duplicate.similarity)
+    return asyncio.run(find())
+
+
+def test_exact_duplicate(user_ids):
+    assert _find(user_ids[0], CV) == (EXACT, 1.0)
+
+
+def test_normalized_duplicate(user_ids):
+    assert _find(user_ids[0], CV.upper()) == (NORMALIZED, 1.0)
+
+
+def test_similar_duplicate(user_ids):
+    kind, similarity = _find(user_ids[0], CV + "\nLangues : anglais courant", threshold=0.8)
+    assert kind == SIMILAR and 0.8 <= similarity < 1
+
+
+def test_similarity_disabled(user_ids):
+    assert _find(user_ids[0], CV + "\nLangues : anglais courant", threshold=0) is None
+
+
+def test_other_users_resumes_are_ignored(user_ids):
+    assert _find(user_ids[1], CV) is None
@@ -0,0 +1,49 @@
+import re
+
+import pytest
+
+from src.services.keyword_matcher import KeywordMatcher
+
+TERMS = [
+    "React", "React Native", "SQL", "SQL Server", "Node", "Node.js", "Java", "JavaScript", "C", "C++",
+    "Architect", "Architecte",
+]
+
+
+def _independent_search(text, whole_word):
+    # Comportement de référence : chaque terme recherché séparément
+    suffix = r"(?!\w)" if whole_word else ""
+    return [term for term in TERMS if re.search(r"(?<!\w)" + re.escape(term) + suffix, text, re.IGNORECASE)]
+
+
+@pytest.mark.parametrize("whole_word", [True, False])
+@pytest.mark.parametrize("text", [
+    "React Native dev",
+    "SQL Server, Node.js",
+    "JavaScript only",
+    "Java et C++",
+    "Reactive programming",
+    "Architecte logiciel",
+    "architect and REACT",
+])
+def test_matches_independent_search(text, whole_word):
+    assert KeywordMatcher(TERMS, whole_word=whole_word).find_terms(text) == _independent_search(text, whole_word)
+
+
+def test_whole_word_returns_prefix_terms():
+    matcher = KeywordMatcher(TERMS)
+    assert matcher.find_terms("React Native dev") == ["React", "React Native"]
+    assert matcher.find_terms("Node.js") == ["Node", "Node.js"]
+    # Préfixe suivi d'une lettre dans le terme long : pas une occurrence en mot entier
+    assert matcher.find_terms("JavaScript") == ["JavaScript"]
+
+
+def test_prefixes_without_word_boundary():
+    assert KeywordMatcher(TERMS, whole_word=False).find_terms("Architecte") == ["Architect", "Architecte"]
+
+
+def test_returns_canonical_terms_and_positions():
+    matches = list(KeywordMatcher(TERMS).finditer("du react native"))
+    assert [(match.term, match.start, match.end) for match in matches] == [
+        ("React Native", 3, 15), ("React", 3, 8),
+    ]
@@ -0,0 +1,35 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from src.services.pagination import (
+    decode_cursor, decode_id_cursor, decode_rank_cursor, encode_cursor, encode_id_cursor, encode_rank_cursor
+)
+
+
+@pytest.mark.parametrize("created_at", [
+    datetime(2024, 3, 1, 12, 30, 15, 123456),
+    datetime(2024, 3, 1, 12, 30, tzinfo=timezone.utc),
+])
+def test_cursor_round_trip(created_at):
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+def test_id_cursor_round_trip():
+    assert decode_id_cursor(encode_id_cursor(123456)) == 123456
+
+
+def test_rank_cursor_round_trip():
+    assert decode_rank_cursor(encode_rank_cursor(0.1 + 0.2, 7)) == (0.1 + 0.2, 7)
+
+
+def test_cursors_are_url_safe():
+    cursor = encode_cursor(datetime(2024, 3, 1), 10 ** 12)
+    assert "=" not in cursor and "/" not in cursor and "+" not in cursor
+
+
+@pytest.mark.parametrize("decode", [decode_cursor, decode_id_cursor, decode_rank_cursor])
+@pytest.mark.parametrize("cursor", ["", "!!!", "bm90LWEtY3Vyc29y", "été"])
+def test_invalid_cursors(decode, cursor):
+    with pytest.raises(ValueError):
+        decode(cursor)
@@ -0,0 +1,40 @@
+from src.services.resume_segmenter import HEADER_SECTION, section_hash, segment_resume
+
+CV = (
+    "Jean Dupont\n"
+    "jean@example.com\n"
+    "\n"
+    "## Expérience professionnelle\n"
+    "Développeur Python chez Acme, 2015 - 2020\n"
+    "\n"
+    "FORMATION\n"
+    "Master Informatique, 2014\n"
+    "Compétences : Python, Docker, SQL\n"
+)
+
+
+def test_sections_cover_text_without_overlap():
+    sections = segment_resume(CV)
+    assert sections[0].start == 0
+    assert sections[-1].end == len(CV)
+    for previous, current in zip(sections, sections[1:]):
+        assert previous.end == current.start
+
+
+def test_section_kinds():
+    assert [section.kind for section in segment_resume(CV)] == [HEADER_SECTION, "experience", "education", "skills"]
+
+
+def test_inline_heading():
+    skills = segment_resume(CV)[-1]
+    assert CV[skills.start:skills.end].startswith("Compétences : Python")
+
+
+def test_text_without_heading():
+    assert [tuple(section) for section in segment_resume("Python, Docker")] == [(HEADER_SECTION, 0, 14)]
+    assert [tuple(section) for section in segment_resume("")] == [(HEADER_SECTION, 0, 0)]
+
+
+def test_section_hash_depends_on_text():
+    assert section_hash("Python") == section_hash("Python")
+    assert section_hash("Python") != section_hash("python")
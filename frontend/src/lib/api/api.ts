@@ -51,9 +51,11 @@ export const resumeService = {
     const { data } = await api.get(`/resumes/${id}`);
     return data;
   },
-  async listResumes() {
-    const { data } = await api.get("/resumes");
-    return data;
+  async listResumes(cursor?: string) {
+    const { data } = await api.get("/resumes", {
+      params: cursor ? { cursor } : undefined,
+    });
+    return data.items;
   },
 };
 